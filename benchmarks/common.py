@@ -0,0 +1,55 @@
+import os
+import struct
+import sys
+from time import perf_counter
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda import getMPIComm, getMPIRank
+from pyquda.field import Nc
+from pyquda.utils.io import eigen
+
+
+def timeit(func, *args, repeat: int = 1, **kwargs):
+    """Wall time of `func(*args, **kwargs)` between two barriers, the minimum of `repeat` runs, and its result."""
+    secs = []
+    for _ in range(repeat):
+        getMPIComm().Barrier()
+        s = perf_counter()
+        result = func(*args, **kwargs)
+        getMPIComm().Barrier()
+        secs.append(perf_counter() - s)
+    return min(secs), result
+
+
+def writeTimeSlice(filename: str, latt_size, Ne: int):
+    """A synthetic QDPLazyDiskMapObj file of timeslice eigenvectors with keys (t, e), written by rank 0."""
+    if getMPIRank() == 0:
+        Lx, Ly, Lz, Lt = latt_size
+        user_data = (
+            "<?xml version='1.0' encoding='UTF-8'?>\n<MODMetaData><id>eigenVecsTimeSlice</id>"
+            f"<lattSize>{Lx} {Ly} {Lz} {Lt}</lattSize><decay_dir>3</decay_dir><num_vecs>{Ne}</num_vecs>"
+            "</MODMetaData>"
+        )
+        nbytes = Lz * Ly * Lx * Nc * 2 * 4
+        with open(filename, "wb") as f:
+            eigen._writeStr(f, "XXXXQDPLazyDiskMapObjFileXXXX")
+            f.write(struct.pack(">i", 1))
+            eigen._writeStr(f, user_data)
+            offset = f.tell() + 16
+            eigen._writePos(f, offset + Lt * Ne * nbytes)
+            for t in range(Lt):
+                for e in range(Ne):
+                    # a distinct payload for every record so that a misplaced (t, e) is caught
+                    record = numpy.random.default_rng(t * Ne + e).random((Lz, Ly, Lx, Nc * 2)).astype(">f4")
+                    record.tofile(f)
+            f.write(struct.pack(">I", Lt * Ne))
+            for t in range(Lt):
+                for e in range(Ne):
+                    eigen._writeTuple(f, (t, e))
+                    eigen._writePos(f, offset + (t * Ne + e) * nbytes)
+    getMPIComm().Barrier()
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda import init, getGridCoord, getMPIComm, getMPIRank, getSublatticeSize
+from pyquda.field import Ns, Nc
+from pyquda.utils.io import compressed, kyu_single
+
+from common import timeit
+
+
+def syntheticPropagator(latt_size):
+    """Random local propagator (Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc) decaying in t like a point source propagator."""
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    gt = getGridCoord()[3]
+    rng = numpy.random.default_rng(getMPIRank())
+    shape = (Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc)
+    propagator = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    t = numpy.arange(gt * Lt, (gt + 1) * Lt)
+    decay = numpy.exp(-0.5 * numpy.minimum(t, latt_size[3] - t))
+    return propagator * decay.reshape(Lt, 1, 1, 1, 1, 1, 1, 1)
+
+
+grid_size = [int(G) for G in sys.argv[1:5]] if len(sys.argv) > 4 else [1, 1, 1, 1]
+init(grid_size, backend="numpy")
+filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), "propagator.bin")
+for latt_size in [[8, 8, 8, 16], [16, 16, 16, 32]]:
+    propagator = syntheticPropagator(latt_size)
+    secs, _ = timeit(kyu_single.writePropagator, filename, propagator, latt_size)
+    nbytes = os.path.getsize(filename)
+    secs_read, _ = timeit(kyu_single.readPropagator, filename, latt_size)
+    if getMPIRank() == 0:
+        print(
+            f"{str(latt_size):>16s} kyu_single: {nbytes / 1024**2:.1f} MiB, "
+            f"write {nbytes / 1024**2 / secs:.0f} MiB/s, read {nbytes / 1024**2 / secs_read:.0f} MiB/s"
+        )
+    for precision, compression, level, tolerance in [
+        (8, "zlib", 1, None),
+        (8, "zlib", 6, None),
+        (4, "zlib", 1, None),
+        (4, "zlib", 1, 1e-4),
+        (4, "zlib", 6, 1e-4),
+        (4, "lzma", 1, 1e-4),
+        (4, "zlib", 1, 1e-3),
+    ]:
+        secs, _ = timeit(
+            compressed.writePropagator, filename, propagator, latt_size, precision, compression, level, tolerance
+        )
+        size = os.path.getsize(filename)
+        secs_read, (_, _, result) = timeit(compressed.readPropagator, filename)
+        error = numpy.abs(result.view("<f8") - propagator.view("<f8")) / numpy.abs(propagator.view("<f8"))
+        error = getMPIComm().allreduce(error.max(), max)
+        if getMPIRank() == 0:
+            print(
+                f"{str(latt_size):>16s} {compression}-{level} precision {precision} tolerance {tolerance}: "
+                f"ratio {nbytes / size:.2f} to kyu_single, write {nbytes / 1024**2 / secs:.0f} MiB/s, "
+                f"read {nbytes / 1024**2 / secs_read:.0f} MiB/s, max relative error {error:.1e}"
+            )
+if getMPIRank() == 0:
+    os.remove(filename)
@@ -0,0 +1,92 @@
+import os
+import sys
+import tracemalloc
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda import init, setMemmapIO
+from pyquda.field import Nd, Ns, Nc, cb2
+from pyquda.utils.io import chroma, kyu
+from pyquda.utils.io.convert import fileToLattice
+
+from common import timeit
+
+
+def chromaPasses(propagator_raw: numpy.ndarray):
+    """The separate passes of the Chroma QIO propagator reader before the fused conversion."""
+    return cb2(propagator_raw.astype("<c16"), [0, 1, 2, 3])
+
+
+def chromaFused(propagator_raw: numpy.ndarray):
+    return fileToLattice(propagator_raw, range(propagator_raw.ndim), "<c16", 0, True)
+
+
+def kyuPasses(propagator_raw: numpy.ndarray):
+    """The separate passes of the KYU propagator reader before the fused conversion."""
+    Lt, Lz, Ly, Lx = propagator_raw.shape[5:]
+    propagator_raw = (
+        propagator_raw.transpose(5, 6, 7, 8, 3, 0, 4, 1, 2)
+        .astype("<f8")
+        .copy()
+        .reshape(Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc * 2)
+        .view("<c16")
+    )
+    return cb2(propagator_raw, [0, 1, 2, 3])
+
+
+def kyuFused(propagator_raw: numpy.ndarray):
+    propagator_raw = fileToLattice(propagator_raw, (5, 6, 7, 8, 3, 0, 4, 1, 2), "<f8", 0, True)
+    return propagator_raw.reshape(*propagator_raw.shape[:-3], Nc, Nc * 2).view("<c16")
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    secs, result = timeit(func, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return secs, peak, result
+
+
+# python convert.py, with a single process the readers map the file
+init([1, 1, 1, 1], backend="numpy", resource_path=".cache")
+setMemmapIO(True)
+filename = "convert.bench"
+for latt_size in [[8, 8, 8, 16], [16, 16, 16, 32], [24, 24, 24, 24]]:
+    Lx, Ly, Lz, Lt = latt_size
+    rng = numpy.random.default_rng(0)
+    chroma_gauge = rng.random((Lt, Lz, Ly, Lx, Nd, Nc, Nc * 2)).astype(">f8").view(">c16")
+    chroma_propagator = rng.random((Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc * 2), "<f4").astype(">f4").view(">c8")
+    kyu_propagator = rng.random((Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx)).astype(">f8")
+    for name, data, passes, fused in [
+        ("chroma >c8", chroma_propagator, chromaPasses, chromaFused),
+        ("kyu >f8", kyu_propagator, kyuPasses, kyuFused),
+    ]:
+        secs_passes, peak_passes, result_passes = measure(passes, data)
+        secs_fused, peak_fused, result_fused = measure(fused, data)
+        assert numpy.array_equal(result_passes, result_fused)
+        field = result_fused.nbytes
+        print(
+            f"{str(latt_size):>16s} {name}: passes {secs_passes:.3f} secs {peak_passes / field:.2f} fields, "
+            f"fused {secs_fused:.3f} secs {peak_fused / field:.2f} fields ({field / 1024**2:.0f} MiB field)"
+        )
+
+    # the readers convert the mapped file one timeslice at a time, no buffer of the file data is allocated
+    for name, data, reader in [
+        ("chroma gauge >c16", chroma_gauge, lambda: chroma.fromILDGGaugeFile(filename, 0, ">c16", latt_size)),
+        (
+            "chroma propagator >c8",
+            chroma_propagator,
+            lambda: chroma.fromSCIDACPropagatorFile(filename, 0, ">c8", latt_size, False, even_odd=True),
+        ),
+        ("kyu propagator >f8", kyu_propagator, lambda: kyu.fromPropagatorFile(filename, 0, ">f8", latt_size)),
+    ]:
+        data.tofile(filename)
+        secs, peak, result = measure(reader)
+        field = result.nbytes
+        print(f"{str(latt_size):>16s} {name} reader: {secs:.3f} secs {peak / field:.2f} fields")
+        assert peak < 1.1 * field, f"{name} reader peaks at {peak / field:.2f} fields"
+os.remove(filename)
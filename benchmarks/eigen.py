@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda import init, getGridSize, getGridCoord, getMPIRank, getSublatticeSize
+from pyquda.field import Nc, cb2
+from pyquda.utils.io import eigen
+
+from common import timeit, writeTimeSlice
+
+
+def readTimeSliceFromfile(filename: str, Ne: int = None):
+    """The numpy.fromfile implementation of eigen.readTimeSlice() used before the collective one."""
+    format, offsets = eigen._readMap(filename)
+    latt_size = [int(x) for x in format.find("lattSize").text.split()]
+    if Ne is None:
+        Ne = int(format.find("num_vecs").text)
+    Gx, Gy, Gz, Gt = getGridSize()
+    gx, gy, gz, gt = getGridCoord()
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    eigen_raw = numpy.zeros((Ne, Lt, Lz, Ly, Lx, Nc), "<c8")
+    for e in range(Ne):
+        for t in range(Lt):
+            eigen_raw[e, t] = (
+                numpy.fromfile(
+                    filename, ">c8", count=Gz * Lz * Gy * Ly * Gx * Lx * Nc, offset=offsets[(t + gt * Lt, e)]
+                )
+                .reshape(Gz * Lz, Gy * Ly, Gx * Lx, Nc)[
+                    gz * Lz : (gz + 1) * Lz,
+                    gy * Ly : (gy + 1) * Ly,
+                    gx * Lx : (gx + 1) * Lx,
+                ]
+                .astype("<c8")
+            )
+    return cb2(eigen_raw, [1, 2, 3, 4])
+
+
+grid_size = [int(G) for G in sys.argv[1:5]] if len(sys.argv) > 4 else [1, 1, 1, 1]
+init(grid_size, backend="numpy")
+filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eigen.mod")
+Ne = 16
+for latt_size in [[8, 8, 8, 16], [16, 16, 16, 32], [24, 24, 24, 48]]:
+    writeTimeSlice(filename, latt_size, Ne)
+    secs_fromfile, result_fromfile = timeit(readTimeSliceFromfile, filename)
+    secs, result = timeit(eigen.readTimeSlice, filename)
+    assert numpy.array_equal(result, result_fromfile)
+    secs_subset, _ = timeit(eigen.readTimeSlice, filename, eigenvectors=range(0, Ne, 4), timeslices=[0])
+    if getMPIRank() == 0:
+        Gx, Gy, Gz, Gt = grid_size
+        Lx, Ly, Lz, Lt = latt_size
+        nbytes = Ne * Lt * Lz * Ly * Lx * Nc * 8 // (Gx * Gy * Gz * Gt)
+        print(
+            f"{str(latt_size):>16s}: readMPIFile {secs:.4f} secs ({nbytes / 1024**2:.1f} MiB/rank), "
+            f"fromfile {secs_fromfile:.4f} secs ({nbytes * Gx * Gy * Gz / 1024**2:.1f} MiB/rank), "
+            f"4 vectors on 1 timeslice {secs_subset:.4f} secs"
+        )
+if getMPIRank() == 0:
+    os.remove(filename)
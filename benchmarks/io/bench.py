@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import struct
+import sys
+
+import numpy
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+import common  # noqa: E402
+from common import writeTimeSlice  # noqa: E402
+from pyquda import init, getGridCoord, getMPIComm, getMPIRank, getSublatticeSize, readMPIFile
+from pyquda.field import Nd, Ns, Nc, cb2
+from pyquda.utils.io import chroma, eigen, kyu, kyu_single, lime, milc
+from pyquda.utils.io.convert import fileToLattice, latticeToFile
+
+# mpiexec -n 4 python bench.py --grid-size 1 1 1 4 --latt-size 16 16 16 32 --output io.json
+parser = argparse.ArgumentParser(description="Time the readers and writers of pyquda.utils.io stage by stage.")
+parser.add_argument("--grid-size", type=int, nargs=4, default=[1, 1, 1, getMPIComm().Get_size()])
+parser.add_argument("--latt-size", type=int, nargs=4, action="append", help="may be given several times")
+parser.add_argument("--formats", nargs="*", help="default all of them")
+parser.add_argument("--Ne", type=int, default=8, help="number of eigenvectors")
+parser.add_argument("--repeat", type=int, default=3, help="the minimum time of the repeats is reported")
+parser.add_argument("--dir", default=".", help="where the synthetic files are written")
+parser.add_argument("--output", help="JSON file, default stdout")
+args = parser.parse_args()
+latt_sizes = args.latt_size if args.latt_size is not None else [[8, 8, 8, 16], [16, 16, 16, 32]]
+
+
+def timeit(func, *func_args):
+    return common.timeit(func, *func_args, repeat=args.repeat)
+
+
+def limeHeader(filename: str, name: str):
+    # drop the memoized record table so the headers are parsed again
+    lime._INDEX_MEMO.pop(filename, None)
+    return lime.LimeIndex(filename, cache=False).offset(name)
+
+
+def milcHeader(filename: str):
+    with open(filename, "rb") as f:
+        magic = f.read(4)
+        endian = "<" if struct.unpack("<i", magic)[0] == 20103 else ">"
+        struct.unpack(f"{endian}iiii", f.read(16))
+        f.read(64 + 4 + 8)
+        return f.tell()
+
+
+def formats(latt_size, Ne: int):
+    """
+    Every format with its writer and reader, and the stages of the reader: `header` returns the offsets of the
+    data, `raw` reads it in the file layout as `file_dtype`, which is then transposed by `axes` to the lattice
+    layout with the (Lt, Lz, Ly, Lx) axes at `t_axis` and converted to `dtype`. `lattice` views the local
+    lexicographic field in that layout for the conversion of the writer.
+    """
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    gt = getGridCoord()[3]
+    rng = numpy.random.default_rng(getMPIRank())
+    gauge = rng.random((Nd, Lt, Lz, Ly, Lx, Nc, Nc * 2)).view("<c16")
+    propagator = rng.random((Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc * 2)).view("<c16")
+    eigenvector = rng.random((Ne, Lt, Lz, Ly, Lx, Ns, Nc * 2)).view("<c16")
+    eigenvalue = numpy.arange(Ne, dtype="<f8")
+    return {
+        "qio_gauge": dict(
+            file_dtype=">c16",
+            write=lambda filename: chroma.writeQIOGauge(filename, latt_size, gauge, 8),
+            read=lambda filename: chroma.readQIOGauge(filename, even_odd=True),
+            header=lambda filename: limeHeader(filename, "ildg-binary-data"),
+            raw=lambda filename, offset: readMPIFile(
+                filename, ">c16", offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0)
+            ),
+            axes=(4, 0, 1, 2, 3, 5, 6),
+            t_axis=1,
+            dtype="<c16",
+            lattice=lambda: gauge,
+        ),
+        "qio_propagator": dict(
+            file_dtype=">c16",
+            write=lambda filename: chroma.writeQIOPropagator(filename, latt_size, False, propagator, 8),
+            read=lambda filename: chroma.readQIOPropagator(filename, even_odd=True),
+            header=lambda filename: limeHeader(filename, "scidac-binary-data"),
+            raw=lambda filename, offset: readMPIFile(
+                filename, ">c16", offset, (Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc), (3, 2, 1, 0)
+            ),
+            axes=tuple(range(8)),
+            t_axis=0,
+            dtype="<c16",
+            lattice=lambda: propagator,
+        ),
+        "milc_gauge": dict(
+            file_dtype="<c8",
+            write=lambda filename: milc.writeGauge(filename, latt_size, gauge),
+            read=lambda filename: milc.readGauge(filename, even_odd=True),
+            header=milcHeader,
+            raw=lambda filename, offset: readMPIFile(
+                filename, "<c8", offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0)
+            ),
+            axes=(4, 0, 1, 2, 3, 5, 6),
+            t_axis=1,
+            dtype="<c16",
+            lattice=lambda: gauge,
+        ),
+        "kyu_gauge": dict(
+            file_dtype=">f8",
+            write=lambda filename: kyu.writeGauge(filename, gauge, latt_size),
+            read=lambda filename: kyu.readGauge(filename, latt_size, even_odd=True),
+            header=lambda filename: 0,
+            raw=lambda filename, offset: readMPIFile(
+                filename, ">f8", offset, (Nd, Nc, Nc, 2, Lt, Lz, Ly, Lx), (7, 6, 5, 4)
+            ),
+            axes=(0, 4, 5, 6, 7, 2, 1, 3),
+            t_axis=1,
+            dtype="<f8",
+            lattice=lambda: gauge.view("<f8").reshape(Nd, Lt, Lz, Ly, Lx, Nc, Nc, 2),
+        ),
+        "kyu_propagator": dict(
+            file_dtype=">f8",
+            write=lambda filename: kyu.writePropagator(filename, propagator, latt_size),
+            read=lambda filename: kyu.readPropagator(filename, latt_size, even_odd=True),
+            header=lambda filename: 0,
+            raw=lambda filename, offset: readMPIFile(
+                filename, ">f8", offset, (Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx), (8, 7, 6, 5)
+            ),
+            axes=(5, 6, 7, 8, 3, 0, 4, 1, 2),
+            t_axis=0,
+            dtype="<f8",
+            lattice=lambda: propagator.view("<f8").reshape(Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc, 2),
+        ),
+        "kyu_single_propagator": dict(
+            file_dtype="<c8",
+            write=lambda filename: kyu_single.writePropagator(filename, propagator, latt_size),
+            read=lambda filename: kyu_single.readPropagator(filename, latt_size, even_odd=True),
+            header=lambda filename: 0,
+            raw=lambda filename, offset: readMPIFile(
+                filename, "<c8", offset, (Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc), (5, 4, 3, 2)
+            ),
+            axes=(2, 3, 4, 5, 6, 0, 7, 1),
+            t_axis=0,
+            dtype="<c16",
+            lattice=lambda: propagator,
+        ),
+        "lazydiskmap_dirac": dict(
+            file_dtype=">c8",
+            write=lambda filename: eigen.writeDirac(filename, eigenvalue, eigenvector, latt_size),
+            read=lambda filename: eigen.readDirac(filename, even_odd=True),
+            header=lambda filename: [offset for _, offset in sorted(eigen._readMap(filename)[1].items())],
+            raw=lambda filename, offset: readMPIFile(
+                filename, ">c8", offset, (Lt, Lz, Ly, Lx, Ns, Nc), (3, 2, 1, 0)
+            ),
+            axes=tuple(range(7)),
+            t_axis=1,
+            dtype="<c16",
+            lattice=lambda: eigenvector,
+        ),
+        "lazydiskmap_timeslice": dict(
+            file_dtype=">c8",
+            write=lambda filename: writeTimeSlice(filename, latt_size, Ne),
+            read=lambda filename: eigen.readTimeSlice(filename),
+            header=lambda filename: eigen._readMap(filename)[1],
+            raw=lambda filename, offsets: readMPIFile(
+                filename,
+                ">c8",
+                [offsets[(t + gt * Lt, e)] for e in range(Ne) for t in range(Lt)],
+                (Lz, Ly, Lx, Nc),
+                (2, 1, 0),
+            ).reshape(Ne, Lt, Lz, Ly, Lx, Nc),
+            axes=tuple(range(6)),
+            t_axis=1,
+            dtype="<c8",
+            lattice=None,
+        ),
+    }
+
+
+def benchmark(filename: str, spec: dict):
+    result = {"read": {}, "write": {}}
+    if spec["lattice"] is not None:
+        result["write"]["convert"], _ = timeit(
+            lambda: latticeToFile(spec["lattice"](), spec["axes"], spec["file_dtype"], spec["t_axis"])
+        )
+    result["write"]["total"], _ = timeit(spec["write"], filename)
+    result["nbytes"] = os.path.getsize(filename)
+
+    read = result["read"]
+    read["header"], offset = timeit(spec["header"], filename)
+    read["raw"], raw = timeit(spec["raw"], filename, offset)
+    read["byteswap"], native = timeit(lambda: raw.astype(raw.dtype.newbyteorder("=")))
+    read["transpose"], lattice = timeit(lambda: native.transpose(spec["axes"]).astype(spec["dtype"], order="C"))
+    t_axis = spec["t_axis"]
+    read["cb2"], _ = timeit(lambda: cb2(lattice, list(range(t_axis, t_axis + 4))))
+    read["convert"], _ = timeit(lambda: fileToLattice(raw, spec["axes"], spec["dtype"], t_axis, True))
+    read["total"], _ = timeit(spec["read"], filename)
+    return result
+
+
+init(args.grid_size, backend="numpy", resource_path=".cache")
+results = []
+for latt_size in latt_sizes:
+    for name, spec in formats(latt_size, args.Ne).items():
+        if args.formats and name not in args.formats:
+            continue
+        filename = os.path.join(args.dir, f"bench.{name}")
+        result = benchmark(filename, spec)
+        results.append({"format": name, "latt_size": latt_size, "grid_size": args.grid_size, **result})
+        if getMPIRank() == 0:
+            os.remove(filename)
+            print(f"{name} {latt_size}: {result}", file=sys.stderr)
+if getMPIRank() == 0:
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
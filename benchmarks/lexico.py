@@ -0,0 +1,99 @@
+import os
+import sys
+from time import perf_counter
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda.field import Ns, Nc, Nd, lexico, cb2
+
+
+def lexicoLoop(data: numpy.ndarray, axes, dtype=None):
+    """The triple loop implementation of lexico() used before the vectorized one."""
+    shape = data.shape
+    Np, Lt, Lz, Ly, Lx = [shape[axis] for axis in axes]
+    assert Np == 2
+    Lx *= 2
+    Npre = int(numpy.prod(shape[: axes[0]]))
+    Nsuf = int(numpy.prod(shape[axes[-1] + 1 :]))
+    dtype = data.dtype if dtype is None else dtype
+    data_cb2 = data.reshape(Npre, 2, Lt, Lz, Ly, Lx // 2, Nsuf)
+    data_lexico = numpy.zeros((Npre, Lt, Lz, Ly, Lx, Nsuf), dtype)
+    for t in range(Lt):
+        for z in range(Lz):
+            for y in range(Ly):
+                eo = (t + z + y) % 2
+                if eo == 0:
+                    data_lexico[:, t, z, y, 0::2] = data_cb2[:, 0, t, z, y, :]
+                    data_lexico[:, t, z, y, 1::2] = data_cb2[:, 1, t, z, y, :]
+                else:
+                    data_lexico[:, t, z, y, 1::2] = data_cb2[:, 0, t, z, y, :]
+                    data_lexico[:, t, z, y, 0::2] = data_cb2[:, 1, t, z, y, :]
+    return data_lexico.reshape(*shape[: axes[0]], Lt, Lz, Ly, Lx, *shape[axes[-1] + 1 :])
+
+
+def cb2Loop(data: numpy.ndarray, axes, dtype=None):
+    """The triple loop implementation of cb2() used before the vectorized one."""
+    shape = data.shape
+    Lt, Lz, Ly, Lx = [shape[axis] for axis in axes]
+    Npre = int(numpy.prod(shape[: axes[0]]))
+    Nsuf = int(numpy.prod(shape[axes[-1] + 1 :]))
+    dtype = data.dtype if dtype is None else dtype
+    data_lexico = data.reshape(Npre, Lt, Lz, Ly, Lx, Nsuf)
+    data_cb2 = numpy.zeros((Npre, 2, Lt, Lz, Ly, Lx // 2, Nsuf), dtype)
+    for t in range(Lt):
+        for z in range(Lz):
+            for y in range(Ly):
+                eo = (t + z + y) % 2
+                if eo == 0:
+                    data_cb2[:, 0, t, z, y, :] = data_lexico[:, t, z, y, 0::2]
+                    data_cb2[:, 1, t, z, y, :] = data_lexico[:, t, z, y, 1::2]
+                else:
+                    data_cb2[:, 0, t, z, y, :] = data_lexico[:, t, z, y, 1::2]
+                    data_cb2[:, 1, t, z, y, :] = data_lexico[:, t, z, y, 0::2]
+    return data_cb2.reshape(*shape[: axes[0]], 2, Lt, Lz, Ly, Lx // 2, *shape[axes[-1] + 1 :])
+
+
+def timeit(func, *args, repeat: int = 3):
+    func(*args)  # warm up and fill the index cache
+    s = perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (perf_counter() - s) / repeat
+
+
+backend = sys.argv[1] if len(sys.argv) > 1 else "numpy"
+if backend == "numpy":
+    xp = numpy
+    synchronize = lambda: None  # noqa: E731
+elif backend == "cupy":
+    import cupy as xp
+
+    synchronize = xp.cuda.get_current_device().synchronize
+else:
+    raise ValueError(f"Unsupported backend {backend}")
+
+fields = {
+    "gauge": (lambda Lx, Ly, Lz, Lt: (Nd, Lt, Lz, Ly, Lx, Nc, Nc), [1, 2, 3, 4]),
+    "fermion": (lambda Lx, Ly, Lz, Lt: (Lt, Lz, Ly, Lx, Ns, Nc), [0, 1, 2, 3]),
+    "propagator": (lambda Lx, Ly, Lz, Lt: (Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc), [0, 1, 2, 3]),
+}
+for latt_size in [[8, 8, 8, 16], [16, 16, 16, 32], [24, 24, 24, 48]]:
+    for field, (getShape, axes) in fields.items():
+        shape = getShape(*latt_size)
+        data_lexico = xp.ones(shape, "<c16")
+        data_cb2 = cb2(data_lexico, axes)
+        axes_cb2 = [axes[0]] + [axis + 1 for axis in axes]
+
+        def vectorized():
+            lexico(cb2(data_lexico, axes), axes_cb2)
+            synchronize()
+
+        line = f"{field:>10s} {str(latt_size):>16s}: vectorized {timeit(vectorized):.4f} secs"
+        if backend == "numpy":
+            line += f", loop {timeit(lambda: lexicoLoop(cb2Loop(data_lexico, axes), axes_cb2), repeat=1):.4f} secs"
+            assert numpy.array_equal(lexicoLoop(data_cb2, axes_cb2), lexico(data_cb2, axes_cb2))
+        print(line)
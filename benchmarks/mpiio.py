@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy
+
+try:
+    import pyquda  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from pyquda import init, getMPIComm, getMPIRank, getSublatticeSize, readMPIFile, writeMPIFile
+from pyquda import setMemmapIO, setMPIIOHints
+
+from common import timeit
+
+# mpiexec -n 8 python mpiio.py [Gx Gy Gz Gt] [Lx Ly Lz Lt] [filename], the file should be on the parallel file system
+grid_size = [int(G) for G in sys.argv[1:5]] if len(sys.argv) > 4 else [1, 1, 1, getMPIComm().Get_size()]
+latt_size = [int(L) for L in sys.argv[5:9]] if len(sys.argv) > 8 else [24, 24, 24, 48]
+filename = sys.argv[9] if len(sys.argv) > 9 else "mpiio.bench"
+repeat = 3
+
+init(grid_size, backend="numpy", resource_path=".cache")
+setMemmapIO(False)
+Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+shape, axes = (Lt, Lz, Ly, Lx, 4, 4, 3, 3), (3, 2, 1, 0)
+propagator_raw = numpy.random.default_rng(getMPIRank()).random(shape).astype(">c16")
+megabytes = propagator_raw.nbytes * getMPIComm().Get_size() / 1e6
+
+configs = [
+    {},
+    {"romio_cb_read": "disable", "romio_cb_write": "disable"},
+    {"romio_cb_read": "enable", "romio_cb_write": "enable"},
+    {"romio_cb_read": "enable", "romio_cb_write": "enable", "cb_buffer_size": 64 * 1024**2},
+    {"romio_ds_read": "disable", "romio_ds_write": "disable"},
+]
+for cb_nodes in [1, 2, 4, 8]:
+    if cb_nodes <= getMPIComm().Get_size():
+        configs.append({"romio_cb_read": "enable", "romio_cb_write": "enable", "cb_nodes": cb_nodes})
+for striping_factor in [4, 16, 64]:
+    configs.append({"striping_factor": striping_factor, "striping_unit": 4 * 1024**2})
+
+
+for config in configs:
+    setMPIIOHints(**config)
+    # striping is only set when a file is created
+    if getMPIRank() == 0 and os.path.exists(filename):
+        os.remove(filename)
+    getMPIComm().Barrier()
+    secs_write, _ = timeit(writeMPIFile, filename, ">c16", 0, shape, axes, propagator_raw, repeat=repeat)
+    secs_read, _ = timeit(readMPIFile, filename, ">c16", 0, shape, axes, repeat=repeat)
+    assert numpy.array_equal(readMPIFile(filename, ">c16", 0, shape, axes), propagator_raw)
+    if getMPIRank() == 0:
+        print(
+            f"{str(config) if config else 'default':>90s}: "
+            f"write {megabytes / secs_write:8.1f} MB/s, read {megabytes / secs_read:8.1f} MB/s"
+        )
+setMPIIOHints()
+if getMPIRank() == 0:
+    os.remove(filename)
@@ -1,7 +1,8 @@
 import logging
 from os import environ
 from sys import stdout
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Sequence
+import threading
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Sequence, Union
 
 from mpi4py import MPI
 from mpi4py.util import dtlib
@@ -59,6 +60,7 @@ class _ComputeCapability(NamedTuple):
 
 _MPI_LOGGER: _MPILogger = _MPILogger()
 _MPI_COMM: MPI.Comm = MPI.COMM_WORLD
+_MPI_THREAD: threading.local = threading.local()  # per-thread communicator override, see utils.io.prefetch
 _MPI_SIZE: int = _MPI_COMM.Get_size()
 _MPI_RANK: int = _MPI_COMM.Get_rank()
 _GRID_SIZE: List[int] = None
@@ -67,6 +69,9 @@ _DEFAULT_LATTICE: LatticeInfo = None
 _CUDA_BACKEND: Literal["numpy", "cupy", "torch"] = "cupy"
 _GPUID: int = -1
 _COMPUTE_CAPABILITY: _ComputeCapability = _ComputeCapability(0, 0)
+_MEMMAP_IO: bool = None
+_MEMMAP_CHUNK_BYTES: int = 16 * 1024**2
+_MPIIO_HINTS: Dict[str, str] = {}
 
 
 def getRankFromCoord(coord: List[int], grid: List[int]) -> int:
@@ -108,6 +113,18 @@ def _initEnvironWarn(**kwargs):
         _setEnviron(f"QUDA_{key.upper()}", key, kwargs[key])
 
 
+def _initMPIIOHints(mpi_io_hints: Dict[str, Any]):
+    env = "PYQUDA_MPIIO_HINTS"
+    if mpi_io_hints is not None:
+        if env in environ:
+            _MPI_LOGGER.warning(f"Both {env} and init(mpi_io_hints) are set", RuntimeWarning)
+    elif env in environ:
+        mpi_io_hints = dict(hint.split("=", 1) for hint in environ[env].split(",") if hint != "")
+    if mpi_io_hints is not None:
+        setMPIIOHints(**mpi_io_hints)
+        _MPI_LOGGER.info(f"Using MPI-IO hints {_MPIIO_HINTS}")
+
+
 def init(
     grid_size: List[int] = None,
     latt_size: List[int] = None,
@@ -140,9 +157,13 @@ def init(
     enable_managed_prefetch: bool = False,
     deterministic_reduce: bool = False,
     device_reset: bool = False,
+    mpi_io_hints: Dict[str, Any] = None,
 ):
     """
     Initialize MPI along with the QUDA library.
+
+    `mpi_io_hints` are the MPI-IO hints passed when a file is opened, see `setMPIIOHints`. They can also be set
+    in the environment as PYQUDA_MPIIO_HINTS="cb_nodes=4,romio_cb_read=enable".
     """
     global _GRID_SIZE, _GRID_COORD
     if _GRID_SIZE is None:
@@ -185,6 +206,7 @@ def init(
             deterministic_reduce="1" if deterministic_reduce else None,
             device_reset="1" if device_reset else None,
         )
+        _initMPIIOHints(mpi_io_hints)
 
         global _DEFAULT_LATTICE, _CUDA_BACKEND, _GPUID, _COMPUTE_CAPABILITY
 
@@ -267,8 +289,8 @@ def setLoggerLevel(level: int):
     _MPI_LOGGER.logger.setLevel(level)
 
 
-def getMPIComm():
-    return _MPI_COMM
+def getMPIComm() -> MPI.Comm:
+    return getattr(_MPI_THREAD, "comm", _MPI_COMM)
 
 
 def getMPISize():
@@ -340,28 +362,162 @@ def _getSubarray(shape: Sequence[int], axes: Sequence[int]):
     return sizes, subsizes, starts
 
 
+def setMemmapIO(enabled: bool = None):
+    """
+    Read files with numpy.memmap instead of MPI-IO, by default only with a single process. Every rank maps
+    the file itself, which needs a file system consistent between the nodes for several processes.
+    """
+    global _MEMMAP_IO
+    _MEMMAP_IO = enabled
+
+
+def setMPIIOHints(
+    cb_nodes: int = None,
+    cb_buffer_size: int = None,
+    romio_cb_read: Literal["enable", "disable", "automatic"] = None,
+    romio_cb_write: Literal["enable", "disable", "automatic"] = None,
+    striping_factor: int = None,
+    striping_unit: int = None,
+    **hints,
+):
+    """
+    Set the MPI-IO hints passed to MPI.File.Open by `readMPIFile` and `writeMPIFile`, replacing the previous
+    ones. `cb_nodes` and `cb_buffer_size` set the number of aggregators and their buffer in collective buffering,
+    `romio_cb_read`/`romio_cb_write` turn it on or off, and `striping_factor`/`striping_unit` set the Lustre
+    stripe count and size of the files created. Other hints, like romio_ds_read, are passed through `hints`.
+    The implementation ignores the hints it does not know, and the striping of an existing file is not changed.
+    """
+    global _MPIIO_HINTS
+    hints.update(
+        cb_nodes=cb_nodes,
+        cb_buffer_size=cb_buffer_size,
+        romio_cb_read=romio_cb_read,
+        romio_cb_write=romio_cb_write,
+        striping_factor=striping_factor,
+        striping_unit=striping_unit,
+    )
+    _MPIIO_HINTS = {key: str(value) for key, value in hints.items() if value is not None}
+
+
+def getMPIIOHints():
+    return dict(_MPIIO_HINTS)
+
+
+def _openMPIFile(filename: str, amode: int) -> MPI.File:
+    if not _MPIIO_HINTS:
+        return MPI.File.Open(getMPIComm(), filename, amode)
+    info = MPI.Info.Create()
+    for key, value in _MPIIO_HINTS.items():
+        info.Set(key, value)
+    fh = MPI.File.Open(getMPIComm(), filename, amode, info)
+    info.Free()
+    return fh
+
+
+def _readMemmap(filename: str, dtype: str, offset: int, sizes, subsizes, starts, out: numpy.ndarray):
+    # map and convert a few MiB of the outermost axis at a time, so that only `out` stays resident
+    row_bytes = int(numpy.prod(sizes[1:])) * numpy.dtype(dtype).itemsize
+    step = max(1, _MEMMAP_CHUNK_BYTES // row_bytes)
+    local = tuple(slice(start, start + size) for start, size in zip(starts[1:], subsizes[1:]))
+    for i in range(0, subsizes[0], step):
+        rows = min(step, subsizes[0] - i)
+        chunk = numpy.memmap(
+            filename, dtype, "r", offset + (starts[0] + i) * row_bytes, (rows, *sizes[1:]), order="C"
+        )
+        out[i : i + rows] = chunk[(slice(None), *local)]
+        del chunk
+
+
 def readMPIFile(
     filename: str,
     dtype: str,
-    offset: int,
+    offset: Union[int, Sequence[int]],
     shape: Sequence[int],
     axes: Sequence[int],
+    out_dtype: str = None,
 ):
+    """
+    Read the local subarray of a record at `offset`. With a list of offsets, the subarrays of all these records
+    are read in one collective call and stacked, the number of records may differ between ranks.
+
+    The data is returned as `dtype`, or converted to `out_dtype` if given. With a single process (see
+    `setMemmapIO`) the file is memory-mapped and converted in chunks, so no buffer of the file data is allocated.
+    """
     sizes, subsizes, starts = _getSubarray(shape, axes)
     native_dtype = dtype if not dtype.startswith(">") else dtype.replace(">", "<")
-    buf = numpy.empty(subsizes, native_dtype)
 
-    fh = MPI.File.Open(_MPI_COMM, filename, MPI.MODE_RDONLY)
+    if _MEMMAP_IO or (_MEMMAP_IO is None and getMPIComm().Get_size() == 1):
+        offsets = [offset] if isinstance(offset, int) else offset
+        buf = numpy.empty((len(offsets), *subsizes), dtype if out_dtype is None else out_dtype)
+        for i, record_offset in enumerate(offsets):
+            _readMemmap(filename, dtype, int(record_offset), sizes, subsizes, starts, buf[i])
+        return buf[0] if isinstance(offset, int) else buf
+
+    fh = _openMPIFile(filename, MPI.MODE_RDONLY)
     filetype = dtlib.from_numpy_dtype(native_dtype).Create_subarray(sizes, subsizes, starts)
-    filetype.Commit()
-    fh.Set_view(disp=offset, filetype=filetype)
-    fh.Read_all(buf)
+    if isinstance(offset, int):
+        buf = numpy.empty(subsizes, native_dtype)
+        filetype.Commit()
+        fh.Set_view(disp=offset, filetype=filetype)
+        fh.Read_all(buf)
+    elif len(offset) == 0:
+        # nothing to read on this rank, but the read is collective
+        buf = numpy.empty((0, *subsizes), native_dtype)
+        filetype.Commit()
+        fh.Set_view(disp=0, filetype=filetype)
+        fh.Read_all(buf)
+    else:
+        # the file view has to be monotonic, read the records sorted by offset
+        order = numpy.argsort(offset, kind="stable")
+        buf = numpy.empty((len(offset), *subsizes), native_dtype)
+        buf_sorted = buf if numpy.all(order == numpy.arange(len(offset))) else numpy.empty_like(buf)
+        subarray = filetype
+        filetype = MPI.Datatype.Create_struct(
+            [1] * len(offset), [int(offset[i]) for i in order], [subarray] * len(offset)
+        )
+        subarray.Free()
+        filetype.Commit()
+        fh.Set_view(disp=0, etype=dtlib.from_numpy_dtype(native_dtype), filetype=filetype)
+        fh.Read_all(buf_sorted)
+        if buf_sorted is not buf:
+            buf[order] = buf_sorted
     filetype.Free()
     fh.Close()
 
+    if out_dtype is not None:
+        return buf.view(dtype).astype(out_dtype)
     return buf.view(dtype)
 
 
+def mapMPIFile(
+    filename: str,
+    dtype: str,
+    offset: Union[int, Sequence[int]],
+    shape: Sequence[int],
+    axes: Sequence[int],
+):
+    """
+    The local subarray of a record at `offset` as a read-only view of the memory-mapped file if files are read
+    with numpy.memmap (see `setMemmapIO`), otherwise it is read with `readMPIFile`. The pages of the view are read
+    when they are accessed, so a reader converting it one timeslice at a time never holds a copy of the file data.
+    A list of offsets is mapped as one view only if the records are evenly spaced.
+    """
+    offsets = [offset] if isinstance(offset, int) else [int(record_offset) for record_offset in offset]
+    spacings = set(numpy.diff(offsets).tolist())
+    if (_MEMMAP_IO or (_MEMMAP_IO is None and getMPIComm().Get_size() == 1)) and (
+        len(offsets) == 1 or (len(spacings) == 1 and min(spacings) > 0)
+    ):
+        sizes, subsizes, starts = _getSubarray(shape, axes)
+        strides = (numpy.cumprod([1, *sizes[::-1]])[::-1] * numpy.dtype(dtype).itemsize).tolist()
+        record_bytes, strides = strides[0], strides[1:]
+        spacing = spacings.pop() if len(offsets) > 1 else record_bytes
+        data = numpy.memmap(filename, "<u1", "r", offsets[0], ((len(offsets) - 1) * spacing + record_bytes,))
+        data = numpy.ndarray((len(offsets), *sizes), dtype, data, strides=(spacing, *strides))
+        data = data[(slice(None), *(slice(start, start + size) for start, size in zip(starts, subsizes)))]
+        return data[0] if isinstance(offset, int) else data
+    return readMPIFile(filename, dtype, offset, shape, axes)
+
+
 def writeMPIFile(
     filename: str,
     dtype: str,
@@ -374,10 +530,46 @@ def writeMPIFile(
     native_dtype = dtype if not dtype.startswith(">") else dtype.replace(">", "<")
     buf = buf.view(native_dtype)
 
-    fh = MPI.File.Open(_MPI_COMM, filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    fh = _openMPIFile(filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
     filetype = dtlib.from_numpy_dtype(native_dtype).Create_subarray(sizes, subsizes, starts)
     filetype.Commit()
     fh.Set_view(disp=offset, filetype=filetype)
     fh.Write_all(buf)
     filetype.Free()
     fh.Close()
+
+
+def readMPIFileBytes(filename: str, offsets: Sequence[int], lengths: Sequence[int]) -> List[numpy.ndarray]:
+    """
+    Read the byte ranges (offset, length) of a file in one collective call, the ranges may differ between ranks
+    but must not overlap. The ranges are returned as uint8 arrays in the order they are given.
+    """
+    order = sorted(range(len(offsets)), key=lambda i: offsets[i])
+    starts = numpy.cumsum([0] + [int(lengths[i]) for i in order])
+    buf = numpy.empty(starts[-1], "<u1")
+
+    if _MEMMAP_IO or (_MEMMAP_IO is None and getMPIComm().Get_size() == 1):
+        with open(filename, "rb") as f:
+            for j, i in enumerate(order):
+                f.seek(int(offsets[i]))
+                f.readinto(memoryview(buf[starts[j] : starts[j + 1]]))
+    else:
+        fh = _openMPIFile(filename, MPI.MODE_RDONLY)
+        filetype = MPI.BYTE.Create_hindexed([int(lengths[i]) for i in order], [int(offsets[i]) for i in order])
+        filetype.Commit()
+        fh.Set_view(disp=0, etype=MPI.BYTE, filetype=filetype)
+        fh.Read_all(buf)
+        filetype.Free()
+        fh.Close()
+
+    ret = [None] * len(offsets)
+    for j, i in enumerate(order):
+        ret[i] = buf[starts[j] : starts[j + 1]]
+    return ret
+
+
+def writeMPIFileBytes(filename: str, offset: int, buf: Union[bytes, numpy.ndarray]):
+    """Write `buf` at `offset` on every rank in one collective call, the ranges must not overlap."""
+    fh = _openMPIFile(filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    fh.Write_at_all(offset, numpy.frombuffer(buf, "<u1") if isinstance(buf, bytes) else buf.view("<u1"))
+    fh.Close()
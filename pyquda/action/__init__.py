@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
+from ..pyquda import QudaInvertParam
+from ..enum_quda import QudaPrecision
 from ..field import LatticeInfo, LatticeFermion
+from ..dirac import Chrono
 
 
 class GaugeAction(ABC):
@@ -20,9 +23,22 @@ class GaugeAction(ABC):
 
 class FermionAction(ABC):
     latt_info: LatticeInfo
+    invert_param: QudaInvertParam
 
     def __init__(self, latt_info: LatticeInfo) -> None:
         self.latt_info = latt_info
+        self.chrono = None
+
+    def setChrono(self, index: int, max_dim: int, precision: QudaPrecision = None):
+        """
+        Start the solves of this action from a chronological guess, `index` must be unique among actions. Only
+        the solves without shifts use it, QUDA has no chronological guess for multi-shift solves.
+        """
+        self.chrono = Chrono(self.invert_param, index, max_dim, precision)
+
+    def flushChrono(self):
+        if self.chrono is not None:
+            self.chrono.flush()
 
     @abstractmethod
     def action(self, new_gauge: bool) -> float:
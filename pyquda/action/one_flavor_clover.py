@@ -13,7 +13,7 @@ from ..enum_quda import (
     QudaSolveType,
     QudaVerbosity,
 )
-from ..field import Nd, Nc, Ns, LatticeInfo, LatticeFermion, MultiLatticeFermion
+from ..field import Nd, Nc, Ns, LatticeInfo, LatticeFermion, MultiLatticeFermion, getFieldPool
 from ..dirac.clover_wilson import CloverWilson
 
 nullptr = Pointers("void", 0)
@@ -87,6 +87,11 @@ offset_inv_square_root = [
 
 
 class OneFlavorClover(FermionAction):
+    """
+    All the solves of this action are multi-shift solves of the rational approximation, for which QUDA keeps
+    no chronological history, so setChrono() has no effect on them.
+    """
+
     def __init__(self, latt_info: LatticeInfo, mass: float, tol: float, maxiter: int, clover_csw: float) -> None:
         super().__init__(latt_info)
         if latt_info.anisotropy != 1.0:
@@ -122,10 +127,11 @@ class OneFlavorClover(FermionAction):
         self.invert_param.num_offset = num_offset
         self.invert_param.offset = offset_inv_square_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
         self.invert_param.residue = residue_inv_square_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
-        xx = MultiLatticeFermion(self.phi.latt_info, num_offset)
+        xx = getFieldPool().get(MultiLatticeFermion, self.phi.latt_info, num_offset)
         self.invert_param.compute_action = 1
         invertMultiShiftQuda(xx.even_ptrs, self.phi.odd_ptr, self.invert_param)
         self.dirac.invert_param.compute_action = 0
+        getFieldPool().put(xx)
         return (
             self.invert_param.action[0]
             - self.latt_info.volume_cb2 * Ns * Nc
@@ -138,7 +144,7 @@ class OneFlavorClover(FermionAction):
         self.invert_param.num_offset = num_offset
         self.invert_param.offset = offset_inv_square_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
         self.invert_param.residue = residue_inv_square_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
-        xx = MultiLatticeFermion(self.phi.latt_info, num_offset)
+        xx = getFieldPool().get(MultiLatticeFermion, self.phi.latt_info, num_offset)
         invertMultiShiftQuda(xx.even_ptrs, self.phi.odd_ptr, self.invert_param)
         # Some conventions force the dagger to be YES here
         self.invert_param.dagger = QudaDagType.QUDA_DAG_YES
@@ -155,6 +161,7 @@ class OneFlavorClover(FermionAction):
             self.invert_param,
         )
         self.invert_param.dagger = QudaDagType.QUDA_DAG_NO
+        getFieldPool().put(xx)
 
     def sample(self, noise: LatticeFermion, new_gauge: bool):
         self.updateClover(new_gauge)
@@ -162,9 +169,10 @@ class OneFlavorClover(FermionAction):
         self.invert_param.num_offset = num_offset
         self.invert_param.offset = offset_fourth_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
         self.invert_param.residue = residue_fourth_root + [0.0] * (QUDA_MAX_MULTI_SHIFT - num_offset)
-        xx = MultiLatticeFermion(noise.latt_info, num_offset)
+        xx = getFieldPool().get(MultiLatticeFermion, noise.latt_info, num_offset)
         invertMultiShiftQuda(xx.even_ptrs, noise.even_ptr, self.invert_param)
         self.phi.even = noise.even
         self.phi.odd = const_fourth_root * noise.even
         for i in range(num_offset):
             self.phi.data[1] += residue_fourth_root[i] * xx.data[i, 0]
+        getFieldPool().put(xx)
@@ -48,12 +48,19 @@ class TwoFlavorClover(FermionAction):
             loadGaugeQuda(nullptr, self.gauge_param)
             loadCloverQuda(nullptr, nullptr, self.invert_param)
 
+    def invert(self):
+        if self.chrono is not None:
+            self.chrono.setup()
+        invertQuda(self.phi.even_ptr, self.phi.odd_ptr, self.invert_param)
+        if self.chrono is not None:
+            self.chrono.update()
+
     def action(self, new_gauge: bool) -> float:
         self.invert_param.compute_clover_trlog = 1
         self.updateClover(new_gauge)
         self.invert_param.compute_clover_trlog = 0
         self.invert_param.compute_action = 1
-        invertQuda(self.phi.even_ptr, self.phi.odd_ptr, self.invert_param)
+        self.invert()
         self.dirac.invert_param.compute_action = 0
         return (
             self.invert_param.action[0]
@@ -63,7 +70,7 @@ class TwoFlavorClover(FermionAction):
 
     def force(self, dt, new_gauge: bool):
         self.updateClover(new_gauge)
-        invertQuda(self.phi.even_ptr, self.phi.odd_ptr, self.invert_param)
+        self.invert()
         # Some conventions force the dagger to be YES here
         self.invert_param.dagger = QudaDagType.QUDA_DAG_YES
         computeCloverForceQuda(
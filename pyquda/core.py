@@ -18,11 +18,14 @@ from .field import (
     LatticeInfo,
     LatticeGauge,
     LatticeFermion,
+    MultiLatticeFermion,
     LatticePropagator,
     LatticeStaggeredFermion,
+    MultiLatticeStaggeredFermion,
     LatticeStaggeredPropagator,
     lexico,
     cb2,
+    getFieldPool,
 )
 from .dirac import Multigrid, Dirac, StaggeredDirac
 from .utils.source import source
@@ -38,15 +41,26 @@ def invert(
 ):
     latt_info = dslash.latt_info
 
+    pool = getFieldPool()
+    b = pool.get(MultiLatticeFermion, latt_info, Ns * Nc)
+    x = pool.get(MultiLatticeFermion, latt_info, Ns * Nc)
+    for spin in range(Ns):
+        for color in range(Nc):
+            source(latt_info, source_type, t_srce, spin, color, source_phase, b[spin * Nc + color])
+    dslash.solver_log.source = f"{source_type} {t_srce}"
+    dslash.invertMultiSrc(b, x)
+    for _ in range(restart):
+        r = b.copy()
+        for i in range(Ns * Nc):
+            r[i] -= dslash.mat(x[i])
+        x += dslash.invertMultiSrc(r)
+    dslash.solver_log.source = None
     prop = LatticePropagator(latt_info)
     for spin in range(Ns):
         for color in range(Nc):
-            b = source(latt_info, source_type, t_srce, spin, color, source_phase)
-            x = dslash.invert(b)
-            for _ in range(restart):
-                r = b - dslash.mat(x)
-                x += dslash.invert(r)
-            prop.setFermion(x, spin, color)
+            prop.setFermion(x[spin * Nc + color], spin, color)
+    pool.put(b)
+    pool.put(x)
 
     return prop
 
@@ -60,14 +74,24 @@ def invertStaggered(
 ):
     latt_info = dslash.latt_info
 
+    pool = getFieldPool()
+    b = pool.get(MultiLatticeStaggeredFermion, latt_info, Nc)
+    x = pool.get(MultiLatticeStaggeredFermion, latt_info, Nc)
+    for color in range(Nc):
+        source(latt_info, source_type, t_srce, None, color, source_phase, b[color])
+    dslash.solver_log.source = f"{source_type} {t_srce}"
+    dslash.invertMultiSrc(b, x)
+    for _ in range(restart):
+        r = b.copy()
+        for i in range(Nc):
+            r[i] -= dslash.mat(x[i])
+        x += dslash.invertMultiSrc(r)
+    dslash.solver_log.source = None
     prop = LatticeStaggeredPropagator(latt_info)
     for color in range(Nc):
-        b = source(latt_info, source_type, t_srce, None, color, source_phase)
-        x = dslash.invert(b)
-        for _ in range(restart):
-            r = b - dslash.mat(x)
-            x += dslash.invert(r)
-        prop.setFermion(x, color)
+        prop.setFermion(x[color], color)
+    pool.put(b)
+    pool.put(x)
 
     return prop
 
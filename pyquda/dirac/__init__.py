@@ -1,5 +1,9 @@
+import json
+import os
 from abc import ABC, abstractmethod
-from typing import NamedTuple
+from typing import Any, Dict, List, Literal, NamedTuple, Union
+
+import numpy
 
 from ..pointer import Pointer
 from ..pyquda import (
@@ -8,16 +12,36 @@ from ..pyquda import (
     QudaMultigridParam,
     QudaGaugeSmearParam,
     QudaGaugeObservableParam,
+    QudaEigParam,
     invertQuda,
+    invertMultiSrcQuda,
     MatQuda,
     MatDagMatQuda,
     newMultigridQuda,
     updateMultigridQuda,
     destroyMultigridQuda,
     dumpMultigridQuda,
+    flushChronoQuda,
+    eigensolveQuda,
+)
+from ..enum_quda import (
+    QudaBoolean,
+    QudaDagType,
+    QudaInverterType,
+    QudaPrecision,
+    QudaReconstructType,
+    QudaSolutionType,
+    QudaSolveType,
+    QudaUseInitGuess,
+)
+from ..field import (
+    LatticeInfo,
+    LatticeGauge,
+    LatticeFermion,
+    MultiLatticeFermion,
+    LatticeStaggeredFermion,
+    MultiLatticeStaggeredFermion,
 )
-from ..enum_quda import QudaBoolean, QudaPrecision, QudaReconstructType
-from ..field import LatticeInfo, LatticeGauge, LatticeFermion, LatticeStaggeredFermion
 
 
 class Precision(NamedTuple):
@@ -50,6 +74,18 @@ _reconstruct = Reconstruct(
 )
 
 
+def getCPUPrecision(dtype: str) -> QudaPrecision:
+    """QUDA host precision matching the storage dtype of a lattice field."""
+    from .. import getLogger
+
+    if dtype in ("<c8", "<f4"):
+        return QudaPrecision.QUDA_SINGLE_PRECISION
+    elif dtype in ("<c16", "<f8"):
+        return QudaPrecision.QUDA_DOUBLE_PRECISION
+    else:
+        getLogger().critical(f"Unsupported dtype {dtype} for a host field", ValueError)
+
+
 def setPrecision(
     *,
     cuda: QudaPrecision = None,
@@ -133,6 +169,14 @@ class Gauge(ABC):
         )
 
 
+def gaugeChecksum(gauge: LatticeGauge) -> str:
+    """CRC32 of the whole gauge field, the same on every rank, to tell which configuration a cache belongs to."""
+    import zlib
+
+    checksum = gauge.latt_info.mpi_comm.allgather(zlib.crc32(gauge.getHost()))
+    return f"{zlib.crc32(bytes(str(checksum), 'ascii')):08x}"
+
+
 class Multigrid:
     param: QudaMultigridParam
     inv_param: QudaInvertParam
@@ -142,6 +186,29 @@ class Multigrid:
         self.param = param
         self.inv_param = inv_param
         self.instance = None
+        self.geo_block_size: List[List[int]] = None
+        self.policy: Literal["rebuild", "refresh", "reuse"] = "refresh"
+        self.cache: str = None
+
+    @classmethod
+    def create(
+        cls,
+        geo_block_size: List[List[int]],
+        policy: Literal["rebuild", "refresh", "reuse"] = "refresh",
+        cache: str = None,
+    ):
+        """
+        Multigrid options for core.getDirac(multigrid=...), the parameters are filled in by the Dirac operator.
+
+        On a new gauge field, "rebuild" runs the full null-space setup, "refresh" runs `setup_maxiter_refresh`
+        iterations on the previous null vectors and "reuse" only updates the coarse operators. With `cache`,
+        the first setup is loaded from that directory if it matches, and saved to it otherwise.
+        """
+        multigrid = cls(None, None)
+        multigrid.geo_block_size = geo_block_size
+        multigrid.policy = policy
+        multigrid.cache = cache
+        return multigrid
 
     def new(self):
         if self.instance is not None:
@@ -150,10 +217,12 @@ class Multigrid:
 
     def update(self, thin_update_only: bool):
         if self.instance is not None:
-            if thin_update_only:
+            if thin_update_only or self.policy == "reuse":
                 self.param.thin_update_only = QudaBoolean.QUDA_BOOLEAN_TRUE
                 updateMultigridQuda(self.instance, self.param)
                 self.param.thin_update_only = QudaBoolean.QUDA_BOOLEAN_FALSE
+            elif self.policy == "rebuild":
+                self.new()
             else:
                 updateMultigridQuda(self.instance, self.param)
 
@@ -162,12 +231,298 @@ class Multigrid:
             destroyMultigridQuda(self.instance)
         self.instance = None
 
+    def key(self, gauge: LatticeGauge):
+        latt_info = gauge.latt_info
+        return {
+            "latt_size": latt_info.global_size,
+            "grid_size": latt_info.grid_size,
+            "geo_block_size": self.param.geo_block_size,
+            "n_vec": self.param.n_vec,
+            "mass": self.inv_param.mass,
+            "gauge_checksum": gaugeChecksum(gauge),
+        }
+
+    def _setVecFile(self, path: str, load: bool):
+        # QUDA only reads or writes the null vectors of a level if vec_load or vec_store of that level is set, and
+        # each level needs its own file as the geometry of the vectors differs between levels
+        n_level = self.param.n_level
+        enabled = QudaBoolean.QUDA_BOOLEAN_TRUE if path is not None else QudaBoolean.QUDA_BOOLEAN_FALSE
+        filenames = [
+            os.path.join(path, f"null_{level}").encode() if path is not None else b"" for level in range(n_level)
+        ]
+        if load:
+            self.param.vec_load = [enabled] * n_level
+            self.param.vec_infile = filenames
+        else:
+            self.param.vec_store = [enabled] * n_level
+            self.param.vec_outfile = filenames
+
+    def save(self, path: str, gauge: LatticeGauge):
+        """Dump the null vectors (QUDA built with QIO is required) and the key they are valid for into `path`."""
+        from .. import getLogger, getMPIComm, getMPIRank
+
+        if self.instance is None:
+            getLogger().critical("Multigrid.save() requires a multigrid setup", RuntimeError)
+        key = self.key(gauge)
+        if getMPIRank() == 0:
+            os.makedirs(path, exist_ok=True)
+        getMPIComm().Barrier()
+        vec_store, vec_outfile = self.param.vec_store, self.param.vec_outfile
+        self._setVecFile(path, False)
+        dumpMultigridQuda(self.instance, self.param)
+        self.param.vec_store, self.param.vec_outfile = vec_store, vec_outfile
+        if getMPIRank() == 0:
+            with open(os.path.join(path, "key.json"), "w") as f:
+                json.dump(key, f)
+        getMPIComm().Barrier()
+
+    def load(self, path: str, gauge: LatticeGauge) -> bool:
+        """
+        Set up from the null vectors saved in `path` if the lattice, blocks and mass match. With a different
+        gauge field they are only used as the starting point of an update following `policy`.
+        """
+        from .. import getLogger
+
+        key_file = os.path.join(path, "key.json")
+        if not os.path.exists(key_file):
+            return False
+        with open(key_file) as f:
+            key_saved = json.load(f)
+        key = self.key(gauge)
+        gauge_checksum, gauge_checksum_saved = key.pop("gauge_checksum"), key_saved.pop("gauge_checksum", None)
+        if key != key_saved or (gauge_checksum != gauge_checksum_saved and self.policy == "rebuild"):
+            getLogger().info(f"Multigrid setup in {path} does not match, rebuilding")
+            return False
+        vec_load, vec_infile = self.param.vec_load, self.param.vec_infile
+        self._setVecFile(path, True)
+        self.new()
+        self.param.vec_load, self.param.vec_infile = vec_load, vec_infile
+        if gauge_checksum != gauge_checksum_saved:
+            self.update(False)
+        getLogger().info(f"Multigrid setup loaded from {path}")
+        return True
+
+
+class Chrono:
+    """
+    Chronological initial guess for repeated solves with a slowly changing operator: QUDA keeps the
+    last `max_dim` solutions resident under `index` and starts each solve from their minimal residual
+    extrapolation. Call flush() whenever the gauge field jumps, e.g. after a rejected trajectory.
+    """
+
+    def __init__(self, invert_param: QudaInvertParam, index: int, max_dim: int, precision: QudaPrecision = None):
+        self.invert_param = invert_param
+        self.index = index
+        self.max_dim = max_dim
+        self.precision = invert_param.cuda_prec if precision is None else precision
+        self.size = 0
+        self.solves = [0, 0]  # without and with history
+        self.iters = [0, 0]
+
+    def setup(self):
+        self.invert_param.chrono_index = self.index
+        self.invert_param.chrono_max_dim = self.max_dim
+        self.invert_param.chrono_precision = self.precision
+        self.invert_param.chrono_make_resident = 1
+        self.invert_param.chrono_replace_last = 0
+        self.invert_param.chrono_use_resident = 1 if self.size > 0 else 0
+
+    def update(self):
+        warm = 1 if self.size > 0 else 0
+        self.solves[warm] += 1
+        self.iters[warm] += self.invert_param.iter
+        self.size = min(self.size + 1, self.max_dim)
+
+    def flush(self):
+        flushChronoQuda(self.index)
+        self.size = 0
+
+    def stats(self):
+        """Iterations saved are estimated against the mean iteration count of solves started from zero."""
+        cold, warm = self.solves
+        iter_cold = self.iters[0] / cold if cold > 0 else 0.0
+        iter_warm = self.iters[1] / warm if warm > 0 else 0.0
+        return {
+            "solves": cold + warm,
+            "iter_cold": iter_cold,
+            "iter_warm": iter_warm,
+            "iter_saved": (iter_cold - iter_warm) * warm if cold > 0 else 0.0,
+        }
+
+
+class Deflation:
+    """
+    Lowest `n_ev` eigenpairs of M^\\dagger M, kept resident for every solve on the same gauge field.
+    Solves start from x0 = \\sum_i v_i (v_i^\\dagger M^\\dagger b) / \\lambda_i, so the low modes are already
+    resolved when the Krylov solver (or the multigrid cycle) takes over.
+    """
+
+    def __init__(
+        self,
+        eig_param: QudaEigParam,
+        eigenvalue: numpy.ndarray,
+        eigenvector: Union[MultiLatticeFermion, MultiLatticeStaggeredFermion],
+    ) -> None:
+        self.eig_param = eig_param
+        self.eigenvalue = eigenvalue
+        self.eigenvector = eigenvector
+
+    def eigensolve(self, invert_param: QudaInvertParam):
+        solve_type, solution_type = invert_param.solve_type, invert_param.solution_type
+        invert_param.solve_type = QudaSolveType.QUDA_DIRECT_SOLVE
+        invert_param.solution_type = QudaSolutionType.QUDA_MAT_SOLUTION
+        invert_param.cpu_prec = getCPUPrecision(self.eigenvector.dtype)
+        eigenvalue = numpy.zeros((self.eigenvector.L5), "<c16")
+        eigensolveQuda(self.eigenvector.data_ptrs, eigenvalue, self.eig_param)
+        invert_param.solve_type, invert_param.solution_type = solve_type, solution_type
+        self.eigenvalue = eigenvalue.real.copy()
+
+    def guess(self, dirac: "Dirac", b: Union[LatticeFermion, LatticeStaggeredFermion], x):
+        """Overwrite `x` with the deflated initial guess for the source `b`."""
+        from .. import getMPIComm
+
+        dirac.invert_param.dagger = QudaDagType.QUDA_DAG_YES
+        dirac.mat(b, x)
+        dirac.invert_param.dagger = QudaDagType.QUDA_DAG_NO
+        location = self.eigenvector.location
+        eigenvector = self.eigenvector.data.reshape(self.eigenvector.L5, -1)
+        # conjugate the vector rather than the whole eigenspace
+        coeff = (x.data.reshape(-1).conj() @ eigenvector.T).conj()
+        if location == "numpy":
+            coeff = getMPIComm().allreduce(coeff) / self.eigenvalue
+        elif location == "cupy":
+            import cupy
+
+            coeff = cupy.asarray(getMPIComm().allreduce(coeff.get()) / self.eigenvalue)
+        elif location == "torch":
+            import torch
+
+            coeff = torch.as_tensor(
+                getMPIComm().allreduce(coeff.cpu().numpy()) / self.eigenvalue, device=eigenvector.device
+            )
+        x.data[:] = (coeff @ eigenvector).reshape(x.data.shape)
+
+
+class SolverLog:
+    """
+    Per-solve records of a Dirac operator. Records are grouped by `configuration`, which defaults to the
+    number of loadGauge() calls so far, and labelled with `source`, which core.invert() sets to the source
+    type and position. Timings are those of the local rank unless reduced in summary().
+    """
+
+    fields = (
+        "configuration",
+        "source",
+        "num_src",
+        "inv_type",
+        "tol",
+        "iter",
+        "true_res",
+        "true_res_hq",
+        "secs",
+        "gflops",
+        "cuda_prec",
+        "sloppy_prec",
+        "precondition_prec",
+        "mg_n_level",
+        "mg_setup_secs",
+        "mg_setup_gflops",
+        "n_ev_deflate",
+    )
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self.configuration: str = None
+        self.source: str = None
+        self.num_gauge = 0
+
+    def newConfiguration(self):
+        self.num_gauge += 1
+
+    def append(self, dirac: "Dirac", num_src: int):
+        invert_param = dirac.invert_param
+        multigrid = dirac.multigrid if hasattr(dirac, "multigrid") and dirac.multigrid.param is not None else None
+        self.records.append(
+            {
+                "configuration": self.configuration if self.configuration is not None else str(self.num_gauge),
+                "source": self.source,
+                "num_src": num_src,
+                "inv_type": QudaInverterType(invert_param.inv_type).name,
+                "tol": invert_param.tol,
+                "iter": invert_param.iter,
+                "true_res": invert_param.true_res,
+                "true_res_hq": invert_param.true_res_hq,
+                "secs": invert_param.secs,
+                "gflops": invert_param.gflops,
+                "cuda_prec": QudaPrecision(invert_param.cuda_prec).name,
+                "sloppy_prec": QudaPrecision(invert_param.cuda_prec_sloppy).name,
+                "precondition_prec": QudaPrecision(invert_param.cuda_prec_precondition).name,
+                "mg_n_level": multigrid.param.n_level if multigrid is not None else 0,
+                "mg_setup_secs": multigrid.param.secs if multigrid is not None else 0.0,
+                "mg_setup_gflops": multigrid.param.gflops if multigrid is not None else 0.0,
+                "n_ev_deflate": dirac.deflation.eigenvector.L5 if dirac.deflation is not None else 0,
+            }
+        )
+
+    def clear(self):
+        self.records = []
+
+    def summary(self, reduce: bool = False):
+        """
+        Aggregate the records per configuration. With `reduce`, this is collective and the timings are the
+        maximum over all MPI ranks, i.e. the wall time of the slowest rank.
+        """
+        from .. import getMPIComm
+
+        secs = numpy.array([record["secs"] for record in self.records], "<f8")
+        if reduce:
+            from mpi4py import MPI
+
+            getMPIComm().Allreduce(MPI.IN_PLACE, secs, MPI.MAX)
+        summary: Dict[str, Dict[str, Any]] = {}
+        for record, sec in zip(self.records, secs):
+            item = summary.setdefault(
+                record["configuration"],
+                {"solves": 0, "num_src": 0, "iter": 0, "iter_max": 0, "true_res_max": 0.0, "secs": 0.0, "flops": 0.0},
+            )
+            item["solves"] += 1
+            item["num_src"] += record["num_src"]
+            item["iter"] += record["iter"]
+            item["iter_max"] = max(item["iter_max"], record["iter"])
+            item["true_res_max"] = max(item["true_res_max"], record["true_res"])
+            item["secs"] += float(sec)
+            item["flops"] += record["gflops"]
+        for item in summary.values():
+            item["iter_mean"] = item["iter"] / item["solves"]
+            item["gflops"] = item.pop("flops") / item["secs"] if item["secs"] > 0 else 0.0
+        return summary
+
+    def dump(self, filename: str, reduce: bool = False):
+        """Write the records as a CSV table if `filename` ends with .csv, otherwise as JSON with the summary."""
+        import csv
+        from .. import getMPIRank
+
+        summary = self.summary(reduce)
+        if getMPIRank() == 0:
+            if filename.endswith(".csv"):
+                with open(filename, "w", newline="") as f:
+                    writer = csv.DictWriter(f, self.fields)
+                    writer.writeheader()
+                    writer.writerows(self.records)
+            else:
+                with open(filename, "w") as f:
+                    json.dump({"records": self.records, "summary": summary}, f, indent=2)
+
 
 class Dirac(Gauge):
     multigrid: Multigrid
 
     def __init__(self, latt_info: LatticeInfo) -> None:
         super().__init__(latt_info)
+        self.deflation: Deflation = None
+        self.chrono: Chrono = None
+        self.solver_log = SolverLog()
+        self._gauge: LatticeGauge = None
 
     @abstractmethod
     def loadGauge(self, gauge: LatticeGauge):
@@ -183,25 +538,87 @@ class Dirac(Gauge):
         gflops, secs = self.invert_param.gflops, self.invert_param.secs
         getLogger().info(f"Time = {secs:.3f} secs, Performance = {gflops / secs:.3f} GFLOPS")
 
-    def invert(self, b: LatticeFermion):
-        x = LatticeFermion(b.latt_info)
+    def _gaugeChanged(self, gauge: LatticeGauge):
+        self._gauge = gauge
+        self.freeDeflation()
+        self.flushChrono()
+        self.solver_log.newConfiguration()
+
+    def setChrono(self, index: int, max_dim: int, precision: QudaPrecision = None):
+        """
+        Start every solve from a chronological guess built from the previous solutions on the same gauge field,
+        `index` must be unique among the Dirac operators and actions. QUDA has no chronological guess for
+        multi-source solves, so invertMultiSrc() then solves one source at a time.
+        """
+        self.chrono = Chrono(self.invert_param, index, max_dim, precision)
+
+    def flushChrono(self):
+        if self.chrono is not None:
+            self.chrono.flush()
+
+    def _invert(self, b: Union[LatticeFermion, LatticeStaggeredFermion], x):
+        if self.deflation is not None:
+            self.deflation.guess(self, b, x)
+            self.invert_param.use_init_guess = QudaUseInitGuess.QUDA_USE_INIT_GUESS_YES
+        if self.chrono is not None:
+            self.chrono.setup()
+        self.invert_param.cpu_prec = getCPUPrecision(b.dtype)
         invertQuda(x.data_ptr, b.data_ptr, self.invert_param)
+        if self.chrono is not None:
+            self.chrono.update()
+        self.invert_param.use_init_guess = QudaUseInitGuess.QUDA_USE_INIT_GUESS_NO
+        self.solver_log.append(self, 1)
+        self.performance()
+
+    def invert(self, b: LatticeFermion, out: LatticeFermion = None):
+        x = LatticeFermion(b.latt_info, dtype=b.dtype) if out is None else out
+        self._invert(b, x)
+        return x
+
+    def invertMultiSrc(
+        self,
+        b: Union[MultiLatticeFermion, MultiLatticeStaggeredFermion],
+        out: Union[MultiLatticeFermion, MultiLatticeStaggeredFermion] = None,
+    ):
+        x = b.__class__(b.latt_info, b.L5, dtype=b.dtype) if out is None else out
+        if b.location == "numpy" or self.chrono is not None:
+            for i in range(b.L5):
+                self.invert(b[i], x[i])
+            return x
+        if self.deflation is not None:
+            for i in range(b.L5):
+                self.deflation.guess(self, b[i], x[i])
+            self.invert_param.use_init_guess = QudaUseInitGuess.QUDA_USE_INIT_GUESS_YES
+        self.invert_param.cpu_prec = getCPUPrecision(b.dtype)
+        self.invert_param.num_src = b.L5
+        self.invert_param.num_src_per_sub_partition = b.L5
+        invertMultiSrcQuda(x.data_ptrs, b.data_ptrs, self.invert_param)
+        self.invert_param.num_src = 1
+        self.invert_param.num_src_per_sub_partition = 1
+        self.invert_param.use_init_guess = QudaUseInitGuess.QUDA_USE_INIT_GUESS_NO
+        self.solver_log.append(self, b.L5)
         self.performance()
         return x
 
-    def mat(self, x: LatticeFermion):
-        b = LatticeFermion(x.latt_info)
+    def mat(self, x: LatticeFermion, out: LatticeFermion = None):
+        b = LatticeFermion(x.latt_info, dtype=x.dtype) if out is None else out
+        self.invert_param.cpu_prec = getCPUPrecision(x.dtype)
         MatQuda(b.data_ptr, x.data_ptr, self.invert_param)
         return b
 
-    def matDagMat(self, x: LatticeFermion):
-        b = LatticeFermion(x.latt_info)
+    def matDagMat(self, x: LatticeFermion, out: LatticeFermion = None):
+        b = LatticeFermion(x.latt_info, dtype=x.dtype) if out is None else out
+        self.invert_param.cpu_prec = getCPUPrecision(x.dtype)
         MatDagMatQuda(b.data_ptr, x.data_ptr, self.invert_param)
         return b
 
-    def newMultigrid(self):
+    def newMultigrid(self, gauge: LatticeGauge = None):
         if self.multigrid.param is not None:
-            self.multigrid.new()
+            cache = self.multigrid.cache if gauge is not None else None
+            if cache is None or not self.multigrid.load(cache, gauge):
+                self.multigrid.new()
+                if cache is not None:
+                    self.multigrid.save(cache, gauge)
             self.invert_param.preconditioner = self.multigrid.instance
 
     def updateMultigrid(self, thin_update_only: bool):
@@ -213,20 +630,75 @@ class Dirac(Gauge):
         if self.multigrid.param is not None:
             self.multigrid.destroy()
 
+    def deflate(
+        self,
+        n_ev: int,
+        n_kr: int = None,
+        tol: float = 1e-8,
+        max_restarts: int = 100,
+        path: str = None,
+    ):
+        """
+        Compute the lowest `n_ev` modes of M^\\dagger M on the loaded gauge field and use them as the initial guess
+        of every following solve, until freeDeflation() or the next loadGauge(). With `path`, the eigenpairs are
+        read from that file if it holds at least `n_ev` of them for this lattice and gauge field, and computed and
+        written to it (readable by io.readDiracEigenvector) otherwise.
+        """
+        from .. import getLogger
+        from . import general
+
+        staggered = isinstance(self, StaggeredDirac)
+        if staggered:
+            eigenvector = MultiLatticeStaggeredFermion(self.latt_info, n_ev)
+        else:
+            eigenvector = MultiLatticeFermion(self.latt_info, n_ev)
+        eig_param = general.newQudaEigParam(
+            self.invert_param, n_ev, 2 * n_ev if n_kr is None else n_kr, tol, max_restarts, self.precision
+        )
+        self.deflation = Deflation(eig_param, None, eigenvector)
+        gauge_checksum = gaugeChecksum(self._gauge) if path is not None and self._gauge is not None else None
+        load = False
+        if path is not None and os.path.exists(path):
+            from ..utils.io.eigen import readDiracHeader
+
+            latt_size, staggered_saved, num_vecs, gauge_checksum_saved = readDiracHeader(path)
+            load = latt_size == self.latt_info.global_size and staggered_saved == staggered and num_vecs >= n_ev
+            load = load and gauge_checksum_saved == gauge_checksum
+            if not load:
+                getLogger().info(f"Deflation space in {path} does not match, recomputing")
+        if load:
+            from ..utils.io import readDiracEigenvector
+
+            self.deflation.eigenvalue, eigenvector = readDiracEigenvector(path, n_ev)
+            eigenvector.toDevice()
+            self.deflation.eigenvector = eigenvector
+            getLogger().info(f"Deflation space loaded from {path}")
+        else:
+            self.deflation.eigensolve(self.invert_param)
+            if path is not None:
+                from ..utils.io import writeDiracEigenvector
+
+                writeDiracEigenvector(path, self.deflation.eigenvalue, self.deflation.eigenvector, gauge_checksum)
+        return self.deflation.eigenvalue
+
+    def freeDeflation(self):
+        self.deflation = None
+
 
 class StaggeredDirac(Dirac):
-    def invert(self, b: LatticeStaggeredFermion):
-        x = LatticeStaggeredFermion(b.latt_info)
-        invertQuda(x.data_ptr, b.data_ptr, self.invert_param)
-        self.performance()
+    def invert(self, b: LatticeStaggeredFermion, out: LatticeStaggeredFermion = None):
+        x = LatticeStaggeredFermion(b.latt_info, dtype=b.dtype) if out is None else out
+        self._invert(b, x)
         return x
 
-    def mat(self, x: LatticeStaggeredFermion):
-        b = LatticeStaggeredFermion(x.latt_info)
+    def mat(self, x: LatticeStaggeredFermion, out: LatticeStaggeredFermion = None):
+        b = LatticeStaggeredFermion(x.latt_info, dtype=x.dtype) if out is None else out
+        self.invert_param.cpu_prec = getCPUPrecision(x.dtype)
         MatQuda(b.data_ptr, x.data_ptr, self.invert_param)
         return b
 
-    def matDagMat(self, x: LatticeStaggeredFermion):
-        b = LatticeStaggeredFermion(x.latt_info)
+    def matDagMat(self, x: LatticeStaggeredFermion, out: LatticeStaggeredFermion = None):
+        b = LatticeStaggeredFermion(x.latt_info, dtype=x.dtype) if out is None else out
+        self.invert_param.cpu_prec = getCPUPrecision(x.dtype)
         MatDagMatQuda(b.data_ptr, x.data_ptr, self.invert_param)
         return b
@@ -44,10 +44,10 @@ class CloverWilson(Dirac):
         nu_pre: int,
         nu_post: int,
     ):
-        if isinstance(multigrid, Multigrid):
+        if isinstance(multigrid, Multigrid) and multigrid.param is not None:
             self.multigrid = multigrid
         elif multigrid is not None:
-            geo_block_size = multigrid
+            geo_block_size = multigrid.geo_block_size if isinstance(multigrid, Multigrid) else multigrid
             mg_param, mg_inv_param = general.newQudaMultigridParam(
                 mass,
                 kappa,
@@ -61,7 +61,11 @@ class CloverWilson(Dirac):
                 self.precision,
             )
             mg_inv_param.dslash_type = QudaDslashType.QUDA_CLOVER_WILSON_DSLASH
-            self.multigrid = Multigrid(mg_param, mg_inv_param)
+            if isinstance(multigrid, Multigrid):
+                multigrid.param, multigrid.inv_param = mg_param, mg_inv_param
+                self.multigrid = multigrid
+            else:
+                self.multigrid = Multigrid(mg_param, mg_inv_param)
         else:
             self.multigrid = Multigrid(None, None)
 
@@ -86,10 +90,11 @@ class CloverWilson(Dirac):
         self.updateMultigrid(True)
 
     def loadGauge(self, gauge: LatticeGauge, thin_update_only: bool = False):
+        self._gaugeChanged(gauge)
         general.loadClover(self.clover, self.clover_inv, gauge, self.gauge_param, self.invert_param)
         general.loadGauge(gauge, self.gauge_param)
         if self.multigrid.instance is None:
-            self.newMultigrid()
+            self.newMultigrid(gauge)
         else:
             self.updateMultigrid(thin_update_only)
 
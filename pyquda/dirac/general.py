@@ -8,6 +8,7 @@ from ..pyquda import (
     QudaGaugeParam,
     QudaInvertParam,
     QudaMultigridParam,
+    QudaEigParam,
     loadCloverQuda,
     loadGaugeQuda,
     invertQuda,
@@ -93,7 +94,7 @@ from ..enum_quda import (  # noqa: F401
 nullptr = Pointer("void")
 nullptrs = Pointers("void", 0)
 
-from . import Precision, Reconstruct
+from . import Precision, Reconstruct, getCPUPrecision
 
 
 def _fieldLocation():
@@ -370,6 +371,39 @@ def newQudaInvertParam(
     return invert_param
 
 
+def newQudaEigParam(
+    invert_param: QudaInvertParam,
+    n_ev: int,
+    n_kr: int,
+    tol: float,
+    max_restarts: int,
+    precision: Precision,
+):
+    eig_param = QudaEigParam()
+
+    # lowest modes of the normal operator M^\dagger M on the full lattice
+    eig_param.invert_param = invert_param
+    eig_param.eig_type = QudaEigType.QUDA_EIG_TR_LANCZOS
+    eig_param.spectrum = QudaEigSpectrumType.QUDA_SPECTRUM_SR_EIG
+    eig_param.use_dagger = QudaBoolean.QUDA_BOOLEAN_FALSE
+    eig_param.use_norm_op = QudaBoolean.QUDA_BOOLEAN_TRUE
+    eig_param.use_pc = QudaBoolean.QUDA_BOOLEAN_FALSE
+    eig_param.use_poly_acc = QudaBoolean.QUDA_BOOLEAN_FALSE
+    eig_param.compute_gamma5 = QudaBoolean.QUDA_BOOLEAN_FALSE
+    eig_param.n_ev = n_ev
+    eig_param.n_kr = n_kr
+    eig_param.n_conv = n_ev
+    eig_param.tol = tol
+    eig_param.max_restarts = max_restarts
+    eig_param.require_convergence = QudaBoolean.QUDA_BOOLEAN_TRUE
+    eig_param.cuda_prec_ritz = precision.cuda
+    eig_param.location = _fieldLocation()
+    eig_param.vec_infile = b""
+    eig_param.vec_outfile = b""
+
+    return eig_param
+
+
 def loadClover(
     clover: LatticeClover,
     clover_inv: LatticeClover,
@@ -382,6 +416,7 @@ def loadClover(
         t_boundary = gauge_param.t_boundary
         anisotropy = gauge_param.anisotropy
         reconstruct = gauge_param.reconstruct
+        cpu_prec = gauge_param.cpu_prec
 
         gauge_in = gauge.copy()
         if clover_anisotropy != 1.0:
@@ -389,12 +424,14 @@ def loadClover(
             gauge_param.reconstruct = QudaReconstructType.QUDA_RECONSTRUCT_NO
         gauge_param.t_boundary = QudaTboundary.QUDA_PERIODIC_T
         gauge_param.anisotropy = 1.0
+        gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         gauge_param.use_resident_gauge = 0
         loadGaugeQuda(gauge_in.data_ptrs, gauge_param)
         if clover_anisotropy != 1.0:
             gauge_param.reconstruct = reconstruct
         gauge_param.t_boundary = t_boundary
         gauge_param.anisotropy = anisotropy
+        gauge_param.cpu_prec = cpu_prec
         gauge_param.use_resident_gauge = 1
         loadCloverQuda(nullptr, nullptr, invert_param)
     else:
@@ -416,6 +453,7 @@ def saveClover(
     t_boundary = gauge_param.t_boundary
     anisotropy = gauge_param.anisotropy
     reconstruct = gauge_param.reconstruct
+    cpu_prec = gauge_param.cpu_prec
 
     gauge_in = gauge.copy()
     if clover_anisotropy != 1.0:
@@ -423,12 +461,14 @@ def saveClover(
         gauge_param.reconstruct = QudaReconstructType.QUDA_RECONSTRUCT_NO
     gauge_param.t_boundary = QudaTboundary.QUDA_PERIODIC_T
     gauge_param.anisotropy = 1.0
+    gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
     gauge_param.use_resident_gauge = 0
     loadGaugeQuda(gauge_in.data_ptrs, gauge_param)
     if clover_anisotropy != 1.0:
         gauge_param.reconstruct = reconstruct
     gauge_param.t_boundary = t_boundary
     gauge_param.anisotropy = anisotropy
+    gauge_param.cpu_prec = cpu_prec
     gauge_param.use_resident_gauge = 1
     invert_param.return_clover = 1
     invert_param.return_clover_inverse = 1
@@ -443,8 +483,11 @@ def loadGauge(gauge: LatticeGauge, gauge_param: QudaGaugeParam):
         gauge_in.setAntiPeriodicT()
     if gauge_param.anisotropy != 1.0:
         gauge_in.setAnisotropy(gauge_param.anisotropy)
+    cpu_prec = gauge_param.cpu_prec
+    gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
     gauge_param.use_resident_gauge = 0
     loadGaugeQuda(gauge_in.data_ptrs, gauge_param)
+    gauge_param.cpu_prec = cpu_prec
     gauge_param.use_resident_gauge = 1
 
 
@@ -455,13 +498,15 @@ def loadFatLongGauge(
     gauge_param: QudaGaugeParam,
 ):
     staggered_phase_type = gauge_param.staggered_phase_type
+    cpu_prec = gauge_param.cpu_prec
 
     inlink = gauge.copy()
-    ulink = LatticeGauge(gauge.latt_info)
-    fatlink = LatticeGauge(gauge.latt_info)
-    longlink = LatticeGauge(gauge.latt_info)
+    ulink = LatticeGauge(gauge.latt_info, dtype=gauge.dtype)
+    fatlink = LatticeGauge(gauge.latt_info, dtype=gauge.dtype)
+    longlink = LatticeGauge(gauge.latt_info, dtype=gauge.dtype)
 
     inlink.staggeredPhase()
+    gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
     computeKSLinkQuda(nullptrs, nullptrs, ulink.data_ptrs, inlink.data_ptrs, fat7_coeff, gauge_param)
     computeKSLinkQuda(fatlink.data_ptrs, longlink.data_ptrs, nullptrs, ulink.data_ptrs, level2_coeff, gauge_param)
 
@@ -475,6 +520,7 @@ def loadFatLongGauge(
     gauge_param.type = QudaLinkType.QUDA_WILSON_LINKS
     gauge_param.ga_pad = gauge_param.ga_pad // 3
     gauge_param.staggered_phase_type = staggered_phase_type
+    gauge_param.cpu_prec = cpu_prec
     gauge_param.use_resident_gauge = 1
 
 
@@ -486,39 +532,45 @@ def performance(invert_param: QudaInvertParam):
 
 
 def invert(b: LatticeFermion, invert_param: QudaInvertParam):
-    x = LatticeFermion(b.latt_info)
+    x = LatticeFermion(b.latt_info, dtype=b.dtype)
+    invert_param.cpu_prec = getCPUPrecision(b.dtype)
     invertQuda(x.data_ptr, b.data_ptr, invert_param)
     performance(invert_param)
     return x
 
 
 def invertStaggered(b: LatticeStaggeredFermion, invert_param: QudaInvertParam):
-    x = LatticeStaggeredFermion(b.latt_info)
+    x = LatticeStaggeredFermion(b.latt_info, dtype=b.dtype)
+    invert_param.cpu_prec = getCPUPrecision(b.dtype)
     invertQuda(x.data_ptr, b.data_ptr, invert_param)
     performance(invert_param)
     return x
 
 
 def mat(x: LatticeFermion, invert_param: QudaInvertParam):
-    b = LatticeFermion(x.latt_info)
+    b = LatticeFermion(x.latt_info, dtype=x.dtype)
+    invert_param.cpu_prec = getCPUPrecision(x.dtype)
     MatQuda(b.data_ptr, x.data_ptr, invert_param)
     return b
 
 
 def matStaggered(x: LatticeStaggeredFermion, invert_param: QudaInvertParam):
-    b = LatticeStaggeredFermion(x.latt_info)
+    b = LatticeStaggeredFermion(x.latt_info, dtype=x.dtype)
+    invert_param.cpu_prec = getCPUPrecision(x.dtype)
     MatQuda(b.data_ptr, x.data_ptr, invert_param)
     return b
 
 
 def matDagMat(x: LatticeFermion, invert_param: QudaInvertParam):
-    b = LatticeFermion(x.latt_info)
+    b = LatticeFermion(x.latt_info, dtype=x.dtype)
+    invert_param.cpu_prec = getCPUPrecision(x.dtype)
     MatDagMatQuda(b.data_ptr, x.data_ptr, invert_param)
     return b
 
 
 def matDagMatStaggered(x: LatticeStaggeredFermion, invert_param: QudaInvertParam):
-    b = LatticeStaggeredFermion(x.latt_info)
+    b = LatticeStaggeredFermion(x.latt_info, dtype=x.dtype)
+    invert_param.cpu_prec = getCPUPrecision(x.dtype)
     MatDagMatQuda(b.data_ptr, x.data_ptr, invert_param)
     return b
 
@@ -528,7 +580,8 @@ def invertPC(b: LatticeFermion, invert_param: QudaInvertParam):
     invert_param.solution_type = QudaSolutionType.QUDA_MATPC_SOLUTION
 
     latt_info = b.latt_info
-    x = LatticeFermion(latt_info)
+    x = LatticeFermion(latt_info, dtype=b.dtype)
+    invert_param.cpu_prec = getCPUPrecision(b.dtype)
 
     dslashQuda(x.odd_ptr, b.even_ptr, invert_param, QudaParity.QUDA_ODD_PARITY)
     x.even = b.odd + kappa * x.odd
@@ -542,7 +595,8 @@ def invertPC(b: LatticeFermion, invert_param: QudaInvertParam):
 
 
 def invertCloverPC(b: LatticeFermion, invert_param: QudaInvertParam):
-    tmp = LatticeFermion(b.latt_info)
+    tmp = LatticeFermion(b.latt_info, dtype=b.dtype)
+    invert_param.cpu_prec = getCPUPrecision(b.dtype)
     cloverQuda(tmp.even_ptr, b.even_ptr, invert_param, QudaParity.QUDA_EVEN_PARITY, 1)
     cloverQuda(tmp.odd_ptr, b.odd_ptr, invert_param, QudaParity.QUDA_ODD_PARITY, 1)
     return invertPC(tmp, invert_param)
@@ -553,7 +607,8 @@ def invertStaggeredPC(b: LatticeStaggeredFermion, invert_param: QudaInvertParam)
     invert_param.solution_type = QudaSolutionType.QUDA_MATPC_SOLUTION
 
     latt_info = b.latt_info
-    x = LatticeStaggeredFermion(latt_info)
+    x = LatticeStaggeredFermion(latt_info, dtype=b.dtype)
+    invert_param.cpu_prec = getCPUPrecision(b.dtype)
 
     dslashQuda(x.odd_ptr, b.even_ptr, invert_param, QudaParity.QUDA_ODD_PARITY)
     x.even = (2 * mass) * b.odd + x.odd
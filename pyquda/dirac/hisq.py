@@ -94,10 +94,10 @@ class HISQ(StaggeredDirac):
         nu_pre: int,
         nu_post: int,
     ):
-        if isinstance(multigrid, Multigrid):
+        if isinstance(multigrid, Multigrid) and multigrid.param is not None:
             self.multigrid = multigrid
         elif multigrid is not None:
-            geo_block_size = multigrid
+            geo_block_size = multigrid.geo_block_size if isinstance(multigrid, Multigrid) else multigrid
             mg_param, mg_inv_param = general.newQudaMultigridParam(
                 mass,
                 kappa,
@@ -111,7 +111,11 @@ class HISQ(StaggeredDirac):
                 self.precision,
             )
             mg_inv_param.dslash_type = QudaDslashType.QUDA_ASQTAD_DSLASH
-            self.multigrid = Multigrid(mg_param, mg_inv_param)
+            if isinstance(multigrid, Multigrid):
+                multigrid.param, multigrid.inv_param = mg_param, mg_inv_param
+                self.multigrid = multigrid
+            else:
+                self.multigrid = Multigrid(mg_param, mg_inv_param)
         else:
             self.multigrid = Multigrid(None, None)
 
@@ -125,9 +129,10 @@ class HISQ(StaggeredDirac):
         self.invert_param = invert_param
 
     def loadGauge(self, gauge: LatticeGauge, thin_update_only: bool = False):
+        self._gaugeChanged(gauge)
         general.loadFatLongGauge(gauge, self.fat7_coeff, self.level2_coeff, self.gauge_param)
         if self.multigrid.instance is None:
-            self.newMultigrid()
+            self.newMultigrid(gauge)
         else:
             self.updateMultigrid(thin_update_only)
 
@@ -33,7 +33,7 @@ from ..enum_quda import (
     QudaSolveType,
 )
 
-from . import Gauge, general
+from . import Gauge, general, getCPUPrecision
 
 
 class PureGauge(Gauge):
@@ -70,20 +70,29 @@ class PureGauge(Gauge):
         self.obs_param = obs_param
 
     def loadGauge(self, gauge: LatticeGauge):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         self.gauge_param.use_resident_gauge = 0
         loadGaugeQuda(gauge.data_ptrs, self.gauge_param)
         self.gauge_param.use_resident_gauge = 1
+        self.gauge_param.cpu_prec = cpu_prec
 
     def saveGauge(self, gauge: LatticeGauge):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         saveGaugeQuda(gauge.data_ptrs, self.gauge_param)
+        self.gauge_param.cpu_prec = cpu_prec
 
     def freeGauge(self):
         freeUniqueGaugeQuda(QudaLinkType.QUDA_WILSON_LINKS)
 
     def saveSmearedGauge(self, gauge: LatticeGauge):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         self.gauge_param.type = QudaLinkType.QUDA_SMEARED_LINKS
         saveGaugeQuda(gauge.data_ptrs, self.gauge_param)
         self.gauge_param.type = QudaLinkType.QUDA_WILSON_LINKS
+        self.gauge_param.cpu_prec = cpu_prec
 
     def freeSmearedGauge(self):
         freeUniqueGaugeQuda(QudaLinkType.QUDA_SMEARED_LINKS)
@@ -121,7 +130,10 @@ class PureGauge(Gauge):
         self.gauge_param.use_resident_gauge = 0
         self.gauge_param.make_resident_gauge = 0
         self.gauge_param.return_result_gauge = 1
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         staggeredPhaseQuda(gauge.data_ptrs, self.gauge_param)
+        self.gauge_param.cpu_prec = cpu_prec
         self.gauge_param.staggered_phase_applied = 1 - self.gauge_param.staggered_phase_applied
         self.gauge_param.use_resident_gauge = 1
         self.gauge_param.make_resident_gauge = 1
@@ -131,7 +143,10 @@ class PureGauge(Gauge):
         self.gauge_param.use_resident_gauge = 0
         self.gauge_param.make_resident_gauge = 0
         self.gauge_param.return_result_gauge = 1
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         projectSU3Quda(gauge.data_ptrs, tol, self.gauge_param)
+        self.gauge_param.cpu_prec = cpu_prec
         self.gauge_param.use_resident_gauge = 1
         self.gauge_param.make_resident_gauge = 1
         self.gauge_param.return_result_gauge = 0
@@ -169,6 +184,8 @@ class PureGauge(Gauge):
         self.gauge_param.overwrite_gauge = 1
         self.gauge_param.use_resident_gauge = 0
         self.gauge_param.make_resident_gauge = 0
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         computeGaugePathQuda(
             gauge.data_ptrs,
             gauge.data_ptrs,
@@ -180,6 +197,7 @@ class PureGauge(Gauge):
             1.0,
             self.gauge_param,
         )
+        self.gauge_param.cpu_prec = cpu_prec
         self.gauge_param.overwrite_gauge = 0
         self.gauge_param.use_resident_gauge = 1
         self.gauge_param.make_resident_gauge = 1
@@ -226,6 +244,8 @@ class PureGauge(Gauge):
         self.gauge_param.overwrite_gauge = 1
         self.gauge_param.use_resident_gauge = 0
         self.gauge_param.make_resident_gauge = 0
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         computeGaugePathQuda(
             gauge.data_ptrs,
             gauge.data_ptrs,
@@ -237,6 +257,7 @@ class PureGauge(Gauge):
             1.0,
             self.gauge_param,
         )
+        self.gauge_param.cpu_prec = cpu_prec
         self.gauge_param.overwrite_gauge = 0
         self.gauge_param.use_resident_gauge = 1
         self.gauge_param.make_resident_gauge = 1
@@ -361,6 +382,8 @@ class PureGauge(Gauge):
         reunit_interval: int,
         stopWtheta: int,
     ):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         computeGaugeFixingOVRQuda(
             gauge.data_ptrs,
             gauge_dir,
@@ -372,6 +395,7 @@ class PureGauge(Gauge):
             stopWtheta,
             self.gauge_param,
         )
+        self.gauge_param.cpu_prec = cpu_prec
 
     def fixingFFT(
         self,
@@ -384,6 +408,8 @@ class PureGauge(Gauge):
         tolerance: float,
         stopWtheta: int,
     ):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         computeGaugeFixingFFTQuda(
             gauge.data_ptrs,
             gauge_dir,
@@ -395,3 +421,4 @@ class PureGauge(Gauge):
             stopWtheta,
             self.gauge_param,
         )
+        self.gauge_param.cpu_prec = cpu_prec
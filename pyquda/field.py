@@ -1,4 +1,5 @@
-from typing import List, Literal, Union
+from functools import lru_cache
+from typing import List, Literal, Tuple, Union
 
 import numpy
 
@@ -80,130 +81,227 @@ class LaplaceLatticeInfo(LatticeInfo):
 Ns, Nc, Nd = LatticeInfo.Ns, LatticeInfo.Nc, LatticeInfo.Nd
 
 
+def _arrayLocation(data) -> Literal["numpy", "cupy", "torch"]:
+    if isinstance(data, numpy.ndarray):
+        return "numpy"
+    module = type(data).__module__.split(".")[0]
+    if module in ("cupy", "torch"):
+        return module
+    raise TypeError(f"Unsupported array type {type(data)}")
+
+
+def _arrayDevice(data, location: Literal["numpy", "cupy", "torch"]):
+    if location == "numpy":
+        return None
+    elif location == "cupy":
+        return data.device.id
+    elif location == "torch":
+        return data.device
+
+
+@lru_cache(maxsize=None)
+def _evenOddIndex(latt_size: Tuple[int, int, int, int], location: Literal["numpy", "cupy", "torch"], device):
+    """
+    Index maps between the lexicographic site order (t, z, y, x) and the even-odd
+    site order (eo, t, z, y, x // 2) of a sublattice, cached by the sublattice shape.
+
+    Returns (index_cb2, index_lexico) such that data_cb2 = data_lexico[index_cb2]
+    and data_lexico = data_cb2[index_lexico] along the flattened site axis.
+    """
+    Lt, Lz, Ly, Lx = latt_size
+    eo, t, z, y, x = numpy.indices((2, Lt, Lz, Ly, Lx // 2))
+    index_cb2 = (((t * Lz + z) * Ly + y) * Lx + 2 * x + (eo + t + z + y) % 2).reshape(-1)
+    index_lexico = numpy.empty_like(index_cb2)
+    index_lexico[index_cb2] = numpy.arange(index_cb2.size)
+    if location == "numpy":
+        return index_cb2, index_lexico
+    elif location == "cupy":
+        import cupy
+
+        with cupy.cuda.Device(device):
+            return cupy.asarray(index_cb2), cupy.asarray(index_lexico)
+    elif location == "torch":
+        import torch
+
+        return torch.as_tensor(index_cb2, device=device), torch.as_tensor(index_lexico, device=device)
+
+
+def _takeSites(data, index, location: Literal["numpy", "cupy", "torch"], dtype):
+    if location == "numpy":
+        ret = numpy.take(data, index, 1)
+    elif location == "cupy":
+        import cupy
+
+        ret = cupy.take(data, index, 1)
+    elif location == "torch":
+        import torch
+
+        ret = torch.index_select(data, 1, index)
+    if dtype is not None:
+        if location == "torch":
+            ret = ret.to(_torchDtype(dtype) if isinstance(dtype, str) else dtype)
+        else:
+            ret = ret.astype(dtype)
+    return ret
+
+
 def lexico(data: numpy.ndarray, axes: List[int], dtype=None):
+    location = _arrayLocation(data)
     shape = data.shape
     Np, Lt, Lz, Ly, Lx = [shape[axis] for axis in axes]
     assert Np == 2
     Lx *= 2
     Npre = int(numpy.prod(shape[: axes[0]]))
     Nsuf = int(numpy.prod(shape[axes[-1] + 1 :]))
-    dtype = data.dtype if dtype is None else dtype
-    data_cb2 = data.reshape(Npre, 2, Lt, Lz, Ly, Lx // 2, Nsuf)
-    data_lexico = numpy.zeros((Npre, Lt, Lz, Ly, Lx, Nsuf), dtype)
-    for t in range(Lt):
-        for z in range(Lz):
-            for y in range(Ly):
-                eo = (t + z + y) % 2
-                if eo == 0:
-                    data_lexico[:, t, z, y, 0::2] = data_cb2[:, 0, t, z, y, :]
-                    data_lexico[:, t, z, y, 1::2] = data_cb2[:, 1, t, z, y, :]
-                else:
-                    data_lexico[:, t, z, y, 1::2] = data_cb2[:, 0, t, z, y, :]
-                    data_lexico[:, t, z, y, 0::2] = data_cb2[:, 1, t, z, y, :]
+    _, index_lexico = _evenOddIndex((Lt, Lz, Ly, Lx), location, _arrayDevice(data, location))
+    data_cb2 = data.reshape(Npre, Lt * Lz * Ly * Lx, Nsuf)
+    data_lexico = _takeSites(data_cb2, index_lexico, location, dtype)
     return data_lexico.reshape(*shape[: axes[0]], Lt, Lz, Ly, Lx, *shape[axes[-1] + 1 :])
 
 
 def cb2(data: numpy.ndarray, axes: List[int], dtype=None):
+    location = _arrayLocation(data)
     shape = data.shape
     Lt, Lz, Ly, Lx = [shape[axis] for axis in axes]
     Npre = int(numpy.prod(shape[: axes[0]]))
     Nsuf = int(numpy.prod(shape[axes[-1] + 1 :]))
-    dtype = data.dtype if dtype is None else dtype
-    data_lexico = data.reshape(Npre, Lt, Lz, Ly, Lx, Nsuf)
-    data_cb2 = numpy.zeros((Npre, 2, Lt, Lz, Ly, Lx // 2, Nsuf), dtype)
-    for t in range(Lt):
-        for z in range(Lz):
-            for y in range(Ly):
-                eo = (t + z + y) % 2
-                if eo == 0:
-                    data_cb2[:, 0, t, z, y, :] = data_lexico[:, t, z, y, 0::2]
-                    data_cb2[:, 1, t, z, y, :] = data_lexico[:, t, z, y, 1::2]
-                else:
-                    data_cb2[:, 0, t, z, y, :] = data_lexico[:, t, z, y, 1::2]
-                    data_cb2[:, 1, t, z, y, :] = data_lexico[:, t, z, y, 0::2]
+    index_cb2, _ = _evenOddIndex((Lt, Lz, Ly, Lx), location, _arrayDevice(data, location))
+    data_lexico = data.reshape(Npre, Lt * Lz * Ly * Lx, Nsuf)
+    data_cb2 = _takeSites(data_lexico, index_cb2, location, dtype)
     return data_cb2.reshape(*shape[: axes[0]], 2, Lt, Lz, Ly, Lx // 2, *shape[axes[-1] + 1 :])
 
 
-def newLatticeFieldData(latt_info: LatticeInfo, field: str):
+def _asLocation(data, location: Literal["numpy", "cupy", "torch"]):
+    current = _arrayLocation(data)
+    if current == location:
+        return data
+    elif location == "numpy":
+        if current == "cupy":
+            return data.get()
+        elif current == "torch":
+            return data.cpu().numpy()
+    elif location == "cupy":
+        import cupy
+
+        return cupy.asarray(data)
+    elif location == "torch":
+        import torch
+
+        return torch.as_tensor(data)
+    raise ValueError(f"Unsupported location {location}")
+
+
+def _torchDtype(dtype: str):
+    import torch
+
+    return {
+        "<c16": torch.complex128,
+        "<c8": torch.complex64,
+        "<f8": torch.float64,
+        "<f4": torch.float32,
+    }[dtype]
+
+
+def _fromDLPack(x):
+    """Import a DLPack capsule producer: host buffers as numpy arrays, device buffers with the CUDA backend."""
+    from . import getCUDABackend, getLogger
+
+    device_type, _ = x.__dlpack_device__()
+    if device_type in (1, 3):  # kDLCPU, kDLCUDAHost
+        return numpy.from_dlpack(x)
+    backend = getCUDABackend()
+    if backend == "cupy":
+        import cupy
+
+        return cupy.from_dlpack(x)
+    elif backend == "torch":
+        import torch
+
+        return torch.from_dlpack(x)
+    else:
+        getLogger().critical(f"Cannot import a DLPack device buffer with the {backend} backend", ValueError)
+
+
+def newLatticeFieldData(latt_info: LatticeInfo, field: str, dtype: str = "<c16"):
     from . import getCUDABackend
 
     backend = getCUDABackend()
     Lx, Ly, Lz, Lt = latt_info.size
     if backend == "numpy":
         if field == "Gauge":
-            ret = numpy.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), "<c16")
+            ret = numpy.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype)
             ret[:] = numpy.identity(Nc)
             return ret
         elif field == "Fermion":
-            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), "<c16")
+            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype)
         elif field == "Propagator":
-            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), "<c16")
+            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), dtype)
         elif field == "StaggeredFermion":
-            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), "<c16")
+            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), dtype)
         elif field == "StaggeredPropagator":
-            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), "<c16")
+            return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype)
         elif field == "Clover":
             return numpy.zeros((2, Lt, Lz, Ly, Lx // 2, 2, ((Ns // 2) * Nc) ** 2), "<f8")
     elif backend == "cupy":
         import cupy
 
         if field == "Gauge":
-            ret = cupy.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), "<c16")
+            ret = cupy.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype)
             ret[:] = cupy.identity(Nc)
             return ret
         elif field == "Fermion":
-            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), "<c16")
+            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype)
         elif field == "Propagator":
-            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), "<c16")
+            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), dtype)
         elif field == "StaggeredFermion":
-            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), "<c16")
+            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), dtype)
         elif field == "StaggeredPropagator":
-            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), "<c16")
+            return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype)
         elif field == "Clover":
             return cupy.zeros((2, Lt, Lz, Ly, Lx // 2, 2, ((Ns // 2) * Nc) ** 2), "<f8")
     elif backend == "torch":
         import torch
 
         if field == "Gauge":
-            ret = torch.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype=torch.complex128)
+            ret = torch.zeros((Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype=_torchDtype(dtype))
             ret[:] = torch.eye(Nc)
             return ret
         elif field == "Fermion":
-            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype=torch.complex128)
+            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype=_torchDtype(dtype))
         elif field == "Propagator":
-            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), dtype=torch.complex128)
+            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc), dtype=_torchDtype(dtype))
         elif field == "StaggeredFermion":
-            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), dtype=torch.complex128)
+            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Nc), dtype=_torchDtype(dtype))
         elif field == "StaggeredPropagator":
-            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype=torch.complex128)
+            return torch.zeros((2, Lt, Lz, Ly, Lx // 2, Nc, Nc), dtype=_torchDtype(dtype))
         elif field == "Clover":
             return torch.zeros((2, Lt, Lz, Ly, Lx // 2, 2, ((Ns // 2) * Nc) ** 2), dtype=torch.float64)
 
 
-def newMultiLatticeFieldData(latt_info: LatticeInfo, L5: int, field: str):
+def newMultiLatticeFieldData(latt_info: LatticeInfo, L5: int, field: str, dtype: str = "<c16"):
     from . import getCUDABackend
 
     backend = getCUDABackend()
     Lx, Ly, Lz, Lt = latt_info.size
     if backend == "numpy":
         if field == "Fermion":
-            return numpy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), "<c16")
+            return numpy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype)
         elif field == "StaggeredFermion":
-            return numpy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), "<c16")
+            return numpy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), dtype)
     elif backend == "cupy":
         import cupy
 
         if field == "Fermion":
-            return cupy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), "<c16")
+            return cupy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype)
         elif field == "StaggeredFermion":
-            return cupy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), "<c16")
+            return cupy.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), dtype)
     elif backend == "torch":
         import torch
 
         if field == "Fermion":
-            return torch.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype=torch.complex128)
+            return torch.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), dtype=_torchDtype(dtype))
         elif field == "StaggeredFermion":
-            return torch.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), dtype=torch.complex128)
+            return torch.zeros((L5, 2, Lt, Lz, Ly, Lx // 2, Nc), dtype=_torchDtype(dtype))
 
 
 class LatticeField:
@@ -236,6 +334,15 @@ class LatticeField:
         else:
             return self.backend
 
+    @property
+    def dtype(self) -> str:
+        if self.location == "torch":
+            import torch
+
+            return f"<{'c' if self.data.is_complex() else 'f'}{self.data.element_size()}"
+        else:
+            return self.data.dtype.str
+
     def setData(self, data):
         self.data = data
 
@@ -251,6 +358,16 @@ class LatticeField:
     def copy(self):
         return self.__class__(self.latt_info, self.backup())
 
+    def _astype(self, dtype: str):
+        if self.location == "torch":
+            return self.data.to(_torchDtype(dtype))
+        else:
+            return self.data.astype(dtype)
+
+    def astype(self, dtype: str):
+        """Return a copy of the field stored with `dtype`, e.g. "<c8" for single precision."""
+        return self.__class__(self.latt_info, self._astype(dtype))
+
     def toDevice(self):
         backend = self.backend
         if backend == "numpy":
@@ -282,6 +399,32 @@ class LatticeField:
         elif location == "torch":
             return self.data.cpu().numpy()
 
+    def __array__(self, dtype=None, copy=None):
+        if self.location == "numpy":
+            data = self.data
+        elif copy is False:
+            raise ValueError(f"Cannot convert a {self.location} field to numpy.ndarray without a copy")
+        else:
+            data = self.getHost()
+        if copy:
+            data = data.copy()
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __dlpack__(self, **kwargs):
+        return self.data.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self.data.__dlpack_device__()
+
+    @classmethod
+    def from_dlpack(cls, latt_info: LatticeInfo, x):
+        """Wrap an array exported through DLPack as a field without copying, e.g. a torch.Tensor or a jax.Array."""
+        return cls(latt_info, _fromDLPack(x))
+
+    def _lexico(self, axes: List[int], location: Literal["numpy", "cupy", "torch"]):
+        """Reorder to the lexicographic order on the device holding the data, then move the result to `location`."""
+        return _asLocation(lexico(self.data, axes), location)
+
     def __add__(self, other):
         assert self.__class__ == other.__class__ and self.location == other.location
         return self.__class__(self.latt_info, self.data + other.data)
@@ -326,6 +469,13 @@ class MultiLatticeField(LatticeField):
     def copy(self):
         return self.__class__(self.latt_info, self.L5, self.backup())
 
+    def astype(self, dtype: str):
+        return self.__class__(self.latt_info, self.L5, self._astype(dtype))
+
+    @classmethod
+    def from_dlpack(cls, latt_info: LatticeInfo, L5: int, x):
+        return cls(latt_info, L5, _fromDLPack(x))
+
     def __add__(self, other):
         assert self.__class__ == other.__class__ and self.location == other.location
         return self.__class__(self.latt_info, self.L5, self.data + other.data)
@@ -345,11 +495,11 @@ class MultiLatticeField(LatticeField):
 
 
 class LatticeGauge(LatticeField):
-    def __init__(self, latt_info: LatticeInfo, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newLatticeFieldData(latt_info, "Gauge"))
+            self.setData(newLatticeFieldData(latt_info, "Gauge", dtype))
         else:
             self.setData(value.reshape(Nd, 2, Lt, Lz, Ly, Lx // 2, Nc, Nc))
         self.pure_gauge = None
@@ -369,8 +519,8 @@ class LatticeGauge(LatticeField):
     def data_ptrs(self) -> Pointers:
         return ndarrayPointer(self.data.reshape(4, -1), True)
 
-    def lexico(self):
-        return lexico(self.getHost(), [1, 2, 3, 4, 5])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([1, 2, 3, 4, 5], location)
 
     def ensurePureGauge(self):
         if self.pure_gauge is None:
@@ -694,11 +844,11 @@ class LatticeClover(LatticeField):
 
 
 class LatticeFermion(LatticeField):
-    def __init__(self, latt_info: LatticeInfo, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newLatticeFieldData(latt_info, "Fermion"))
+            self.setData(newLatticeFieldData(latt_info, "Fermion", dtype))
         else:
             self.setData(value.reshape(2, Lt, Lz, Ly, Lx // 2, Ns, Nc))
 
@@ -730,16 +880,16 @@ class LatticeFermion(LatticeField):
     def odd_ptr(self) -> Pointer:
         return ndarrayPointer(self.data.reshape(2, -1)[1], True)
 
-    def lexico(self):
-        return lexico(self.getHost(), [0, 1, 2, 3, 4])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([0, 1, 2, 3, 4], location)
 
 
 class MultiLatticeFermion(MultiLatticeField):
-    def __init__(self, latt_info: LatticeInfo, L5: int, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, L5: int, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info, L5)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newMultiLatticeFieldData(latt_info, L5, "Fermion"))
+            self.setData(newMultiLatticeFieldData(latt_info, L5, "Fermion", dtype))
         else:
             self.setData(value.reshape(L5, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc))
 
@@ -761,21 +911,21 @@ class MultiLatticeFermion(MultiLatticeField):
     def __setitem__(self, index: int, value: LatticeFermion):
         self.data[index] = value.data
 
-    def lexico(self):
-        return lexico(self.getHost(), [1, 2, 3, 4, 5])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([1, 2, 3, 4, 5], location)
 
 
 class LatticePropagator(LatticeField):
-    def __init__(self, latt_info: LatticeInfo, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newLatticeFieldData(latt_info, "Propagator"))
+            self.setData(newLatticeFieldData(latt_info, "Propagator", dtype))
         else:
             self.setData(value.reshape(2, Lt, Lz, Ly, Lx // 2, Ns, Ns, Nc, Nc))
 
-    def lexico(self):
-        return lexico(self.getHost(), [0, 1, 2, 3, 4])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([0, 1, 2, 3, 4], location)
 
     def transpose(self):
         return self.data.transpose(0, 1, 2, 3, 4, 6, 5, 8, 7).copy()
@@ -788,11 +938,11 @@ class LatticePropagator(LatticeField):
 
 
 class LatticeStaggeredFermion(LatticeField):
-    def __init__(self, latt_info: LatticeInfo, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newLatticeFieldData(latt_info, "StaggeredFermion"))
+            self.setData(newLatticeFieldData(latt_info, "StaggeredFermion", dtype))
         else:
             self.setData(value.reshape(2, Lt, Lz, Ly, Lx // 2, Nc))
 
@@ -824,16 +974,16 @@ class LatticeStaggeredFermion(LatticeField):
     def odd_ptr(self) -> Pointer:
         return ndarrayPointer(self.data.reshape(2, -1)[1], True)
 
-    def lexico(self):
-        return lexico(self.getHost(), [0, 1, 2, 3, 4])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([0, 1, 2, 3, 4], location)
 
 
 class MultiLatticeStaggeredFermion(MultiLatticeField):
-    def __init__(self, latt_info: LatticeInfo, L5: int, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, L5: int, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info, L5)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newMultiLatticeFieldData(latt_info, L5, "StaggeredFermion"))
+            self.setData(newMultiLatticeFieldData(latt_info, L5, "StaggeredFermion", dtype))
         else:
             self.setData(value.reshape(L5, 2, Lt, Lz, Ly, Lx // 2, Nc))
 
@@ -855,21 +1005,21 @@ class MultiLatticeStaggeredFermion(MultiLatticeField):
     def __setitem__(self, index: int, value: LatticeStaggeredFermion):
         self.data[index] = value.data
 
-    def lexico(self):
-        return lexico(self.getHost(), [1, 2, 3, 4, 5])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([1, 2, 3, 4, 5], location)
 
 
 class LatticeStaggeredPropagator(LatticeField):
-    def __init__(self, latt_info: LatticeInfo, value=None) -> None:
+    def __init__(self, latt_info: LatticeInfo, value=None, dtype: str = "<c16") -> None:
         super().__init__(latt_info)
         Lx, Ly, Lz, Lt = latt_info.size
         if value is None:
-            self.setData(newLatticeFieldData(latt_info, "StaggeredPropagator"))
+            self.setData(newLatticeFieldData(latt_info, "StaggeredPropagator", dtype))
         else:
             self.setData(value.reshape(2, Lt, Lz, Ly, Lx // 2, Nc, Nc))
 
-    def lexico(self):
-        return lexico(self.getHost(), [0, 1, 2, 3, 4])
+    def lexico(self, location: Literal["numpy", "cupy", "torch"] = "numpy"):
+        return self._lexico([0, 1, 2, 3, 4], location)
 
     def transpose(self):
         return self.data.transpose(0, 1, 2, 3, 4, 6, 5).copy()
@@ -879,3 +1029,78 @@ class LatticeStaggeredPropagator(LatticeField):
 
     def getFermion(self, color: int):
         return LatticeStaggeredFermion(self.latt_info, self.data[:, :, :, :, :, :, color])
+
+
+def _arrayBytes(data) -> int:
+    if _arrayLocation(data) == "torch":
+        return data.element_size() * data.nelement()
+    else:
+        return data.nbytes
+
+
+class LatticeFieldPool:
+    """
+    A pool of released field buffers, reused by fields with the same sublattice,
+    field kind, L5 and dtype. Buffers are evicted least recently released first
+    once the pool holds more than `max_bytes`.
+
+    Buffers returned by `get()` are NOT zeroed.
+    """
+
+    def __init__(self, max_bytes: int = 1024**3) -> None:
+        from collections import OrderedDict
+
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_held = 0
+        self._free: OrderedDict = OrderedDict()
+        self._serial = 0
+
+    @staticmethod
+    def _key(field_class, latt_info: LatticeInfo, L5: int, dtype: str, location: str):
+        return (field_class.__name__, tuple(latt_info.size), L5, dtype, location)
+
+    def get(self, field_class, latt_info: LatticeInfo, L5: int = None, dtype: str = "<c16"):
+        from . import getCUDABackend
+
+        key = self._key(field_class, latt_info, L5, dtype, getCUDABackend())
+        for serial in reversed(self._free):
+            if self._free[serial][0] == key:
+                _, data = self._free.pop(serial)
+                self.bytes_held -= _arrayBytes(data)
+                self.hits += 1
+                if L5 is None:
+                    return field_class(latt_info, data)
+                else:
+                    return field_class(latt_info, L5, data)
+        self.misses += 1
+        if L5 is None:
+            return field_class(latt_info, dtype=dtype)
+        else:
+            return field_class(latt_info, L5, dtype=dtype)
+
+    def put(self, field: LatticeField):
+        L5 = field.L5 if isinstance(field, MultiLatticeField) else None
+        key = self._key(field.__class__, field.latt_info, L5, field.dtype, field.location)
+        self._free[self._serial] = (key, field.data)
+        self._serial += 1
+        self.bytes_held += _arrayBytes(field.data)
+        field._data = None
+        while self.bytes_held > self.max_bytes:
+            _, (_, data) = self._free.popitem(last=False)
+            self.bytes_held -= _arrayBytes(data)
+
+    def clear(self):
+        self._free.clear()
+        self.bytes_held = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bytes_held": self.bytes_held}
+
+
+_FIELD_POOL = LatticeFieldPool()
+
+
+def getFieldPool() -> LatticeFieldPool:
+    return _FIELD_POOL
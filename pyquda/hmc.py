@@ -16,6 +16,7 @@ from .pyquda import (
 )
 from .enum_quda import QudaTboundary, QudaVerbosity
 from .field import Nc, Ns, LatticeInfo, LatticeGauge, LatticeFermion
+from .dirac import getCPUPrecision
 from .dirac.wilson import Wilson
 from .action import FermionAction, GaugeAction
 
@@ -150,15 +151,28 @@ class HMC:
                 monomial.sample(LatticeFermion(self.latt_info, _noise(backend, random, float64)), True)
 
     def loadGauge(self, gauge: LatticeGauge):
+        """Load a new gauge field, e.g. to reject a trajectory, which invalidates the chronological guesses."""
+        self._loadGauge(gauge)
+        for monomial in self._monomials:
+            if isinstance(monomial, FermionAction):
+                monomial.flushChrono()
+
+    def _loadGauge(self, gauge: LatticeGauge):
         gauge_in = gauge.copy()
         if self.gauge_param.t_boundary == QudaTboundary.QUDA_ANTI_PERIODIC_T:
             gauge_in.setAntiPeriodicT()
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         self.gauge_param.use_resident_gauge = 0
         loadGaugeQuda(gauge_in.data_ptrs, self.gauge_param)
         self.gauge_param.use_resident_gauge = 1
+        self.gauge_param.cpu_prec = cpu_prec
 
     def saveGauge(self, gauge: LatticeGauge):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         saveGaugeQuda(gauge.data_ptrs, self.gauge_param)
+        self.gauge_param.cpu_prec = cpu_prec
         if self.gauge_param.t_boundary == QudaTboundary.QUDA_ANTI_PERIODIC_T:
             gauge.setAntiPeriodicT()
 
@@ -183,7 +197,7 @@ class HMC:
         gauge = LatticeGauge(self.latt_info)
         self.saveGauge(gauge)
         gauge.projectSU3(tol)
-        self.loadGauge(gauge)
+        self._loadGauge(gauge)
 
     def plaquette(self):
         return plaqQuda()[0]
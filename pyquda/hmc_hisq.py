@@ -31,6 +31,7 @@ from .enum_quda import (
     QudaDagType,
 )
 from .field import Nc, LatticeInfo, LatticeGauge, LatticeStaggeredFermion
+from .dirac import Chrono, getCPUPrecision
 from .core import getHISQ
 
 nullptr = Pointers("void", 0)
@@ -63,18 +64,40 @@ class HMC:
         self.invert_param.solution_type = QudaSolutionType.QUDA_MATPC_SOLUTION
         self.invert_param.solve_type = QudaSolveType.QUDA_DIRECT_PC_SOLVE  # This is set to compute action
         self.invert_param.verbosity = QudaVerbosity.QUDA_SILENT
+        self.chrono = None
+
+    def setChrono(self, index: int, max_dim: int, precision=None):
+        self.chrono = Chrono(self.invert_param, index, max_dim, precision)
+
+    def invert(self, x: LatticeStaggeredFermion):
+        if self.chrono is not None:
+            self.chrono.setup()
+        invertQuda(x.even_ptr, x.odd_ptr, self.invert_param)
+        if self.chrono is not None:
+            self.chrono.update()
 
     def loadGauge(self, gauge: LatticeGauge):
+        self._loadGauge(gauge)
+        if self.chrono is not None:
+            self.chrono.flush()
+
+    def _loadGauge(self, gauge: LatticeGauge):
         gauge_in = gauge.copy()
         if self.gauge_param.t_boundary == QudaTboundary.QUDA_ANTI_PERIODIC_T:
             gauge_in.setAntiPeriodicT()
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         self.gauge_param.use_resident_gauge = 0
         loadGaugeQuda(gauge_in.data_ptrs, self.gauge_param)
         self.gauge_param.use_resident_gauge = 1
+        self.gauge_param.cpu_prec = cpu_prec
         self.updated_fat_long = False
 
     def saveGauge(self, gauge: LatticeGauge):
+        cpu_prec = self.gauge_param.cpu_prec
+        self.gauge_param.cpu_prec = getCPUPrecision(gauge.dtype)
         saveGaugeQuda(gauge.data_ptrs, self.gauge_param)
+        self.gauge_param.cpu_prec = cpu_prec
         if self.gauge_param.t_boundary == QudaTboundary.QUDA_ANTI_PERIODIC_T:
             gauge.setAntiPeriodicT()
 
@@ -118,7 +141,7 @@ class HMC:
 
     def computeFermionForce(self, dt, x: LatticeStaggeredFermion):
         self.updateFatLong()
-        invertQuda(x.even_ptr, x.odd_ptr, self.invert_param)
+        self.invert(x)
         u, v, w = self.computeUVW()
         computeHISQForceQuda(
             nullptr,
@@ -156,12 +179,12 @@ class HMC:
         self.saveGauge(gauge)
         self.gauge_param.t_boundary = QudaTboundary.QUDA_PERIODIC_T
         self.gauge_param.reconstruct = QudaReconstructType.QUDA_RECONSTRUCT_NO
-        self.loadGauge(gauge)
+        self._loadGauge(gauge)
         projectSU3Quda(nullptr, tol, self.gauge_param)
         self.saveGauge(gauge)
         self.gauge_param.t_boundary = t_boundary
         self.gauge_param.reconstruct = reconstruct
-        self.loadGauge(gauge)
+        self._loadGauge(gauge)
 
     def gaussMom(self, seed: int):
         gaussMomQuda(seed, 1.0)
@@ -185,7 +208,7 @@ class HMC:
     def actionFermion(self, x: LatticeStaggeredFermion) -> float:
         self.updateFatLong()
         self.invert_param.compute_action = 1
-        invertQuda(x.even_ptr, x.odd_ptr, self.invert_param)
+        self.invert(x)
         self.invert_param.compute_action = 0
         return self.invert_param.action[0] - self.latt_info.volume_cb2 * Nc
 
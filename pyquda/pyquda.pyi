@@ -1366,7 +1366,7 @@ def invertQuda(h_x: Pointer, h_b: Pointer, param: QudaInvertParam) -> None:
     """
     ...
 
-def invertMultiShiftQuda(_hp_x: Pointers, _hp_b: Pointer, param: QudaInvertParam) -> None:
+def invertMultiSrcQuda(_hp_x: Pointers, _hp_b: Pointers, param: QudaInvertParam) -> None:
     """
     Perform the solve like @invertQuda but for multiple rhs by spliting the comm grid into sub-partitions:
     each sub-partition invert one or more rhs'.
@@ -1383,10 +1383,20 @@ def invertMultiShiftQuda(_hp_x: Pointers, _hp_b: Pointer, param: QudaInvertParam
         Array of source spinor fields
     @param param:
         Contains all metadata regarding host and device storage and solver parameters
-    @param h_gauge:
-        Base pointer to host gauge field (regardless of dimensionality)
-    @param gauge_param:
-        Contains all metadata regarding host and device storage for gauge field
+    """
+    ...
+
+def invertMultiShiftQuda(_hp_x: Pointers, _hp_b: Pointer, param: QudaInvertParam) -> None:
+    """
+    Solve for multiple shifts (e.g., masses).
+
+    @param _hp_x:
+        Array of solution spinor fields
+    @param _hp_b:
+        Source spinor fields
+    @param param:
+        Contains all metadata regarding host and device
+        storage and solver parameters
     """
     ...
 
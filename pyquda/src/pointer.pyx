@@ -72,8 +72,12 @@ def ndarrayPointer(ndarray, as_void=False):
     if not as_void:
         if dtype == "<i4":
             dtype = "int"
+        elif dtype == "<f4":
+            dtype = "float"
         elif dtype == "<f8":
             dtype = "double"
+        elif dtype == "<c8":
+            dtype = "float_complex"
         elif dtype == "<c16":
             dtype = "double_complex"
         else:
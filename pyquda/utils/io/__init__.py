@@ -1,10 +1,25 @@
-from typing import List
+from typing import Iterable, Iterator, List, Literal, Sequence, Union
 
 import numpy
 
-from ...field import Ns, Nc, LatticeInfo, LatticeGauge, LatticePropagator, LatticeStaggeredPropagator, cb2, lexico
+from ...field import (
+    Ns,
+    Nc,
+    LatticeInfo,
+    LatticeGauge,
+    MultiLatticeFermion,
+    MultiLatticeStaggeredFermion,
+    LatticePropagator,
+    LatticeStaggeredPropagator,
+    cb2,
+    lexico,
+)
 
+from .container import FieldContainer
+from .detect import detectFormat
 from .eigen import readTimeSlice as readTimeSliceEivenvector
+from .lime import LimeIndex, setIndexCache as setLimeIndexCache
+from .writer import PropagatorWriter
 
 
 # matrices to convert gamma basis bewteen DeGrand-Rossi and Dirac-Pauli
@@ -72,60 +87,121 @@ def rotateToDeGrandRossi(propagator: LatticePropagator):
     )
 
 
-def readChromaQIOGauge(filename: str):
+def _rotateToDeGrandRossiLexico(propagator_raw: numpy.ndarray):
+    from opt_einsum import contract
+
+    P = numpy.asarray(_DP_TO_DR)
+    Pinv = numpy.asarray(_DR_TO_DP) / 2
+    return contract("ij,tzyxjkab,kl->tzyxilab", P, propagator_raw, Pinv, optimize=True)
+
+
+def readChromaQIOGauge(filename: str, checksum: bool = False):
     from .chroma import readQIOGauge as read
 
-    latt_size, gauge_raw = read(filename)
-    return LatticeGauge(LatticeInfo(latt_size), cb2(gauge_raw, [1, 2, 3, 4]))
+    latt_size, gauge_raw = read(filename, checksum, even_odd=True)
+    return LatticeGauge(LatticeInfo(latt_size), gauge_raw)
+
+
+def readQIOGauge(filename: str, checksum: bool = False):
+    return readChromaQIOGauge(filename, checksum)
 
 
-def readQIOGauge(filename: str):
-    return readChromaQIOGauge(filename)
+def writeChromaQIOGauge(filename: str, gauge: LatticeGauge, precision: int = 8):
+    from .chroma import writeQIOGauge as write
+
+    write(filename, gauge.latt_info.global_size, gauge.lexico(), precision)
+
+
+def writeQIOGauge(filename: str, gauge: LatticeGauge, precision: int = 8):
+    writeChromaQIOGauge(filename, gauge, precision)
 
 
 def readILDGBinGauge(filename: str, dtype: str, latt_size: List[int]):
     from .chroma import readILDGBinGauge as read
 
-    gauge_raw = read(filename, dtype, latt_size)
-    return LatticeGauge(LatticeInfo(latt_size), cb2(gauge_raw, [1, 2, 3, 4]))
+    gauge_raw = read(filename, dtype, latt_size, even_odd=True)
+    return LatticeGauge(LatticeInfo(latt_size), gauge_raw)
 
 
-def readChromaQIOPropagator(filename: str):
+def readChromaQIOPropagator(filename: str, checksum: bool = False, timeslices: Sequence[int] = None):
+    """
+    With `timeslices`, only these global timeslices are read and the lexicographic local propagator
+    (Nt, Lz, Ly, Lx, ...) is returned, holding the Nt requested timeslices on this rank in the requested order.
+    Pass `range(t_start, t_stop)` for a contiguous range.
+    """
     from .chroma import readQIOPropagator as read
 
-    latt_size, staggered, propagator_raw = read(filename)
-    if not staggered:
-        return LatticePropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3]))
+    latt_size, staggered, propagator_raw = read(filename, checksum, timeslices, even_odd=True)
+    if timeslices is not None:
+        return propagator_raw
+    elif not staggered:
+        return LatticePropagator(LatticeInfo(latt_size), propagator_raw)
     else:
-        return LatticeStaggeredPropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3]))
+        return LatticeStaggeredPropagator(LatticeInfo(latt_size), propagator_raw)
+
+
+def readQIOPropagator(filename: str, checksum: bool = False, timeslices: Sequence[int] = None):
+    return readChromaQIOPropagator(filename, checksum, timeslices)
 
 
-def readQIOPropagator(filename: str):
-    return readChromaQIOPropagator(filename)
+def writeChromaQIOPropagator(
+    filename: str, propagator: Union[LatticePropagator, LatticeStaggeredPropagator], precision: int = 8
+):
+    from .chroma import writeQIOPropagator as write
 
+    staggered = isinstance(propagator, LatticeStaggeredPropagator)
+    write(filename, propagator.latt_info.global_size, staggered, propagator.lexico(), precision)
 
-def readMILCGauge(filename: str):
+
+def writeQIOPropagator(
+    filename: str, propagator: Union[LatticePropagator, LatticeStaggeredPropagator], precision: int = 8
+):
+    writeChromaQIOPropagator(filename, propagator, precision)
+
+
+def readMILCGauge(filename: str, checksum: bool = False):
     from .milc import readGauge as read
 
-    latt_size, gauge_raw = read(filename)
-    return LatticeGauge(LatticeInfo(latt_size), cb2(gauge_raw, [1, 2, 3, 4]))
+    latt_size, gauge_raw = read(filename, checksum, even_odd=True)
+    return LatticeGauge(LatticeInfo(latt_size), gauge_raw)
+
+
+def writeMILCGauge(filename: str, gauge: LatticeGauge):
+    from .milc import writeGauge as write
+
+    write(filename, gauge.latt_info.global_size, gauge.lexico())
 
 
-def readMILCQIOPropagator(filename: str):
+def readMILCQIOPropagator(filename: str, checksum: bool = False, timeslices: Sequence[int] = None):
     from .milc import readQIOPropagator as read
 
-    latt_size, staggered, propagator_raw = read(filename)
-    if not staggered:
-        return LatticePropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3]))
+    latt_size, staggered, propagator_raw = read(filename, checksum, timeslices, even_odd=True)
+    if timeslices is not None:
+        return propagator_raw
+    elif not staggered:
+        return LatticePropagator(LatticeInfo(latt_size), propagator_raw)
     else:
-        return LatticeStaggeredPropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3]))
+        return LatticeStaggeredPropagator(LatticeInfo(latt_size), propagator_raw)
+
+
+def writeMILCQIOPropagator(
+    filename: str,
+    propagator: Union[LatticePropagator, LatticeStaggeredPropagator],
+    source: Union[LatticePropagator, LatticeStaggeredPropagator] = None,
+    precision: int = 4,
+):
+    from .milc import writeQIOPropagator as write
+
+    staggered = isinstance(propagator, LatticeStaggeredPropagator)
+    source_raw = source.lexico() if source is not None else None
+    write(filename, propagator.latt_info.global_size, staggered, propagator.lexico(), source_raw, precision)
 
 
 def readKYUGauge(filename: str, latt_size: List[int]):
     from .kyu import readGauge as read
 
-    gauge_raw = read(filename, latt_size)
-    return LatticeGauge(LatticeInfo(latt_size), cb2(gauge_raw, [1, 2, 3, 4]))
+    gauge_raw = read(filename, latt_size, even_odd=True)
+    return LatticeGauge(LatticeInfo(latt_size), gauge_raw)
 
 
 def writeKYUGauge(filename: str, gauge: LatticeGauge):
@@ -134,11 +210,13 @@ def writeKYUGauge(filename: str, gauge: LatticeGauge):
     write(filename, gauge.lexico(), gauge.latt_info.global_size)
 
 
-def readKYUPropagator(filename: str, latt_size: List[int]):
+def readKYUPropagator(filename: str, latt_size: List[int], timeslices: Sequence[int] = None):
     from .kyu import readPropagator as read
 
-    propagator_raw = read(filename, latt_size)
-    return rotateToDeGrandRossi(LatticePropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3])))
+    propagator_raw = read(filename, latt_size, timeslices, even_odd=True)
+    if timeslices is not None:
+        return _rotateToDeGrandRossiLexico(propagator_raw)
+    return rotateToDeGrandRossi(LatticePropagator(LatticeInfo(latt_size), propagator_raw))
 
 
 def writeKYUPropagator(filename: str, propagator: LatticePropagator):
@@ -147,11 +225,13 @@ def writeKYUPropagator(filename: str, propagator: LatticePropagator):
     write(filename, rotateToDiracPauli(propagator).lexico(), propagator.latt_info.global_size)
 
 
-def readKYUPropagatorF(filename: str, latt_size: List[int]):
+def readKYUPropagatorF(filename: str, latt_size: List[int], timeslices: Sequence[int] = None):
     from .kyu_single import readPropagator as read
 
-    propagator_raw = read(filename, latt_size)
-    return rotateToDeGrandRossi(LatticePropagator(LatticeInfo(latt_size), cb2(propagator_raw, [0, 1, 2, 3])))
+    propagator_raw = read(filename, latt_size, timeslices, even_odd=True)
+    if timeslices is not None:
+        return _rotateToDeGrandRossiLexico(propagator_raw)
+    return rotateToDeGrandRossi(LatticePropagator(LatticeInfo(latt_size), propagator_raw))
 
 
 def writeKYUPropagatorF(filename: str, propagator: LatticePropagator):
@@ -181,7 +261,197 @@ def writeKYUPropagatorFFast(filename: str, propagator: LatticePropagator):
     Lx, Ly, Lz, Lt = latt_info.size
     propagator = rotateToDiracPauli(propagator)
     propagator.data = propagator.data.astype("<c8").transpose(6, 8, 0, 1, 2, 3, 4, 5, 7)
+    propagator.data = lexico(propagator.data.reshape(Ns, Nc, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc), [2, 3, 4, 5, 6])
     propagator.toHost()
-    propagator.data = propagator.data.reshape(Ns, Nc, 2, Lt, Lz, Ly, Lx // 2, Ns, Nc)
-    propagator_raw = lexico(propagator.data, [2, 3, 4, 5, 6])
-    write(filename, propagator_raw, latt_info.global_size)
+    write(filename, propagator.data, latt_info.global_size)
+
+
+def readCompressedPropagator(filename: str, timeslices: Sequence[int] = None):
+    """
+    Read a propagator written by `writeCompressedPropagator`, or the lexicographic timeslices `timeslices` of it.
+    """
+    from .compressed import readPropagator as read
+
+    latt_size, staggered, propagator_raw = read(filename, timeslices, even_odd=True)
+    if timeslices is not None:
+        return propagator_raw
+    elif not staggered:
+        return LatticePropagator(LatticeInfo(latt_size), propagator_raw)
+    else:
+        return LatticeStaggeredPropagator(LatticeInfo(latt_size), propagator_raw)
+
+
+def writeCompressedPropagator(
+    filename: str,
+    propagator: Union[LatticePropagator, LatticeStaggeredPropagator],
+    precision: int = 8,
+    compression: Literal["zlib", "lzma"] = "zlib",
+    level: int = None,
+    tolerance: float = None,
+):
+    """
+    Write a propagator in `precision` bytes per real number, compressed per timeslice. With `tolerance` the
+    numbers are rounded to a relative error of at most `tolerance` before the compression.
+    """
+    from .compressed import writePropagator as write
+
+    write(
+        filename,
+        propagator.lexico(),
+        propagator.latt_info.global_size,
+        precision,
+        compression,
+        level,
+        tolerance,
+    )
+
+
+def readDiracEigenvector(filename: str, Ne: int = None):
+    from .eigen import readDirac as read
+
+    latt_size, staggered, eigenvalue, eigenvector_raw = read(filename, Ne, even_odd=True)
+    if not staggered:
+        return eigenvalue, MultiLatticeFermion(LatticeInfo(latt_size), len(eigenvalue), eigenvector_raw)
+    else:
+        return eigenvalue, MultiLatticeStaggeredFermion(LatticeInfo(latt_size), len(eigenvalue), eigenvector_raw)
+
+
+def writeDiracEigenvector(
+    filename: str,
+    eigenvalue: numpy.ndarray,
+    eigenvector: Union[MultiLatticeFermion, MultiLatticeStaggeredFermion],
+    gauge_checksum: str = None,
+):
+    from .eigen import writeDirac as write
+
+    write(filename, eigenvalue, eigenvector.lexico(), eigenvector.latt_info.global_size, gauge_checksum)
+
+
+def iterGauge(
+    filenames: Iterable[str],
+    format: Literal["chroma_qio", "milc", "ildg_bin", "kyu"] = "chroma_qio",
+    depth: int = 1,
+    max_bytes: int = None,
+    **kwargs,
+) -> Iterator[LatticeGauge]:
+    """
+    Iterate over the gauge configurations in `filenames` while the next `depth` files are read in a background
+    thread, at most `max_bytes` of host memory ahead. `kwargs` are passed to the reader of `format`: `checksum` for
+    chroma_qio and milc, `dtype` and `latt_size` for ildg_bin, `latt_size` for kyu.
+    """
+    from ... import getLogger
+    from .prefetch import Prefetcher
+
+    if format == "chroma_qio":
+        from .chroma import readQIOGauge as read
+    elif format == "milc":
+        from .milc import readGauge as read
+    elif format == "ildg_bin":
+        from .chroma import readILDGBinGauge
+
+        def read(filename: str, dtype: str, latt_size: List[int], even_odd: bool):
+            return latt_size, readILDGBinGauge(filename, dtype, latt_size, even_odd)
+
+    elif format == "kyu":
+        from .kyu import readGauge
+
+        def read(filename: str, latt_size: List[int], even_odd: bool):
+            return latt_size, readGauge(filename, latt_size, even_odd)
+
+    else:
+        getLogger().critical(f"Unknown gauge format {format}", ValueError)
+
+    # the prefetcher starts reading right away, the device copies are made by the consumer
+    prefetcher = Prefetcher(lambda filename: read(filename, **kwargs, even_odd=True), filenames, depth, max_bytes)
+    return (LatticeGauge(LatticeInfo(latt_size), gauge_raw) for latt_size, gauge_raw in prefetcher)
+
+
+def _readGaugeRaw(filename: str, latt_size: List[int], checksum: bool, format: str):
+    from ... import getLogger
+
+    format = detectFormat(filename, latt_size) if format is None else format
+    if format == "chroma_qio":
+        from .chroma import readQIOGauge
+
+        return readQIOGauge(filename, checksum, even_odd=True)
+    elif format == "milc":
+        from .milc import readGauge
+
+        return readGauge(filename, checksum, even_odd=True)
+    elif format == "ildg_bin":
+        from os import path
+        from .chroma import readILDGBinGauge
+
+        # no header, the precision follows from the size of the file
+        site_bytes = path.getsize(path.expanduser(path.expandvars(filename))) // int(numpy.prod(latt_size))
+        dtype = f">c{site_bytes // (4 * Nc * Nc)}"
+        return latt_size, readILDGBinGauge(filename, dtype, latt_size, even_odd=True)
+    elif format == "kyu":
+        from .kyu import readGauge
+
+        return latt_size, readGauge(filename, latt_size, even_odd=True)
+    else:
+        getLogger().critical(f"{filename} in format {format} is not a gauge field", ValueError)
+
+
+def readGauge(
+    filename: Union[str, Iterable[str]],
+    latt_size: List[int] = None,
+    checksum: bool = False,
+    format: Literal["chroma_qio", "milc", "ildg_bin", "kyu"] = None,
+    depth: int = 1,
+    max_bytes: int = None,
+) -> Union[LatticeGauge, Iterator[LatticeGauge]]:
+    """
+    Read a gauge field in any supported format, detected from the file by `detectFormat` unless `format` is given.
+    `latt_size` is needed for the headerless formats, ILDG binary files have the size of a KYU gauge and are only
+    read with `format="ildg_bin"`. With a list of files the gauge fields are yielded one by one, while the next
+    `depth` files are read in a background thread as in `iterGauge`.
+    """
+    from .prefetch import Prefetcher
+
+    if isinstance(filename, str):
+        latt_size, gauge_raw = _readGaugeRaw(filename, latt_size, checksum, format)
+        return LatticeGauge(LatticeInfo(latt_size), gauge_raw)
+
+    prefetcher = Prefetcher(
+        lambda name: _readGaugeRaw(name, latt_size, checksum, format), filename, depth, max_bytes
+    )
+    return (LatticeGauge(LatticeInfo(size), gauge_raw) for size, gauge_raw in prefetcher)
+
+
+def _readPropagator(
+    filename: str, latt_size: List[int], checksum: bool, timeslices: Sequence[int], format: str
+) -> Union[LatticePropagator, LatticeStaggeredPropagator]:
+    from ... import getLogger
+
+    format = detectFormat(filename, latt_size) if format is None else format
+    if format == "chroma_qio":
+        return readChromaQIOPropagator(filename, checksum, timeslices)
+    elif format == "milc_qio":
+        return readMILCQIOPropagator(filename, checksum, timeslices)
+    elif format == "kyu":
+        return readKYUPropagator(filename, latt_size, timeslices)
+    elif format == "kyu_single":
+        return readKYUPropagatorF(filename, latt_size, timeslices)
+    elif format == "compressed":
+        return readCompressedPropagator(filename, timeslices)
+    else:
+        getLogger().critical(f"{filename} in format {format} is not a propagator", ValueError)
+
+
+def readPropagator(
+    filename: Union[str, Iterable[str]],
+    latt_size: List[int] = None,
+    checksum: bool = False,
+    timeslices: Sequence[int] = None,
+    format: Literal["chroma_qio", "milc_qio", "kyu", "kyu_single", "compressed"] = None,
+) -> Union[LatticePropagator, LatticeStaggeredPropagator, Iterator[LatticePropagator]]:
+    """
+    Read a propagator in any supported format, detected from the file by `detectFormat` unless `format` is given.
+    `latt_size` is needed for the KYU formats and `timeslices` is passed to the reader. With a list of files the
+    propagators are read lazily and yielded one by one.
+    """
+    if isinstance(filename, str):
+        return _readPropagator(filename, latt_size, checksum, timeslices, format)
+    return (_readPropagator(name, latt_size, checksum, timeslices, format) for name in filename)
@@ -0,0 +1,113 @@
+from functools import lru_cache
+from time import perf_counter
+from typing import Tuple
+import zlib
+
+import numpy
+
+from .convert import _dropPages
+
+
+def _siteRank(shape: Tuple[int, int, int, int]):
+    """Global lexicographic rank of every local site, x running fastest."""
+    from ... import getGridSize, getGridCoord
+
+    Lt, Lz, Ly, Lx = shape
+    Gx, Gy, Gz, Gt = getGridSize()
+    gx, gy, gz, gt = getGridCoord()
+    t = numpy.arange(gt * Lt, (gt + 1) * Lt, dtype="<u8").reshape(Lt, 1, 1, 1)
+    z = numpy.arange(gz * Lz, (gz + 1) * Lz, dtype="<u8").reshape(1, Lz, 1, 1)
+    y = numpy.arange(gy * Ly, (gy + 1) * Ly, dtype="<u8").reshape(1, 1, Ly, 1)
+    x = numpy.arange(gx * Lx, (gx + 1) * Lx, dtype="<u8").reshape(1, 1, 1, Lx)
+    return (((t * (Gz * Lz) + z) * (Gy * Ly) + y) * (Gx * Lx) + x).reshape(-1)
+
+
+@lru_cache(maxsize=None)
+def _crc32Table(site_bytes: int):
+    """
+    CRC32 is affine in the message: the CRC32 of `site_bytes` bytes is the XOR of table[j * 256 + byte] over the
+    bytes j of the message and of the CRC32 of as many zero bytes, which is returned along with the table.
+    """
+    table = numpy.arange(256, dtype="<u4")
+    for _ in range(8):
+        table = numpy.where(table & 1, (table >> 1) ^ numpy.uint32(0xEDB88320), table >> 1).astype("<u4")
+    # the contribution of a byte is its table entry shifted through the zero bytes after it
+    tables = numpy.empty((site_bytes, 256), "<u4")
+    tables[-1] = table
+    for j in range(site_bytes - 2, -1, -1):
+        tables[j] = table[tables[j + 1] & 0xFF] ^ (tables[j + 1] >> 8)
+    return tables.reshape(-1), numpy.uint32(zlib.crc32(bytes(site_bytes)))
+
+
+def _crc32(data: numpy.ndarray) -> numpy.ndarray:
+    """zlib.crc32 of every row of the uint8 array `data`, a few hundred rows at a time to stay in cache."""
+    num_sites, site_bytes = data.shape
+    table, zero = _crc32Table(site_bytes)
+    position = numpy.arange(0, site_bytes * 256, 256, dtype="<u4")
+    step = max(1, 2**18 // site_bytes)
+    work = numpy.empty(num_sites, "<u4")
+    for i in range(0, num_sites, step):
+        work[i : i + step] = numpy.bitwise_xor.reduce(table.take(data[i : i + step] + position), axis=1)
+    return work ^ zero
+
+
+def _rotateXor(work: numpy.ndarray, rank: numpy.ndarray, n: int) -> int:
+    shift = rank % n
+    work = work.astype("<u8")
+    rotated = ((work << shift) | (work >> (32 - shift))) & 0xFFFFFFFF
+    return int(numpy.bitwise_xor.reduce(rotated))
+
+
+def _reduceXor(*sums: int):
+    from mpi4py import MPI
+    from ... import getMPIComm
+
+    sums = numpy.array(sums, "<u4")
+    getMPIComm().Allreduce(MPI.IN_PLACE, sums, MPI.BXOR)
+    return tuple(int(x) for x in sums)
+
+
+def scidac(data: numpy.ndarray) -> Tuple[int, int]:
+    """
+    SciDAC checksum (suma, sumb) of a record, `data` is the local sublattice (Lt, Lz, Ly, Lx, ...) exactly as
+    stored in the file. Each rank checksums its own sites, the results are XOR-reduced over all ranks.
+    """
+    Lt, Lz, Ly, Lx = data.shape[:4]
+    # one timeslice at a time, `data` may be a view of a memory-mapped file
+    work = numpy.empty((Lt, Lz * Ly * Lx), "<u4")
+    for t in range(Lt):
+        work[t] = _crc32(numpy.ascontiguousarray(data[t]).reshape(Lz * Ly * Lx, -1).view("<u1"))
+        _dropPages(data)
+    work = work.reshape(-1)
+    rank = _siteRank((Lt, Lz, Ly, Lx))
+    return _reduceXor(_rotateXor(work, rank, 29), _rotateXor(work, rank, 31))
+
+
+def milc(data: numpy.ndarray) -> Tuple[int, int]:
+    """
+    MILC checksum (sum29, sum31) of the 32-bit words of a gauge field, `data` is the local sublattice
+    (Lt, Lz, Ly, Lx, ...) as stored in the file, in either byte order.
+    """
+    Lt, Lz, Ly, Lx = data.shape[:4]
+    endian = data.dtype.byteorder if data.dtype.byteorder in "<>" else "<"
+    work = numpy.ascontiguousarray(data).reshape(Lt * Lz * Ly * Lx, -1).view(f"{endian}u4")
+    rank = _siteRank((Lt, Lz, Ly, Lx)).reshape(-1, 1) * work.shape[1] + numpy.arange(work.shape[1], dtype="<u8")
+    work, rank = work.reshape(-1), rank.reshape(-1)
+    return _reduceXor(_rotateXor(work, rank, 29), _rotateXor(work, rank, 31))
+
+
+def verify(kind: str, data: numpy.ndarray, expected: Tuple[int, int], filename: str):
+    """Compute the `kind` ("scidac" or "milc") checksum of `data`, log its cost and check it against `expected`."""
+    from ... import getLogger
+
+    s = perf_counter()
+    result = scidac(data) if kind == "scidac" else milc(data)
+    secs = perf_counter() - s
+    getLogger().info(f"Checksum {result[0]:08x} {result[1]:08x} of {filename} in {secs:.3f} secs")
+    if result != tuple(expected):
+        getLogger().critical(
+            f"Checksum mismatch in {filename}: {result[0]:08x} {result[1]:08x} computed, "
+            f"{expected[0]:08x} {expected[1]:08x} expected",
+            ValueError,
+        )
+    return result
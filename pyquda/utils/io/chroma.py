@@ -1,46 +1,43 @@
-import io
 from os import path
-import struct
-from typing import Dict, List, Tuple
-from xml.etree import ElementTree as ET
+from time import gmtime, strftime
+from typing import List, Sequence, Tuple
 
-from ... import getSublatticeSize, readMPIFile
+import numpy
+
+from ... import getGridCoord, getGridSize, getLogger, getSublatticeSize, mapMPIFile
+from .checksum import scidac, verify
+from .convert import fileToLattice, latticeToFile
+from .lime import LimeIndex, writeLIME
 
 Nd, Ns, Nc = 4, 4, 3
 _precision_map = {"D": 8, "F": 4, "S": 4}
 
 
-def fromILDGGaugeFile(filename: str, offset: int, dtype: str, sublatt_size: List[int]):
+def fromILDGGaugeFile(
+    filename: str,
+    offset: int,
+    dtype: str,
+    sublatt_size: List[int],
+    checksum: Tuple[int, int] = None,
+    even_odd: bool = False,
+):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    gauge_raw = readMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0))
-    gauge_raw = gauge_raw.transpose(4, 0, 1, 2, 3, 5, 6).astype("<c16")
+    gauge_raw = mapMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0))
+    if checksum is not None:
+        verify("scidac", gauge_raw, checksum, filename)
+    gauge_raw = fileToLattice(gauge_raw, (4, 0, 1, 2, 3, 5, 6), "<c16", 1, even_odd)
 
     return gauge_raw
 
 
-def readQIOGauge(filename: str):
+def readQIOGauge(filename: str, checksum: bool = False, even_odd: bool = False):
     filename = path.expanduser(path.expandvars(filename))
-    with open(filename, "rb") as f:
-        meta: Dict[str, Tuple[int, int]] = {}
-        buffer = f.read(8)
-        while buffer != b"" and buffer != b"\x0A":
-            assert buffer.startswith(b"\x45\x67\x89\xAB\x00\x01")
-            length = (struct.unpack(">Q", f.read(8))[0] + 7) // 8 * 8
-            name = f.read(128).strip(b"\x00").decode("utf-8")
-            meta[name] = (f.tell(), length)
-            f.seek(length, io.SEEK_CUR)
-            buffer = f.read(8)
-
-        f.seek(meta["scidac-private-file-xml"][0])
-        scidac_private_file_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-file-xml"][1]).strip(b"\x00").decode("utf-8"))
-        )
-        f.seek(meta["scidac-private-record-xml"][0])
-        scidac_private_record_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-record-xml"][1]).strip(b"\x00").decode("utf-8"))
-        )
-        offset = meta["ildg-binary-data"][0]
+    index = LimeIndex(filename)
+    scidac_private_file_xml = index.xml("scidac-private-file-xml")
+    scidac_private_record_xml = index.xml("scidac-private-record-xml")
+    offset = index.offset("ildg-binary-data")
+    scidac_checksum = index.checksum() if checksum else None
     precision = _precision_map[scidac_private_record_xml.find("precision").text]
     assert int(scidac_private_record_xml.find("colors").text) == Nc
     assert (
@@ -52,52 +49,80 @@ def readQIOGauge(filename: str):
     assert int(scidac_private_file_xml.find("spacetime").text) == Nd
     latt_size = [int(L) for L in scidac_private_file_xml.find("dims").text.split()]
     sublatt_size = getSublatticeSize(latt_size)
-    gauge_raw = fromILDGGaugeFile(filename, offset, f">c{2*precision}", sublatt_size)
+    gauge_raw = fromILDGGaugeFile(filename, offset, f">c{2*precision}", sublatt_size, scidac_checksum, even_odd)
     return latt_size, gauge_raw
 
 
-def readILDGBinGauge(filename: str, dtype: str, latt_size: List[int]):
+def readILDGBinGauge(filename: str, dtype: str, latt_size: List[int], even_odd: bool = False):
     filename = path.expanduser(path.expandvars(filename))
     sublatt_size = getSublatticeSize(latt_size)
-    gauge_raw = fromILDGGaugeFile(filename, 0, dtype, sublatt_size)
+    gauge_raw = fromILDGGaugeFile(filename, 0, dtype, sublatt_size, None, even_odd)
     return gauge_raw
 
 
-def fromSCIDACPropagatorFile(filename: str, offset: int, dtype: str, sublatt_size: List[int], staggered: bool):
+def _localTimeSlices(timeslices: Sequence[int], Lt: int) -> List[int]:
+    """The global `timeslices` held by this rank, in the requested order."""
+    gt = getGridCoord()[3]
+    return [t for t in timeslices if gt * Lt <= t < (gt + 1) * Lt]
+
+
+def _timeSliceOffsets(offset: int, timeslices: List[int], sublatt_size: List[int], site_bytes: int) -> List[int]:
+    """Offsets of `timeslices` in a record of shape (Lt, Lz, Ly, Lx, ...) starting at `offset`."""
+    Lx, Ly, Lz, Lt = sublatt_size
+    Gx, Gy, Gz, Gt = getGridSize()
+    slice_bytes = Gz * Lz * Gy * Ly * Gx * Lx * site_bytes
+    return [offset + t * slice_bytes for t in timeslices]
+
+
+def _checkTimeSlices(checksum: bool, timeslices: Sequence[int], filename: str):
+    if checksum and timeslices is not None:
+        getLogger().critical(f"Cannot verify the checksum of {filename} when reading only some timeslices", ValueError)
+
+
+def fromSCIDACPropagatorFile(
+    filename: str,
+    offset: int,
+    dtype: str,
+    sublatt_size: List[int],
+    staggered: bool,
+    checksum: Tuple[int, int] = None,
+    timeslices: Sequence[int] = None,
+    even_odd: bool = False,
+):
     Lx, Ly, Lz, Lt = sublatt_size
+    site_shape = (Ns, Ns, Nc, Nc) if not staggered else (Nc, Nc)
 
-    if not staggered:
-        propagator_raw = readMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc), (3, 2, 1, 0))
-        propagator_raw = propagator_raw.astype("<c16")
+    if timeslices is None:
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, *site_shape), (3, 2, 1, 0))
     else:
-        propagator_raw = readMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Nc, Nc), (3, 2, 1, 0))
-        propagator_raw = propagator_raw.astype("<c16")
+        # one record per local timeslice, ranks holding none of them read nothing
+        site_bytes = int(numpy.prod(site_shape)) * numpy.dtype(dtype).itemsize
+        timeslices = _localTimeSlices(timeslices, Lt)
+        offset = _timeSliceOffsets(offset, timeslices, sublatt_size, site_bytes)
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lz, Ly, Lx, *site_shape), (2, 1, 0))
+        even_odd = False
+    if checksum is not None:
+        verify("scidac", propagator_raw, checksum, filename)
+    propagator_raw = fileToLattice(propagator_raw, range(propagator_raw.ndim), "<c16", 0, even_odd)
 
     return propagator_raw
 
 
-def readQIOPropagator(filename: str):
+def readQIOPropagator(
+    filename: str, checksum: bool = False, timeslices: Sequence[int] = None, even_odd: bool = False
+):
+    """
+    With `timeslices`, only these global timeslices are read and the local propagator has shape
+    (Nt, Lz, Ly, Lx, ...) with the Nt requested timeslices held by this rank, in the requested order.
+    With `even_odd`, the full propagator is returned in the even-odd order (2, Lt, Lz, Ly, Lx // 2, ...).
+    """
     filename = path.expanduser(path.expandvars(filename))
-    with open(filename, "rb") as f:
-        meta: Dict[str, Tuple[int, int]] = {}
-        buffer = f.read(8)
-        while buffer != b"" and buffer != b"\x0A":
-            assert buffer.startswith(b"\x45\x67\x89\xAB\x00\x01")
-            length = (struct.unpack(">Q", f.read(8))[0] + 7) // 8 * 8
-            name = f.read(128).strip(b"\x00").decode("utf-8")
-            meta[name] = (f.tell(), length)
-            f.seek(length, io.SEEK_CUR)
-            buffer = f.read(8)
-
-        f.seek(meta["scidac-private-file-xml"][0])
-        scidac_private_file_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-file-xml"][1]).strip(b"\x00").decode("utf-8"))
-        )
-        f.seek(meta["scidac-private-record-xml"][0])
-        scidac_private_record_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-record-xml"][1]).strip(b"\x00").decode("utf-8"))
-        )
-        offset = meta["scidac-binary-data"][0]
+    _checkTimeSlices(checksum, timeslices, filename)
+    index = LimeIndex(filename)
+    scidac_private_file_xml = index.xml("scidac-private-file-xml")
+    scidac_private_record_xml = index.xml("scidac-private-record-xml")
+    offset = index.offset("scidac-binary-data")
+    scidac_checksum = index.checksum() if checksum else None
     precision = _precision_map[scidac_private_record_xml.find("precision").text]
     assert int(scidac_private_record_xml.find("colors").text) == Nc
     assert (
@@ -115,5 +140,106 @@ def readQIOPropagator(filename: str):
     assert int(scidac_private_file_xml.find("spacetime").text) == Nd
     latt_size = [int(L) for L in scidac_private_file_xml.find("dims").text.split()]
     sublatt_size = getSublatticeSize(latt_size)
-    propagator_raw = fromSCIDACPropagatorFile(filename, offset, f">c{2*precision}", sublatt_size, staggered)
+    propagator_raw = fromSCIDACPropagatorFile(
+        filename, offset, f">c{2*precision}", sublatt_size, staggered, scidac_checksum, timeslices, even_odd
+    )
     return latt_size, staggered, propagator_raw
+
+
+def _scidacFileXML(latt_size: List[int]):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><scidacFile><version>1.1</version><spacetime>4</spacetime>'
+        f"<dims>{' '.join([str(L) for L in latt_size])} </dims><volfmt>0</volfmt></scidacFile>"
+    )
+
+
+def _scidacRecordXML(datatype: str, precision: int, spins: int, typesize: int, datacount: int):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><scidacRecord><version>1.1</version>'
+        f"<date>{strftime('%a %b %d %H:%M:%S %Y UTC', gmtime())}</date><recordtype>0</recordtype>"
+        f"<datatype>{datatype}</datatype><precision>{'D' if precision == 8 else 'F'}</precision>"
+        f"<colors>{Nc}</colors>{f'<spins>{spins}</spins>' if spins is not None else ''}<typesize>{typesize}</typesize>"
+        f"<datacount>{datacount}</datacount></scidacRecord>"
+    )
+
+
+def _scidacChecksumXML(checksum: Tuple[int, int]):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><scidacChecksum><version>1.0</version>'
+        f"<suma>{checksum[0]:x}</suma><sumb>{checksum[1]:x}</sumb></scidacChecksum>"
+    )
+
+
+def writeQIOGauge(
+    filename: str,
+    latt_size: List[int],
+    gauge_raw: numpy.ndarray,
+    precision: int = 8,
+    file_xml: str = '<?xml version="1.0"?>\n<gauge>\n  <id>0</id>\n</gauge>\n',
+    record_xml: str = '<?xml version="1.0"?>\n<gauge>\n</gauge>\n',
+):
+    filename = path.expanduser(path.expandvars(filename))
+    GLx, GLy, GLz, GLt = latt_size
+
+    gauge_raw = latticeToFile(gauge_raw, (4, 0, 1, 2, 3, 5, 6), f">c{2 * precision}", 1)
+    checksum = scidac(gauge_raw)
+    prec = "D" if precision == 8 else "F"
+    record = _scidacRecordXML(f"QDP_{prec}3_ColorMatrix", precision, 1, Nc * Nc * 2 * precision, Nd)
+    ildg_format = (
+        '<?xml version="1.0" encoding="UTF-8"?><ildgFormat xmlns="http://www.lqcd.org/ildg" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.lqcd.org/ildg/filefmt.xsd">'
+        f"<version>1.0</version><field>su3gauge</field><precision>{8 * precision}</precision>"
+        f"<lx>{GLx}</lx><ly>{GLy}</ly><lz>{GLz}</lz><lt>{GLt}</lt></ildgFormat>"
+    )
+    writeLIME(
+        filename,
+        [
+            [
+                ("scidac-private-file-xml", _scidacFileXML(latt_size)),
+                ("scidac-file-xml", file_xml),
+            ],
+            [
+                ("scidac-private-record-xml", record),
+                ("scidac-record-xml", record_xml),
+                ("ildg-format", ildg_format),
+                ("ildg-binary-data", gauge_raw),
+                ("scidac-checksum", _scidacChecksumXML(checksum)),
+            ],
+        ],
+    )
+
+
+def writeQIOPropagator(
+    filename: str,
+    latt_size: List[int],
+    staggered: bool,
+    propagator_raw: numpy.ndarray,
+    precision: int = 8,
+    file_xml: str = '<?xml version="1.0"?>\n<propagator>\n  <id>0</id>\n</propagator>\n',
+    record_xml: str = '<?xml version="1.0"?>\n<propagator>\n</propagator>\n',
+):
+    filename = path.expanduser(path.expandvars(filename))
+
+    propagator_raw = propagator_raw.astype(f">c{2 * precision}")
+    checksum = scidac(propagator_raw)
+    prec = "D" if precision == 8 else "F"
+    if not staggered:
+        record = _scidacRecordXML(f"QDP_{prec}3_DiracPropagator", precision, Ns, Ns * Ns * Nc * Nc * 2 * precision, 1)
+    else:
+        record = _scidacRecordXML(f"QDP_{prec}3_ColorMatrix", precision, 1, Nc * Nc * 2 * precision, 1)
+    writeLIME(
+        filename,
+        [
+            [
+                ("scidac-private-file-xml", _scidacFileXML(latt_size)),
+                ("scidac-file-xml", file_xml),
+            ],
+            [
+                ("scidac-private-record-xml", record),
+                ("scidac-record-xml", record_xml),
+                ("scidac-binary-data", propagator_raw),
+                ("scidac-checksum", _scidacChecksumXML(checksum)),
+            ],
+        ],
+    )
@@ -0,0 +1,223 @@
+import json
+import lzma
+import math
+from os import path
+import struct
+from typing import List, Sequence, Tuple
+import zlib
+
+import numpy
+
+from ... import getGridCoord, getGridSize, getLogger, getSublatticeSize
+from .chroma import _localTimeSlices
+from .convert import fileToLattice
+
+Ns, Nc = 4, 3
+_MAGIC = b"PYQUDAZP"
+_VERSION = 1
+
+
+def _mantissaBits(dtype: str, tolerance: float = None) -> int:
+    """Mantissa bits to keep so that rounding has a relative error of at most `tolerance`."""
+    nmant = numpy.finfo(dtype).nmant
+    if tolerance is None:
+        return nmant
+    if not 0 < tolerance < 1:
+        getLogger().critical(f"Tolerance {tolerance} is not in (0, 1)", ValueError)
+    # rounding to nearest with `bits` mantissa bits has a relative error of at most 2**-(bits + 1)
+    return min(nmant, max(0, math.ceil(-math.log2(tolerance)) - 1))
+
+
+def _truncate(data: numpy.ndarray, bits: int):
+    """Round the mantissa of the floats in `data` to `bits` bits in place, zeroing the dropped bits."""
+    drop = numpy.finfo(data.dtype).nmant - bits
+    if drop == 0:
+        return
+    uint = data.view(f"<u{data.itemsize}")
+    utype = uint.dtype.type
+    uint += utype(1 << (drop - 1))
+    uint &= utype((1 << (8 * data.itemsize)) - (1 << drop))
+
+
+def _shuffle(data: numpy.ndarray, itemsize: int) -> bytes:
+    """Group the i-th bytes of all `itemsize`-byte numbers together, which compresses much better for floats."""
+    return numpy.ascontiguousarray(data).view("<u1").reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(raw: bytes, itemsize: int, dtype: str, shape: Sequence[int]) -> numpy.ndarray:
+    data = numpy.frombuffer(raw, "<u1").reshape(itemsize, -1).T
+    return numpy.ascontiguousarray(data).reshape(-1).view(dtype).reshape(shape)
+
+
+def _compress(raw: bytes, compression: str, level: int = None) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(raw, -1 if level is None else level)
+    elif compression == "lzma":
+        return lzma.compress(raw, preset=level)
+    else:
+        getLogger().critical(f"Unknown compression {compression}", ValueError)
+
+
+def _decompress(raw: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(raw)
+    elif compression == "lzma":
+        return lzma.decompress(raw)
+    else:
+        getLogger().critical(f"Unknown compression {compression}", ValueError)
+
+
+def _tableOffset(header_length: int):
+    return (len(_MAGIC) + 8 + header_length + 7) // 8 * 8
+
+
+def _loadHeader(filename: str):
+    with open(filename, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            getLogger().critical(f"{filename} is not a compressed propagator file", ValueError)
+        header_length = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        if header["version"] > _VERSION:
+            getLogger().critical(f"Compressed propagator version {header['version']} is not supported", ValueError)
+        Lx, Ly, Lz, Lt = [L // B for L, B in zip(header["latt_size"], header["block_size"])]
+        f.seek(_tableOffset(header_length))
+        table = numpy.fromfile(f, "<u8", Lt * Lz * Ly * Lx * 3).reshape(Lt, Lz, Ly, Lx, 3)
+    return header, table
+
+
+def readHeader(filename: str) -> Tuple[dict, numpy.ndarray]:
+    """
+    The header of a compressed propagator file and its block table (offset, length, crc32) indexed by the
+    block coordinates (t, z, y, x). The header is read by rank 0 only and broadcast to the other ranks.
+    """
+    from ... import getMPIComm, getMPIRank
+
+    filename = path.expanduser(path.expandvars(filename))
+    header = None
+    if getMPIRank() == 0:
+        try:
+            header = _loadHeader(filename)
+        except Exception as e:
+            # raise the error on every rank instead of leaving the others waiting in bcast
+            header = e
+    header = getMPIComm().bcast(header)
+    if isinstance(header, Exception):
+        raise header
+    return header
+
+
+def _overlap(block: int, block_size: int, coord: int, size: int):
+    """The slices of a block and of the local sublattice covering the same sites along one direction."""
+    start = max(block * block_size, coord * size)
+    stop = min((block + 1) * block_size, (coord + 1) * size)
+    block_start, local_start = block * block_size, coord * size
+    return slice(start - block_start, stop - block_start), slice(start - local_start, stop - local_start)
+
+
+def readPropagator(filename: str, timeslices: Sequence[int] = None, even_odd: bool = False):
+    """
+    Read a compressed propagator. Every rank reads and decompresses only the blocks overlapping its sublattice,
+    the file can be read with a grid different from the one it was written with.
+    """
+    from ... import readMPIFileBytes
+
+    filename = path.expanduser(path.expandvars(filename))
+    header, table = readHeader(filename)
+    latt_size: List[int] = header["latt_size"]
+    site_shape = tuple(header["site_shape"])
+    staggered = site_shape == (Nc, Nc)
+    dtype, compression = header["dtype"], header["compression"]
+    itemsize = numpy.dtype(dtype).itemsize // 2
+    Bx, By, Bz, _ = header["block_size"]
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    gx, gy, gz, gt = getGridCoord()
+
+    if timeslices is None:
+        timeslices = range(gt * Lt, (gt + 1) * Lt)
+    else:
+        timeslices = _localTimeSlices(timeslices, Lt)
+        even_odd = False
+    blocks = [
+        (i, t, bz, by, bx)
+        for i, t in enumerate(timeslices)
+        for bz in range(gz * Lz // Bz, ((gz + 1) * Lz - 1) // Bz + 1)
+        for by in range(gy * Ly // By, ((gy + 1) * Ly - 1) // By + 1)
+        for bx in range(gx * Lx // Bx, ((gx + 1) * Lx - 1) // Bx + 1)
+    ]
+    entries = [table[t, bz, by, bx] for _, t, bz, by, bx in blocks]
+    payloads = readMPIFileBytes(filename, [entry[0] for entry in entries], [entry[1] for entry in entries])
+
+    propagator_raw = numpy.empty((len(timeslices), Lz, Ly, Lx, *site_shape), dtype)
+    for (i, t, bz, by, bx), entry, payload in zip(blocks, entries, payloads):
+        if zlib.crc32(payload) != entry[2]:
+            getLogger().critical(f"Checksum mismatch in block {(t, bz, by, bx)} of {filename}", ValueError)
+        block = _unshuffle(_decompress(payload, compression), itemsize, dtype, (Bz, By, Bx, *site_shape))
+        (block_z, z), (block_y, y), (block_x, x) = [
+            _overlap(*args) for args in [(bz, Bz, gz, Lz), (by, By, gy, Ly), (bx, Bx, gx, Lx)]
+        ]
+        propagator_raw[i, z, y, x] = block[block_z, block_y, block_x]
+    propagator_raw = fileToLattice(propagator_raw, range(propagator_raw.ndim), "<c16", 0, even_odd)
+
+    return latt_size, staggered, propagator_raw
+
+
+def writePropagator(
+    filename: str,
+    propagator: numpy.ndarray,
+    latt_size: List[int],
+    precision: int = 8,
+    compression: str = "zlib",
+    level: int = None,
+    tolerance: float = None,
+):
+    """
+    Write a propagator (Lt, Lz, Ly, Lx, ...) as blocks of one timeslice of the local sublattice, every block
+    byte-shuffled and compressed with `compression` ("zlib" or "lzma") at `level`. With `tolerance` the mantissa
+    of every real number is rounded to the fewest bits giving a relative error of at most `tolerance`, which
+    leaves long runs of zero bits for the compressor.
+    """
+    from ... import getMPIComm, getMPIRank, writeMPIFileBytes
+
+    filename = path.expanduser(path.expandvars(filename))
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    Gx, Gy, Gz, Gt = getGridSize()
+    gx, gy, gz, gt = getGridCoord()
+    dtype, real_dtype = f"<c{2 * precision}", f"<f{precision}"
+    bits = _mantissaBits(real_dtype, tolerance)
+    if compression not in ("zlib", "lzma"):
+        getLogger().critical(f"Unknown compression {compression}", ValueError)
+
+    payloads = []
+    for t in range(Lt):
+        block = propagator[t].astype(dtype)
+        _truncate(block.view(real_dtype), bits)
+        payloads.append(_compress(_shuffle(block, precision), compression, level))
+    layouts = getMPIComm().allgather(((gx, gy, gz, gt), [(len(payload), zlib.crc32(payload)) for payload in payloads]))
+
+    header = {
+        "version": _VERSION,
+        "latt_size": list(latt_size),
+        "site_shape": list(propagator.shape[4:]),
+        "dtype": dtype,
+        "compression": compression,
+        "mantissa_bits": bits,
+        "block_size": [Lx, Ly, Lz, 1],
+    }
+    header_raw = json.dumps(header).encode("utf-8")
+    table_offset = _tableOffset(len(header_raw))
+    table = numpy.zeros((Gt * Lt, Gz, Gy, Gx, 3), "<u8")
+    offset = table_offset + table.nbytes
+    for rank, (coord, blocks) in enumerate(layouts):
+        if rank == getMPIRank():
+            local_offset = offset
+        for t, (length, crc) in enumerate(blocks):
+            table[coord[3] * Lt + t, coord[2], coord[1], coord[0]] = (offset, length, crc)
+            offset += length
+
+    if getMPIRank() == 0:
+        with open(filename, "wb") as f:
+            f.write(_MAGIC + struct.pack("<Q", len(header_raw)) + header_raw)
+            f.write(b"\x00" * (table_offset - f.tell()))
+            f.write(table.tobytes())
+    getMPIComm().Barrier()
+    writeMPIFileBytes(filename, local_offset, b"".join(payloads))
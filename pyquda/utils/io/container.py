@@ -0,0 +1,195 @@
+import json
+from os import path
+import struct
+from typing import Any, Dict, List, Literal
+
+import numpy
+
+from ... import getLogger, getMPIComm, getMPIRank, getSublatticeSize, readMPIFile, writeMPIFile
+from ...field import LatticeInfo, LatticeField, MultiLatticeField, LatticeGauge
+from .checksum import scidac
+from .convert import fileToLattice
+
+_MAGIC = b"PYQUDAFC"
+_VERSION = 1
+_SUPERBLOCK = struct.Struct("<8sQQQ")  # magic, version, index offset, index length
+_ALIGNMENT = 4096
+
+
+def _align(offset: int):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _fieldClass(name: str):
+    from ... import field
+
+    cls = getattr(field, name, None)
+    if not (isinstance(cls, type) and issubclass(cls, LatticeField) and hasattr(cls, "lexico")):
+        getLogger().critical(f"{name} cannot be stored in a FieldContainer", ValueError)
+    return cls
+
+
+def _leadingAxes(field: LatticeField):
+    """Number of axes before (Lt, Lz, Ly, Lx) in `field.lexico()`."""
+    return 1 if isinstance(field, (LatticeGauge, MultiLatticeField)) else 0
+
+
+def _checksum(data: numpy.ndarray, lattice_axis: int):
+    """SciDAC checksum of a lexicographic field with the leading axes moved into the site."""
+    site_axes = [*range(lattice_axis), *range(lattice_axis + 4, data.ndim)]
+    return scidac(data.transpose(*range(lattice_axis, lattice_axis + 4), *site_axes))
+
+
+class FieldContainer:
+    """
+    Many named lattice fields in a single file, e.g. all the propagators and smeared gauge fields of one
+    configuration. The file starts with a superblock (magic, version, index offset, index length), followed by
+    the fields in lexicographic order, each aligned to 4096 bytes, and a JSON index of the entries with their
+    shape, dtype, offset and SciDAC checksum.
+
+    `write` appends a field with one collective write. The payload and the new index are written after the
+    current index, and the superblock is updated last, so an interrupted append leaves the previous entries
+    readable. `read` reads any single entry by name. All methods are collective.
+    """
+
+    def __init__(self, filename: str, mode: Literal["r", "a"] = "r") -> None:
+        self.filename = path.expanduser(path.expandvars(filename))
+        self.mode = mode
+        index = None
+        if getMPIRank() == 0:
+            try:
+                index = self._load()
+            except Exception as e:
+                # raise the error on every rank instead of leaving the others waiting in bcast
+                index = e
+        index = getMPIComm().bcast(index)
+        if isinstance(index, Exception):
+            raise index
+        self.index_offset, self.index_length, self.entries = index
+
+    def _load(self):
+        if not path.exists(self.filename):
+            if self.mode == "r":
+                getLogger().critical(f"{self.filename} does not exist", FileNotFoundError)
+            with open(self.filename, "wb") as f:
+                index_length = self._writeIndex(f, _align(_SUPERBLOCK.size), {})
+            return _align(_SUPERBLOCK.size), index_length, {}
+        with open(self.filename, "rb") as f:
+            magic, version, index_offset, index_length = _SUPERBLOCK.unpack(f.read(_SUPERBLOCK.size))
+            if magic != _MAGIC:
+                getLogger().critical(f"{self.filename} is not a FieldContainer file", ValueError)
+            if version > _VERSION:
+                getLogger().critical(f"FieldContainer version {version} is not supported", ValueError)
+            f.seek(index_offset)
+            entries = json.loads(f.read(index_length).decode("utf-8"))["entries"]
+        return index_offset, index_length, {entry["name"]: entry for entry in entries}
+
+    def _writeIndex(self, f, index_offset: int, entries: Dict[str, Dict[str, Any]]):
+        index = json.dumps({"entries": list(entries.values())}).encode("utf-8")
+        f.seek(index_offset)
+        f.write(index)
+        f.flush()
+        f.seek(0)
+        f.write(_SUPERBLOCK.pack(_MAGIC, _VERSION, index_offset, len(index)))
+        return len(index)
+
+    def keys(self) -> List[str]:
+        """Names of the entries in the order they were written."""
+        return list(self.entries.keys())
+
+    def entry(self, name: str) -> Dict[str, Any]:
+        """Metadata of the entry `name`: field class, lattice, global shape, dtype, offset, length and checksum."""
+        if name not in self.entries:
+            getLogger().critical(f"No entry {name} in {self.filename}", KeyError)
+        return self.entries[name]
+
+    def __contains__(self, name: str):
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def write(self, name: str, field: LatticeField, dtype: str = None):
+        """Append `field` as `name`, stored as `dtype` (the dtype of the field by default)."""
+        if self.mode != "a":
+            getLogger().critical(f"{self.filename} is not opened for appending", RuntimeError)
+        if name in self.entries:
+            getLogger().critical(f"Entry {name} already exists in {self.filename}", ValueError)
+        _fieldClass(field.__class__.__name__)
+        latt_info = field.latt_info
+        lattice_axis = _leadingAxes(field)
+        data = field.lexico()
+        dtype = data.dtype.str if dtype is None else dtype
+        data = data.astype(dtype, copy=False)
+        shape = list(data.shape)
+        shape[lattice_axis : lattice_axis + 4] = latt_info.global_size[::-1]
+        entry = {
+            "name": name,
+            "field": field.__class__.__name__,
+            "latt_size": latt_info.global_size,
+            "t_boundary": latt_info.t_boundary,
+            "anisotropy": latt_info.anisotropy,
+            "dtype": dtype,
+            "shape": shape,
+            "lattice_axis": lattice_axis,
+            "offset": _align(self.index_offset + self.index_length),
+            "nbytes": int(numpy.prod(shape)) * data.itemsize,
+            "checksum": _checksum(data, lattice_axis),
+        }
+
+        axes = tuple(range(lattice_axis + 3, lattice_axis - 1, -1))
+        writeMPIFile(self.filename, dtype, entry["offset"], data.shape, axes, numpy.ascontiguousarray(data))
+        getMPIComm().Barrier()
+        entries = dict(self.entries)
+        entries[name] = entry
+        index_offset = entry["offset"] + entry["nbytes"]
+        index_length = None
+        if getMPIRank() == 0:
+            with open(self.filename, "r+b") as f:
+                index_length = self._writeIndex(f, index_offset, entries)
+        self.index_offset, self.index_length, self.entries = index_offset, getMPIComm().bcast(index_length), entries
+
+    def read(self, name: str, checksum: bool = False) -> LatticeField:
+        """Read the entry `name` as a field of the class it was written as, checking its checksum with `checksum`."""
+        entry = self.entry(name)
+        cls = _fieldClass(entry["field"])
+        latt_info = LatticeInfo(entry["latt_size"], entry["t_boundary"], entry["anisotropy"])
+        lattice_axis = entry["lattice_axis"]
+        data = self._readEntry(entry)
+        if checksum:
+            expected, result = tuple(entry["checksum"]), _checksum(data, lattice_axis)
+            if result != expected:
+                getLogger().critical(
+                    f"Checksum mismatch in entry {name} of {self.filename}: {result[0]:08x} {result[1]:08x} "
+                    f"computed, {expected[0]:08x} {expected[1]:08x} expected",
+                    ValueError,
+                )
+        data = fileToLattice(data, range(data.ndim), entry["dtype"], lattice_axis, True)
+        if issubclass(cls, MultiLatticeField):
+            return cls(latt_info, data.shape[0], data)
+        else:
+            return cls(latt_info, data)
+
+    def _readEntry(self, entry: Dict[str, Any]):
+        lattice_axis = entry["lattice_axis"]
+        shape = list(entry["shape"])
+        shape[lattice_axis : lattice_axis + 4] = getSublatticeSize(entry["latt_size"])[::-1]
+        axes = tuple(range(lattice_axis + 3, lattice_axis - 1, -1))
+        return readMPIFile(self.filename, entry["dtype"], entry["offset"], shape, axes)
+
+    def verify(self) -> List[str]:
+        """Check the checksum of every entry, return the names of the entries which are truncated or corrupted."""
+        size = path.getsize(self.filename)
+        corrupted = []
+        for name, entry in self.entries.items():
+            if entry["offset"] + entry["nbytes"] > size:
+                corrupted.append(name)
+                continue
+            if _checksum(self._readEntry(entry), entry["lattice_axis"]) != tuple(entry["checksum"]):
+                corrupted.append(name)
+        for name in corrupted:
+            getLogger().warning(f"Entry {name} of {self.filename} is corrupted", RuntimeWarning)
+        return corrupted
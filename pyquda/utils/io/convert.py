@@ -0,0 +1,91 @@
+from functools import lru_cache
+import mmap
+from typing import Sequence, Tuple
+
+import numpy
+
+
+@lru_cache(maxsize=None)
+def _evenOddSiteIndex(sublatt_size: Tuple[int, int, int]):
+    """
+    Index maps between the lexicographic site order (z, y, x) and the even-odd site order (eo, z, y, x // 2) of a
+    timeslice, for even and odd t. Same convention as `field.cb2`.
+    """
+    Lz, Ly, Lx = sublatt_size
+    eo, z, y, x = numpy.indices((2, Lz, Ly, Lx // 2))
+    index_cb2 = []
+    index_lexico = []
+    for t in range(2):
+        index = (((z * Ly + y) * Lx + 2 * x + (eo + t + z + y) % 2)).reshape(-1)
+        index_cb2.append(index)
+        index_lexico.append(numpy.empty_like(index))
+        index_lexico[t][index] = numpy.arange(index.size)
+    return index_cb2, index_lexico
+
+
+def _dropPages(data: numpy.ndarray):
+    # unmap the pages of a memory-mapped file read so far, they stay in the page cache but not in this process
+    while isinstance(data, numpy.ndarray):
+        data = data.base
+    if isinstance(data, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+        data.madvise(mmap.MADV_DONTNEED)
+
+
+def fileToLattice(data: numpy.ndarray, axes: Sequence[int], dtype: str, t_axis: int, even_odd: bool = False):
+    """
+    Convert `data` as stored in a file to `data.transpose(axes).astype(dtype)`, with the (Lt, Lz, Ly, Lx) axes
+    starting at `t_axis` after the transpose, and reorder these axes to (2, Lt, Lz, Ly, Lx // 2) if `even_odd`.
+    The byteswap, promotion, transpose and even-odd reordering are done in one pass, one timeslice at a time,
+    so the only full-size allocation is the result. If `data` is a view of a memory-mapped file (see
+    `mapMPIFile`), only the pages of one timeslice are resident at a time.
+    """
+    lattice = data.transpose(axes)
+    shape = lattice.shape
+    Lt, Lz, Ly, Lx = shape[t_axis : t_axis + 4]
+    pre, suf = shape[:t_axis], shape[t_axis + 4 :]
+    prefix = (slice(None),) * t_axis
+    if not even_odd:
+        ret = numpy.empty(shape, dtype)
+        for t in range(Lt):
+            ret[prefix + (t,)] = lattice[prefix + (t,)]
+            _dropPages(data)
+        return ret
+
+    index_cb2, _ = _evenOddSiteIndex((Lz, Ly, Lx))
+    # gather the sites straight from the (z, y, x) axes, a reshape of a strided timeslice would copy it first
+    index_zyx = [numpy.unravel_index(index_cb2[t], (Lz, Ly, Lx)) for t in range(2)]
+    ret = numpy.empty((*pre, 2, Lt, Lz, Ly, Lx // 2, *suf), dtype)
+    for t in range(Lt):
+        ret[prefix + (slice(None), t)] = lattice[prefix + (t, *index_zyx[t % 2])].reshape(
+            *pre, 2, Lz, Ly, Lx // 2, *suf
+        )
+        _dropPages(data)
+    return ret
+
+
+def latticeToFile(data: numpy.ndarray, axes: Sequence[int], dtype: str, t_axis: int, even_odd: bool = False):
+    """
+    The inverse of `fileToLattice`, return the contiguous array `file` in `dtype` such that
+    `file.transpose(axes)` is `data`, with `data` in the even-odd order if `even_odd`.
+    """
+    shape = data.shape
+    if even_odd:
+        shape = (*shape[:t_axis], *shape[t_axis + 1 : t_axis + 4], 2 * shape[t_axis + 4], *shape[t_axis + 5 :])
+    Lt, Lz, Ly, Lx = shape[t_axis : t_axis + 4]
+    pre, suf = shape[:t_axis], shape[t_axis + 4 :]
+    prefix = (slice(None),) * t_axis
+    file_shape = [0] * len(shape)
+    for i, axis in enumerate(axes):
+        file_shape[axis] = shape[i]
+    ret = numpy.empty(file_shape, dtype)
+    lattice = ret.transpose(axes)
+    if not even_odd:
+        for t in range(Lt):
+            lattice[prefix + (t,)] = data[prefix + (t,)]
+        return ret
+
+    _, index_lexico = _evenOddSiteIndex((Lz, Ly, Lx))
+    for t in range(Lt):
+        sites = data[prefix + (slice(None), t)].reshape(*pre, Lz * Ly * Lx, *suf)
+        lattice[prefix + (t,)] = numpy.take(sites, index_lexico[t % 2], t_axis).reshape(*pre, Lz, Ly, Lx, *suf)
+    return ret
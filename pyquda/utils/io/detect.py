@@ -0,0 +1,77 @@
+import os
+from os import path
+import struct
+from typing import Dict, List, Tuple
+
+from .lime import LimeIndex
+
+Nd, Ns, Nc = 4, 4, 3
+
+_FORMAT_MEMO: Dict[str, Tuple[Tuple[float, int], str]] = {}
+
+
+def _sniff(filename: str):
+    """Format of a file from its first bytes, "raw" for a headerless file."""
+    stat = os.stat(filename)
+    key = (stat.st_mtime, stat.st_size)
+    if filename in _FORMAT_MEMO and _FORMAT_MEMO[filename][0] == key:
+        return _FORMAT_MEMO[filename][1]
+    with open(filename, "rb") as f:
+        magic = f.read(8)
+    if magic.startswith(b"\x45\x67\x89\xAB\x00\x01"):
+        format = "lime"
+    elif len(magic) >= 4 and 20103 in (struct.unpack("<i", magic[:4])[0], struct.unpack(">i", magic[:4])[0]):
+        format = "milc"
+    elif magic == b"PYQUDAZP":
+        format = "compressed"
+    elif magic == b"PYQUDAFC":
+        format = "container"
+    else:
+        format = "raw"
+    _FORMAT_MEMO[filename] = (key, format)
+    return format
+
+
+def detectFormat(filename: str, latt_size: List[int] = None) -> str:
+    """
+    Format of a gauge or propagator file: "chroma_qio", "milc_qio", "milc", "compressed", "container", "kyu" or
+    "kyu_single". The magic bytes are read by rank 0 only and the result is broadcast to the other ranks. It is
+    reused while the mtime and size of the file do not change, and the record table of a LIME file is kept by
+    `LimeIndex` for the reader. A headerless file is recognized as KYU by its size, which needs `latt_size`.
+    """
+    from ... import getLogger, getMPIComm, getMPIRank
+
+    filename = path.expanduser(path.expandvars(filename))
+    format = None
+    if getMPIRank() == 0:
+        try:
+            format = _sniff(filename)
+        except Exception as e:
+            # raise the error on every rank instead of leaving the others waiting in bcast
+            format = e
+    format = getMPIComm().bcast(format)
+    if isinstance(format, Exception):
+        raise format
+
+    if format == "lime":
+        index = LimeIndex(filename)
+        if "ildg-binary-data" in index:
+            return "chroma_qio"
+        elif len(index.find("scidac-binary-data")) == 1:
+            return "chroma_qio"
+        elif len(index.find("scidac-binary-data")) > 1:
+            return "milc_qio"
+        getLogger().critical(f"Unknown LIME records in {filename}", ValueError)
+    elif format == "raw":
+        if latt_size is None:
+            getLogger().critical(f"Cannot detect the format of {filename} without latt_size", ValueError)
+        volume = latt_size[0] * latt_size[1] * latt_size[2] * latt_size[3]
+        size = path.getsize(filename)
+        if size == volume * Nd * Nc * Nc * 2 * 8:
+            return "kyu"
+        elif size == volume * Ns * Ns * Nc * Nc * 2 * 8:
+            return "kyu"
+        elif size == volume * Ns * Ns * Nc * Nc * 2 * 4:
+            return "kyu_single"
+        getLogger().critical(f"Cannot detect the format of {filename} with {size} bytes", ValueError)
+    return format
@@ -1,14 +1,15 @@
 import io
 from os import path
 import struct
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from xml.etree import ElementTree as ET
 
 import numpy
 
 from ...field import cb2
+from .convert import fileToLattice
 
-Nc = 3
+Ns, Nc = 4, 3
 
 
 def _readStr(f: io.BufferedReader) -> str:
@@ -31,46 +32,182 @@ def _readVersion(f: io.BufferedReader) -> int:
     return struct.unpack(">i", f.read(4))[0]
 
 
-def readTimeSlice(filename: str, Ne: int = None):
+def _readMap(filename: str):
+    """Parse the header and the key map on rank 0 and broadcast them."""
+    from ... import getMPIComm, getMPIRank
+
+    index = None
+    if getMPIRank() == 0:
+        with open(filename, "rb") as f:
+            offsets: Dict[Tuple[int], int] = {}
+            assert _readStr(f) == "XXXXQDPLazyDiskMapObjFileXXXX"
+            assert _readVersion(f) == 1
+            user_data = _readStr(f)
+            f.seek(_readPos(f))
+            num_records = struct.unpack(">I", f.read(4))[0]
+            for _ in range(num_records):
+                key = _readTuple(f)
+                val = _readPos(f)
+                offsets[key] = val
+        index = (user_data, offsets)
+    user_data, offsets = getMPIComm().bcast(index)
+    return ET.ElementTree(ET.fromstring(user_data)), offsets
+
+
+def readTimeSlice(filename: str, Ne: int = None, eigenvectors: List[int] = None, timeslices: List[int] = None):
+    """
+    Read the timeslice eigenvectors (t, e) of the 3D Laplacian. Only `eigenvectors` (default the first `Ne`) are
+    read, and only on `timeslices` (default all of them) if given, the other timeslices are left zero.
+    """
     filename = path.expanduser(path.expandvars(filename))
-    with open(filename, "rb") as f:
-        offsets: Dict[Tuple[int], int] = {}
-        assert _readStr(f) == "XXXXQDPLazyDiskMapObjFileXXXX"
-        assert _readVersion(f) == 1
-        format = ET.ElementTree(ET.fromstring(_readStr(f)))
-        f.seek(_readPos(f))
-        num_records = struct.unpack(">I", f.read(4))[0]
-        for _ in range(num_records):
-            key = _readTuple(f)
-            val = _readPos(f)
-            offsets[key] = val
+    format, offsets = _readMap(filename)
     precision = 32
     binary_dtype = f">c{2*precision//8}"
     ndarray_dtype = f"<c{2*precision//8}"
     latt_size = [int(x) for x in format.find("lattSize").text.split()]
-    if Ne is None:
-        Ne = int(format.find("num_vecs").text)
-
-    from ... import getGridSize, getGridCoord, getSublatticeSize
-
-    Gx, Gy, Gz, Gt = getGridSize()
-    gx, gy, gz, gt = getGridCoord()
-    sublatt_size = getSublatticeSize(latt_size)
-    Lx, Ly, Lz, Lt = sublatt_size
-
-    eigen_raw = numpy.zeros((Ne, Lt, Lz, Ly, Lx, Nc), ndarray_dtype)
-    for e in range(Ne):
-        for t in range(Lt):
-            eigen_raw[e, t] = (
-                numpy.fromfile(
-                    filename, binary_dtype, count=Gz * Lz * Gy * Ly * Gx * Lx * Nc, offset=offsets[(t + gt * Lt, e)]
-                )
-                .reshape(Gz * Lz, Gy * Ly, Gx * Lx, Nc)[
-                    gz * Lz : (gz + 1) * Lz,
-                    gy * Ly : (gy + 1) * Ly,
-                    gx * Lx : (gx + 1) * Lx,
-                ]
-                .astype(ndarray_dtype)
-            )
+    if eigenvectors is None:
+        eigenvectors = range(int(format.find("num_vecs").text) if Ne is None else Ne)
+
+    from ... import getGridSize, getGridCoord, getSublatticeSize, mapMPIFile
+
+    Gt = getGridSize()[3]
+    gt = getGridCoord()[3]
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    if timeslices is None:
+        timeslices = range(Gt * Lt)
+    timeslices = [t - gt * Lt for t in timeslices if gt * Lt <= t < (gt + 1) * Lt]
+
+    offset = [offsets[(t + gt * Lt, e)] for e in eigenvectors for t in timeslices]
+    eigen = mapMPIFile(filename, binary_dtype, offset, (Lz, Ly, Lx, Nc), (2, 1, 0))
+    eigen = eigen.reshape(len(eigenvectors), len(timeslices), Lz, Ly, Lx, Nc)
+    if timeslices == list(range(Lt)):
+        return fileToLattice(eigen, range(eigen.ndim), ndarray_dtype, 1, True)
+    eigen_raw = numpy.zeros((len(eigenvectors), Lt, Lz, Ly, Lx, Nc), ndarray_dtype)
+    eigen_raw[:, timeslices] = eigen
 
     return cb2(eigen_raw, [1, 2, 3, 4])
+
+
+def _writeStr(f: io.BufferedWriter, value: str):
+    value = value.encode("utf-8")
+    f.write(struct.pack(">i", len(value)))
+    f.write(value)
+
+
+def _writeTuple(f: io.BufferedWriter, value: Tuple[int]):
+    f.write(struct.pack(">i", 4 * len(value)))
+    f.write(struct.pack(">" + "i" * len(value), *value))
+
+
+def _writePos(f: io.BufferedWriter, value: int):
+    f.write(struct.pack(">qq", 0, value))
+
+
+def _isStaggered(format: ET.ElementTree) -> bool:
+    # files without <spins> are Wilson-like, as written by Chroma
+    spins = format.find("spins")
+    return spins is not None and int(spins.text) == 1
+
+
+def readDiracHeader(filename: str):
+    """
+    The lattice size, whether the eigenvectors are staggered, their number and the gauge checksum (None if absent)
+    of an eigenpair file.
+    """
+    filename = path.expanduser(path.expandvars(filename))
+    format, _ = _readMap(filename)
+    latt_size = [int(x) for x in format.find("lattSize").text.split()]
+    staggered = _isStaggered(format)
+    num_vecs = int(format.find("num_vecs").text)
+    gauge_checksum = format.find("gauge_checksum")
+    return latt_size, staggered, num_vecs, gauge_checksum.text if gauge_checksum is not None else None
+
+
+def readDirac(filename: str, Ne: int = None, even_odd: bool = False):
+    """
+    Read eigenpairs of a Dirac operator, one 4D fermion record per key (e,) in the QDP lazy disk map layout.
+    Staggered eigenvectors, with <spins>1</spins> in the metadata, have no spin axis.
+    """
+    filename = path.expanduser(path.expandvars(filename))
+    format, offsets = _readMap(filename)
+    binary_dtype = ">c8"
+    latt_size = [int(x) for x in format.find("lattSize").text.split()]
+    staggered = _isStaggered(format)
+    site_shape = (Ns, Nc) if not staggered else (Nc,)
+    num_vecs = int(format.find("num_vecs").text)
+    if Ne is None:
+        Ne = num_vecs
+    elif Ne > num_vecs:
+        raise ValueError(f"{filename} holds {num_vecs} < {Ne} eigenvectors")
+    eigenvalue = numpy.array([float(x) for x in format.find("evals").text.split()][:Ne], "<f8")
+
+    from ... import getSublatticeSize, mapMPIFile
+
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    offset = [offsets[(e,)] for e in range(Ne)]
+    eigenvector_raw = mapMPIFile(filename, binary_dtype, offset, (Lt, Lz, Ly, Lx, *site_shape), (3, 2, 1, 0))
+    eigenvector_raw = fileToLattice(eigenvector_raw, range(eigenvector_raw.ndim), "<c16", 1, even_odd)
+
+    return latt_size, staggered, eigenvalue, eigenvector_raw
+
+
+def writeDirac(
+    filename: str,
+    eigenvalue: numpy.ndarray,
+    eigenvector_raw: numpy.ndarray,
+    latt_size: List[int],
+    gauge_checksum: str = None,
+):
+    """
+    Write eigenpairs like `readDirac` reads them, along with the checksum of their gauge field if given.
+    `eigenvector_raw` has shape (Ne, Lt, Lz, Ly, Lx, Ns, Nc), or (Ne, Lt, Lz, Ly, Lx, Nc) if staggered.
+    """
+    filename = path.expanduser(path.expandvars(filename))
+    binary_dtype = ">c8"
+    Ne = len(eigenvalue)
+    GLx, GLy, GLz, GLt = latt_size
+    site_shape = eigenvector_raw.shape[5:]
+    spins = Ns if site_shape == (Ns, Nc) else 1
+
+    from ... import getMPIComm, getMPIRank, getSublatticeSize, writeMPIFile
+
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+    gauge_checksum_xml = f"<gauge_checksum>{gauge_checksum}</gauge_checksum>" if gauge_checksum is not None else ""
+    user_data = (
+        "<?xml version='1.0' encoding='UTF-8'?>\n"
+        "<MODMetaData>"
+        "<id>eigenVecsDirac</id>"
+        f"<lattSize>{GLx} {GLy} {GLz} {GLt}</lattSize>"
+        f"<spins>{spins}</spins>"
+        f"<num_vecs>{Ne}</num_vecs>"
+        f"<evals>{' '.join([repr(float(x)) for x in eigenvalue])}</evals>"
+        f"{gauge_checksum_xml}"
+        "</MODMetaData>"
+    )
+    record_size = GLt * GLz * GLy * GLx * spins * Nc * numpy.dtype(binary_dtype).itemsize
+    # str(magic) + version + str(user_data) + pos(map)
+    offset = (4 + 29) + 4 + (4 + len(user_data.encode("utf-8"))) + 16
+    if getMPIRank() == 0:
+        with open(filename, "wb") as f:
+            _writeStr(f, "XXXXQDPLazyDiskMapObjFileXXXX")
+            f.write(struct.pack(">i", 1))
+            _writeStr(f, user_data)
+            _writePos(f, offset + Ne * record_size)
+    getMPIComm().Barrier()
+    writeMPIFile(
+        filename,
+        binary_dtype,
+        offset,
+        (Ne, Lt, Lz, Ly, Lx, *site_shape),
+        (4, 3, 2, 1),
+        eigenvector_raw.astype(binary_dtype),
+    )
+    getMPIComm().Barrier()
+    if getMPIRank() == 0:
+        with open(filename, "r+b") as f:
+            f.seek(offset + Ne * record_size)
+            f.write(struct.pack(">I", Ne))
+            for e in range(Ne):
+                _writeTuple(f, (e,))
+                _writePos(f, offset + e * record_size)
+    getMPIComm().Barrier()
@@ -1,24 +1,21 @@
 from os import path
-from typing import List
+from typing import List, Sequence
 
 import numpy
 
-from ... import getSublatticeSize, readMPIFile, writeMPIFile
+from ... import getGridSize, getSublatticeSize, mapMPIFile, writeMPIFile
+from .chroma import _localTimeSlices, _timeSliceOffsets
+from .convert import fileToLattice, latticeToFile
 
 Nd, Ns, Nc = 4, 4, 3
 
 
-def fromGaugeFile(filename: str, offset: int, dtype: str, sublatt_size: List[int]):
+def fromGaugeFile(filename: str, offset: int, dtype: str, sublatt_size: List[int], even_odd: bool = False):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    gauge_raw = readMPIFile(filename, dtype, offset, (Nd, Nc, Nc, 2, Lt, Lz, Ly, Lx), (7, 6, 5, 4))
-    gauge_raw = (
-        gauge_raw.transpose(0, 4, 5, 6, 7, 2, 1, 3)
-        .astype("<f8")
-        .copy()
-        .reshape(Nd, Lt, Lz, Ly, Lx, Nc, Nc * 2)
-        .view("<c16")
-    )
+    gauge_raw = mapMPIFile(filename, dtype, offset, (Nd, Nc, Nc, 2, Lt, Lz, Ly, Lx), (7, 6, 5, 4))
+    gauge_raw = fileToLattice(gauge_raw, (0, 4, 5, 6, 7, 2, 1, 3), "<f8", 1, even_odd)
+    gauge_raw = gauge_raw.reshape(*gauge_raw.shape[:-3], Nc, Nc * 2).view("<c16")
 
     return gauge_raw
 
@@ -26,20 +23,15 @@ def fromGaugeFile(filename: str, offset: int, dtype: str, sublatt_size: List[int
 def toGaugeFile(filename: str, offset: int, gauge_raw: numpy.ndarray, dtype: str, sublatt_size: List[int]):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    gauge_raw = (
-        gauge_raw.view("<f8")
-        .reshape(Nd, Lt, Lz, Ly, Lx, Nc, Nc, 2)
-        .astype(dtype)
-        .transpose(0, 6, 5, 7, 1, 2, 3, 4)
-        .copy()
-    )
+    gauge_raw = gauge_raw.view("<f8").reshape(Nd, Lt, Lz, Ly, Lx, Nc, Nc, 2)
+    gauge_raw = latticeToFile(gauge_raw, (0, 4, 5, 6, 7, 2, 1, 3), dtype, 1)
     writeMPIFile(filename, dtype, offset, (Nd, Nc, Nc, 2, Lt, Lz, Ly, Lx), (7, 6, 5, 4), gauge_raw)
 
 
-def readGauge(filename: str, latt_size: List[int]):
+def readGauge(filename: str, latt_size: List[int], even_odd: bool = False):
     filename = path.expanduser(path.expandvars(filename))
     sublatt_size = getSublatticeSize(latt_size)
-    gauge_raw = fromGaugeFile(filename, 0, ">f8", sublatt_size)
+    gauge_raw = fromGaugeFile(filename, 0, ">f8", sublatt_size, even_odd)
     return gauge_raw
 
 
@@ -49,17 +41,35 @@ def writeGauge(filename: str, gauge_raw: numpy.ndarray, latt_size: List[int]):
     toGaugeFile(filename, 0, gauge_raw, ">f8", sublatt_size)
 
 
-def fromPropagatorFile(filename: str, offset: int, dtype: str, sublatt_size: List[int]):
+def fromPropagatorFile(
+    filename: str,
+    offset: int,
+    dtype: str,
+    sublatt_size: List[int],
+    timeslices: Sequence[int] = None,
+    even_odd: bool = False,
+):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    propagator_raw = readMPIFile(filename, dtype, offset, (Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx), (8, 7, 6, 5))
-    propagator_raw = (
-        propagator_raw.transpose(5, 6, 7, 8, 3, 0, 4, 1, 2)
-        .astype("<f8")
-        .copy()
-        .reshape(Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc * 2)
-        .view("<c16")
-    )
+    if timeslices is None:
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx), (8, 7, 6, 5))
+    else:
+        # the file is Ns * Nc * 2 * Ns * Nc blocks of (Lt, Lz, Ly, Lx), read the local timeslices of every block
+        Gx, Gy, Gz, Gt = getGridSize()
+        itemsize = numpy.dtype(dtype).itemsize
+        block_bytes = Gt * Lt * Gz * Lz * Gy * Ly * Gx * Lx * itemsize
+        timeslices = _localTimeSlices(timeslices, Lt)
+        offset = [
+            timeslice_offset
+            for block in range(Ns * Nc * 2 * Ns * Nc)
+            for timeslice_offset in _timeSliceOffsets(offset + block * block_bytes, timeslices, sublatt_size, itemsize)
+        ]
+        Lt = len(timeslices)
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lz, Ly, Lx), (2, 1, 0))
+        propagator_raw = propagator_raw.reshape(Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx)
+        even_odd = False
+    propagator_raw = fileToLattice(propagator_raw, (5, 6, 7, 8, 3, 0, 4, 1, 2), "<f8", 0, even_odd)
+    propagator_raw = propagator_raw.reshape(*propagator_raw.shape[:-3], Nc, Nc * 2).view("<c16")
 
     return propagator_raw
 
@@ -67,20 +77,17 @@ def fromPropagatorFile(filename: str, offset: int, dtype: str, sublatt_size: Lis
 def toPropagatorFile(filename: str, offset: int, propagator_raw: numpy.ndarray, dtype: str, sublatt_size: List[int]):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    propagator_raw = (
-        propagator_raw.view("<f8")
-        .reshape(Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc, 2)
-        .astype(dtype)
-        .transpose(5, 7, 8, 4, 6, 0, 1, 2, 3)
-        .copy()
-    )
+    propagator_raw = propagator_raw.view("<f8").reshape(Lt, Lz, Ly, Lx, Ns, Ns, Nc, Nc, 2)
+    propagator_raw = latticeToFile(propagator_raw, (5, 6, 7, 8, 3, 0, 4, 1, 2), dtype, 0)
     writeMPIFile(filename, dtype, offset, (Ns, Nc, 2, Ns, Nc, Lt, Lz, Ly, Lx), (8, 7, 6, 5), propagator_raw)
 
 
-def readPropagator(filename: str, latt_size: List[int]):
+def readPropagator(
+    filename: str, latt_size: List[int], timeslices: Sequence[int] = None, even_odd: bool = False
+):
     filename = path.expanduser(path.expandvars(filename))
     sublatt_size = getSublatticeSize(latt_size)
-    propagator_raw = fromPropagatorFile(filename, 0, ">f8", sublatt_size)
+    propagator_raw = fromPropagatorFile(filename, 0, ">f8", sublatt_size, timeslices, even_odd)
     return propagator_raw
 
 
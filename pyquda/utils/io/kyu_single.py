@@ -1,18 +1,45 @@
 from os import path
-from typing import List
+from typing import List, Sequence
 
 import numpy
 
-from ... import getSublatticeSize, readMPIFile, writeMPIFile
+from ... import getGridSize, getSublatticeSize, mapMPIFile, readMPIFile, writeMPIFile
+from .chroma import _localTimeSlices, _timeSliceOffsets
+from .convert import fileToLattice, latticeToFile
 
 Ns, Nc = 4, 3
 
 
-def fromPropagatorFile(filename: str, offset: int, dtype: str, sublatt_size: List[int]):
+def fromPropagatorFile(
+    filename: str,
+    offset: int,
+    dtype: str,
+    sublatt_size: List[int],
+    timeslices: Sequence[int] = None,
+    even_odd: bool = False,
+):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    propagator_raw = readMPIFile(filename, dtype, offset, (Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc), (5, 4, 3, 2))
-    propagator_raw = propagator_raw.transpose(2, 3, 4, 5, 6, 0, 7, 1).astype("<c16")
+    if timeslices is None:
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc), (5, 4, 3, 2))
+    else:
+        # the file is Ns * Nc blocks of (Lt, Lz, Ly, Lx, Ns, Nc), read the local timeslices of every block
+        Gx, Gy, Gz, Gt = getGridSize()
+        site_bytes = Ns * Nc * numpy.dtype(dtype).itemsize
+        block_bytes = Gt * Lt * Gz * Lz * Gy * Ly * Gx * Lx * site_bytes
+        timeslices = _localTimeSlices(timeslices, Lt)
+        offset = [
+            timeslice_offset
+            for block in range(Ns * Nc)
+            for timeslice_offset in _timeSliceOffsets(
+                offset + block * block_bytes, timeslices, sublatt_size, site_bytes
+            )
+        ]
+        Lt = len(timeslices)
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lz, Ly, Lx, Ns, Nc), (2, 1, 0))
+        propagator_raw = propagator_raw.reshape(Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc)
+        even_odd = False
+    propagator_raw = fileToLattice(propagator_raw, (2, 3, 4, 5, 6, 0, 7, 1), "<c16", 0, even_odd)
 
     return propagator_raw
 
@@ -20,14 +47,16 @@ def fromPropagatorFile(filename: str, offset: int, dtype: str, sublatt_size: Lis
 def toPropagatorFile(filename: str, offset: int, propagator_raw: numpy.ndarray, dtype: str, sublatt_size: List[int]):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    propagator_raw = propagator_raw.astype(dtype).transpose(5, 7, 0, 1, 2, 3, 4, 6).copy()
+    propagator_raw = latticeToFile(propagator_raw, (2, 3, 4, 5, 6, 0, 7, 1), dtype, 0)
     writeMPIFile(filename, dtype, offset, (Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc), (5, 4, 3, 2), propagator_raw)
 
 
-def readPropagator(filename: str, latt_size: List[int]):
+def readPropagator(
+    filename: str, latt_size: List[int], timeslices: Sequence[int] = None, even_odd: bool = False
+):
     filename = path.expanduser(path.expandvars(filename))
     sublatt_size = getSublatticeSize(latt_size)
-    propagator_raw = fromPropagatorFile(filename, 0, "<c8", sublatt_size)
+    propagator_raw = fromPropagatorFile(filename, 0, "<c8", sublatt_size, timeslices, even_odd)
     return propagator_raw
 
 
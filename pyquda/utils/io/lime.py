@@ -0,0 +1,156 @@
+import io
+import json
+import os
+from os import path
+import struct
+from typing import Dict, List, Tuple, Union
+from xml.etree import ElementTree as ET
+
+import numpy
+
+_INDEX_CACHE: bool = False
+_INDEX_MEMO: Dict[str, Tuple[Tuple[float, int], List[Tuple[str, int, int, str]]]] = {}
+
+
+def setIndexCache(enabled: bool):
+    """Store the record table of every LIME file read in a sidecar file `<filename>.index.json`."""
+    global _INDEX_CACHE
+    _INDEX_CACHE = enabled
+
+
+def _scan(filename: str):
+    records: List[Tuple[str, int, int, str]] = []
+    with open(filename, "rb") as f:
+        buffer = f.read(8)
+        while buffer != b"" and buffer != b"\x0A":
+            assert buffer.startswith(b"\x45\x67\x89\xAB\x00\x01")
+            length = struct.unpack(">Q", f.read(8))[0]
+            name = f.read(128).strip(b"\x00").decode("utf-8")
+            offset = f.tell()
+            xml = None if "binary" in name else f.read(length).strip(b"\x00").decode("utf-8")
+            records.append((name, offset, length, xml))
+            f.seek(offset + (length + 7) // 8 * 8, io.SEEK_SET)
+            buffer = f.read(8)
+    return records
+
+
+class LimeIndex:
+    """
+    Record table (name, offset, length) of a LIME file along with the content of every non-binary record.
+    The headers are parsed by rank 0 only and the table is broadcast to the other ranks. The table is reused
+    while the mtime and size of the file do not change, from memory or from the sidecar file with `cache`.
+    """
+
+    def __init__(self, filename: str, cache: bool = None) -> None:
+        from ... import getMPIComm, getMPIRank
+
+        self.filename = path.expanduser(path.expandvars(filename))
+        cache = _INDEX_CACHE if cache is None else cache
+        records = None
+        if getMPIRank() == 0:
+            try:
+                records = self._load(cache)
+            except Exception as e:
+                # raise the error on every rank instead of leaving the others waiting in bcast
+                records = e
+        records = getMPIComm().bcast(records)
+        if isinstance(records, Exception):
+            raise records
+        self.records: List[Tuple[str, int, int, str]] = records
+
+    def _load(self, cache: bool):
+        stat = os.stat(self.filename)
+        key = (stat.st_mtime, stat.st_size)
+        records = None
+        if self.filename in _INDEX_MEMO and _INDEX_MEMO[self.filename][0] == key:
+            records = _INDEX_MEMO[self.filename][1]
+        elif cache:
+            records = self._loadSidecar(key)
+        if records is None:
+            records = _scan(self.filename)
+            if cache:
+                self._saveSidecar(key, records)
+        _INDEX_MEMO[self.filename] = (key, records)
+        return records
+
+    @property
+    def sidecar(self):
+        return f"{self.filename}.index.json"
+
+    def _loadSidecar(self, key: Tuple[float, int]):
+        if not path.exists(self.sidecar):
+            return None
+        with open(self.sidecar) as f:
+            index = json.load(f)
+        if (index["mtime"], index["size"]) != key:
+            return None
+        return [tuple(record) for record in index["records"]]
+
+    def _saveSidecar(self, key: Tuple[float, int], records: List[Tuple[str, int, int, str]]):
+        from ... import getLogger
+
+        try:
+            with open(self.sidecar, "w") as f:
+                json.dump({"mtime": key[0], "size": key[1], "records": records}, f)
+        except OSError as e:
+            getLogger().warning(f"Cannot write the LIME index {self.sidecar}: {e}", RuntimeWarning)
+
+    def __contains__(self, name: str):
+        return any(record[0] == name for record in self.records)
+
+    def find(self, name: str) -> List[Tuple[int, int]]:
+        """(offset, length) of every record named `name`, in file order."""
+        return [(offset, length) for record_name, offset, length, _ in self.records if record_name == name]
+
+    def offset(self, name: str, index: int = 0) -> int:
+        return self.find(name)[index][0]
+
+    def xml(self, name: str, index: int = 0) -> ET.ElementTree:
+        xmls = [xml for record_name, _, _, xml in self.records if record_name == name]
+        return ET.ElementTree(ET.fromstring(xmls[index]))
+
+    def checksum(self, index: int = 0) -> Tuple[int, int]:
+        scidac_checksum = self.xml("scidac-checksum", index)
+        return int(scidac_checksum.find("suma").text, 16), int(scidac_checksum.find("sumb").text, 16)
+
+
+def _limeRecord(name: str, length: int, begin: bool, end: bool):
+    flags = (0x8000 if begin else 0) | (0x4000 if end else 0)
+    return struct.pack(">IHHQ128s", 0x456789AB, 1, flags, length, name.encode("utf-8"))
+
+
+def _limePadding(length: int):
+    return b"\x00" * ((length + 7) // 8 * 8 - length)
+
+
+def writeLIME(filename: str, messages: List[List[Tuple[str, Union[str, numpy.ndarray]]]]):
+    """
+    Write LIME messages, each a list of (name, record) pairs. A str record is XML written by rank 0, an ndarray
+    record is the local sublattice (Lt, Lz, Ly, Lx, ...) in file order and is written collectively.
+    """
+    from ... import getGridSize, getMPIComm, getMPIRank, writeMPIFile
+
+    _INDEX_MEMO.pop(filename, None)
+    offsets = None
+    if getMPIRank() == 0:
+        offsets = []
+        with open(filename, "wb") as f:
+            for message in messages:
+                for i, (name, record) in enumerate(message):
+                    begin, end = i == 0, i == len(message) - 1
+                    if isinstance(record, str):
+                        data = record.encode("utf-8") + b"\x00"
+                        f.write(_limeRecord(name, len(data), begin, end))
+                        f.write(data + _limePadding(len(data)))
+                    else:
+                        Lt, Lz, Ly, Lx = [G * L for G, L in zip(getGridSize()[::-1], record.shape[:4])]
+                        length = Lt * Lz * Ly * Lx * int(numpy.prod(record.shape[4:])) * record.itemsize
+                        f.write(_limeRecord(name, length, begin, end))
+                        offsets.append(f.tell())
+                        f.seek(length, io.SEEK_CUR)
+                        f.write(_limePadding(length))
+    offsets = getMPIComm().bcast(offsets)
+    binaries = [record for message in messages for _, record in message if not isinstance(record, str)]
+    for offset, binary in zip(offsets, binaries):
+        writeMPIFile(filename, binary.dtype.str, offset, binary.shape, (3, 2, 1, 0), numpy.ascontiguousarray(binary))
+    getMPIComm().Barrier()
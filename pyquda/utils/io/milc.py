@@ -1,27 +1,40 @@
-import io
 from os import path
 import struct
-from typing import Dict, List, Tuple
-from xml.etree import ElementTree as ET
+from time import localtime, strftime
+from typing import List, Sequence, Tuple
 
 import numpy
 
-from ... import getSublatticeSize, readMPIFile
+from ... import getSublatticeSize, mapMPIFile, writeMPIFile
+from .checksum import milc, scidac, verify
+from .convert import fileToLattice, latticeToFile
+from .chroma import _checkTimeSlices, _localTimeSlices, _timeSliceOffsets
+from .chroma import _scidacChecksumXML, _scidacFileXML, _scidacRecordXML
+from .lime import LimeIndex, writeLIME
 
 Nd, Ns, Nc = 4, 4, 3
 _precision_map = {"D": 8, "F": 4, "S": 4}
 
 
-def fromGaugeFile(filename: str, offset: int, dtype: str, sublatt_size: List[int]):
+def fromGaugeFile(
+    filename: str,
+    offset: int,
+    dtype: str,
+    sublatt_size: List[int],
+    checksum: Tuple[int, int] = None,
+    even_odd: bool = False,
+):
     Lx, Ly, Lz, Lt = sublatt_size
 
-    gauge_raw = readMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0))
-    gauge_raw = gauge_raw.transpose(4, 0, 1, 2, 3, 5, 6).astype("<c16")
+    gauge_raw = mapMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0))
+    if checksum is not None:
+        verify("milc", gauge_raw, checksum, filename)
+    gauge_raw = fileToLattice(gauge_raw, (4, 0, 1, 2, 3, 5, 6), "<c16", 1, even_odd)
 
     return gauge_raw
 
 
-def readGauge(filename: str):
+def readGauge(filename: str, checksum: bool = False, even_odd: bool = False):
     filename = path.expanduser(path.expandvars(filename))
     with open(filename, "rb") as f:
         magic = f.read(4)
@@ -36,59 +49,64 @@ def readGauge(filename: str):
         sum29, sum31 = struct.unpack(f"{endian}II", f.read(8))
         offset = f.tell()
     sublatt_size = getSublatticeSize(latt_size)
-    gauge_raw = fromGaugeFile(filename, offset, f"{endian}c8", sublatt_size)
+    checksum = (sum29, sum31) if checksum else None
+    gauge_raw = fromGaugeFile(filename, offset, f"{endian}c8", sublatt_size, checksum, even_odd)
     return latt_size, gauge_raw
 
 
 def fromMultiSCIDACPropagatorFile(
-    filename: str, offset: List[int], dtype: str, sublatt_size: List[int], staggered: bool
+    filename: str,
+    offset: List[int],
+    dtype: str,
+    sublatt_size: List[int],
+    staggered: bool,
+    checksum: List[Tuple[int, int]] = None,
+    timeslices: Sequence[int] = None,
+    even_odd: bool = False,
 ):
     Lx, Ly, Lz, Lt = sublatt_size
-
+    site_shape = (Ns, Nc) if not staggered else (Nc,)
+
+    # all the records are read in one collective call
+    if timeslices is None:
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lt, Lz, Ly, Lx, *site_shape), (3, 2, 1, 0))
+        if checksum is not None:
+            for record in range(len(offset)):
+                verify("scidac", propagator_raw[record], checksum[record], filename)
+    else:
+        site_bytes = int(numpy.prod(site_shape)) * numpy.dtype(dtype).itemsize
+        timeslices = _localTimeSlices(timeslices, Lt)
+        offset = [
+            timeslice_offset
+            for record_offset in offset
+            for timeslice_offset in _timeSliceOffsets(record_offset, timeslices, sublatt_size, site_bytes)
+        ]
+        propagator_raw = mapMPIFile(filename, dtype, offset, (Lz, Ly, Lx, *site_shape), (2, 1, 0))
+        Lt = len(timeslices)
+        even_odd = False
     if not staggered:
-        propagator_raw = numpy.empty((Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc), dtype)
-        for spin in range(Ns):
-            for color in range(Nc):
-                propagator_raw[spin, color] = readMPIFile(
-                    filename, dtype, offset[spin * Nc + color], (Lt, Lz, Ly, Lx, Ns, Nc), (3, 2, 1, 0)
-                )
-        propagator_raw = propagator_raw.transpose(2, 3, 4, 5, 6, 0, 7, 1).astype("<c16")
+        propagator_raw = propagator_raw.reshape(Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc)
+        propagator_raw = fileToLattice(propagator_raw, (2, 3, 4, 5, 6, 0, 7, 1), "<c16", 0, even_odd)
     else:
-        propagator_raw = numpy.empty((Nc, Lt, Lz, Ly, Lx, Nc), dtype)
-        for color in range(Nc):
-            propagator_raw[color] = readMPIFile(filename, dtype, offset[color], (Lt, Lz, Ly, Lx, Nc), (3, 2, 1, 0))
-        propagator_raw = propagator_raw.transpose(1, 2, 3, 4, 5, 0).astype("<c16")
+        propagator_raw = propagator_raw.reshape(Nc, Lt, Lz, Ly, Lx, Nc)
+        propagator_raw = fileToLattice(propagator_raw, (1, 2, 3, 4, 5, 0), "<c16", 0, even_odd)
 
     return propagator_raw
 
 
-def readQIOPropagator(filename: str):
+def readQIOPropagator(
+    filename: str, checksum: bool = False, timeslices: Sequence[int] = None, even_odd: bool = False
+):
+    """`timeslices` and `even_odd` as in `chroma.readQIOPropagator`."""
     filename = path.expanduser(path.expandvars(filename))
-    with open(filename, "rb") as f:
-        meta: Dict[str, List[Tuple[int, int]]] = {}
-        buffer = f.read(8)
-        while buffer != b"" and buffer != b"\x0A":
-            assert buffer.startswith(b"\x45\x67\x89\xAB\x00\x01")
-            length = (struct.unpack(">Q", f.read(8))[0] + 7) // 8 * 8
-            name = f.read(128).strip(b"\x00").decode("utf-8")
-            if name not in meta:
-                meta[name] = [(f.tell(), length)]
-            else:
-                meta[name].append((f.tell(), length))
-            f.seek(length, io.SEEK_CUR)
-            buffer = f.read(8)
-
-        f.seek(meta["scidac-private-file-xml"][0][0])
-        scidac_private_file_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-file-xml"][0][1]).strip(b"\x00").decode("utf-8"))
-        )
-        f.seek(meta["scidac-private-record-xml"][1][0])
-        scidac_private_record_xml = ET.ElementTree(
-            ET.fromstring(f.read(meta["scidac-private-record-xml"][1][1]).strip(b"\x00").decode("utf-8"))
-        )
-        offset = []
-        for meta_scidac_binary_data in meta["scidac-binary-data"][1::2]:
-            offset.append(meta_scidac_binary_data[0])
+    _checkTimeSlices(checksum, timeslices, filename)
+    index = LimeIndex(filename)
+    scidac_private_file_xml = index.xml("scidac-private-file-xml")
+    scidac_private_record_xml = index.xml("scidac-private-record-xml", 1)
+    offset = [offset for offset, _ in index.find("scidac-binary-data")[1::2]]
+    scidac_checksum = None
+    if checksum:
+        scidac_checksum = [index.checksum(i) for i in range(1, len(index.find("scidac-checksum")), 2)]
     precision = _precision_map[scidac_private_record_xml.find("precision").text]
     assert int(scidac_private_record_xml.find("colors").text) == Nc
     if scidac_private_record_xml.find("spins") is not None:
@@ -104,5 +122,81 @@ def readQIOPropagator(filename: str):
     assert int(scidac_private_file_xml.find("spacetime").text) == Nd
     latt_size = [int(L) for L in scidac_private_file_xml.find("dims").text.split()]
     sublatt_size = getSublatticeSize(latt_size)
-    propagator_raw = fromMultiSCIDACPropagatorFile(filename, offset, f">c{2*precision}", sublatt_size, staggered)
+    propagator_raw = fromMultiSCIDACPropagatorFile(
+        filename, offset, f">c{2*precision}", sublatt_size, staggered, scidac_checksum, timeslices, even_odd
+    )
     return latt_size, staggered, propagator_raw
+
+
+def writeGauge(filename: str, latt_size: List[int], gauge_raw: numpy.ndarray):
+    from ... import getMPIComm, getMPIRank
+
+    filename = path.expanduser(path.expandvars(filename))
+    Lx, Ly, Lz, Lt = getSublatticeSize(latt_size)
+
+    gauge_raw = latticeToFile(gauge_raw, (4, 0, 1, 2, 3, 5, 6), "<c8", 1)
+    sum29, sum31 = milc(gauge_raw)
+    if getMPIRank() == 0:
+        with open(filename, "wb") as f:
+            f.write(struct.pack("<i", 20103))
+            f.write(struct.pack("<iiii", *latt_size))
+            f.write(strftime("%a %b %d %H:%M:%S %Y", localtime()).encode().ljust(64, b"\x00"))
+            f.write(struct.pack("<i", 0))
+            f.write(struct.pack("<II", sum29, sum31))
+    getMPIComm().Barrier()
+    writeMPIFile(filename, "<c8", 4 + 16 + 64 + 4 + 8, (Lt, Lz, Ly, Lx, Nd, Nc, Nc), (3, 2, 1, 0), gauge_raw)
+
+
+def _usqcdRecordXML(info: str, precision: int, staggered: bool):
+    prec = "D" if precision == 8 else "F"
+    if not staggered:
+        record = _scidacRecordXML(f"USQCD_{prec}3_DiracFermion", precision, Ns, Ns * Nc * 2 * precision, 1)
+    else:
+        record = _scidacRecordXML(f"USQCD_{prec}3_ColorVector", precision, None, Nc * 2 * precision, 1)
+    return record, f'<?xml version="1.0" encoding="UTF-8"?><{info}><version>1.0</version></{info}>'
+
+
+def writeQIOPropagator(
+    filename: str,
+    latt_size: List[int],
+    staggered: bool,
+    propagator_raw: numpy.ndarray,
+    source_raw: numpy.ndarray = None,
+    precision: int = 4,
+    file_xml: str = '<?xml version="1.0" encoding="UTF-8"?><usqcdPropFile><version>1.0</version></usqcdPropFile>',
+):
+    """
+    Write one source record and one solution record per source spin and color, like MILC. `source_raw` has the
+    layout of `propagator_raw`, the source records are written as zero fields without it.
+    """
+    filename = path.expanduser(path.expandvars(filename))
+
+    if not staggered:
+        # (Ns, Nc, Lt, Lz, Ly, Lx, Ns, Nc) in the file with the source indices first
+        axes = (2, 3, 4, 5, 6, 0, 7, 1)
+        num_src = Ns * Nc
+    else:
+        # (Nc, Lt, Lz, Ly, Lx, Nc) in the file
+        axes = (1, 2, 3, 4, 5, 0)
+        num_src = Nc
+    dtype = f">c{2 * precision}"
+    shape = propagator_raw.shape[:4]
+    propagator_raw = latticeToFile(propagator_raw, axes, dtype, 0).reshape(num_src, *shape, -1)
+    if source_raw is not None:
+        source_raw = latticeToFile(source_raw, axes, dtype, 0).reshape(num_src, *shape, -1)
+    else:
+        source_raw = numpy.zeros_like(propagator_raw)
+
+    messages = [[("scidac-private-file-xml", _scidacFileXML(latt_size)), ("scidac-file-xml", file_xml)]]
+    for i in range(num_src):
+        for info, data in (("usqcdSourceInfo", source_raw[i]), ("usqcdPropInfo", propagator_raw[i])):
+            record, record_xml = _usqcdRecordXML(info, precision, staggered)
+            messages.append(
+                [
+                    ("scidac-private-record-xml", record),
+                    ("scidac-record-xml", record_xml),
+                    ("scidac-binary-data", data),
+                    ("scidac-checksum", _scidacChecksumXML(scidac(data))),
+                ]
+            )
+    writeLIME(filename, messages)
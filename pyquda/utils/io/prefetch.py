@@ -0,0 +1,119 @@
+from collections import deque
+import threading
+from typing import Any, Callable, Deque, Iterable, List, Tuple
+
+import numpy
+
+
+def _nbytes(result: Any) -> int:
+    if isinstance(result, numpy.ndarray):
+        return result.nbytes
+    elif isinstance(result, (tuple, list)):
+        return sum(_nbytes(item) for item in result)
+    else:
+        return 0
+
+
+class Prefetcher:
+    """
+    Iterate over `read(filename)` for every file in `filenames`, reading up to `depth` files ahead in a background
+    thread. The background thread stops reading ahead while the files already read take `max_bytes` or more.
+    Results are yielded in order and an exception raised by `read` is raised again by the consumer.
+
+    `read` runs collective MPI-IO on a duplicate of the PyQUDA communicator, so it must only use `getMPIComm()`
+    and must not touch the GPU. It has to be called with the same files in the same order on every rank.
+    Without MPI.THREAD_MULTIPLE the files are read synchronously.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[str], Any],
+        filenames: Iterable[str],
+        depth: int = 1,
+        max_bytes: int = None,
+    ) -> None:
+        from mpi4py import MPI
+        from ... import getLogger, getMPIComm
+
+        self.read = read
+        self.filenames: List[str] = list(filenames)
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.ready: Deque[Tuple[Any, BaseException]] = deque()
+        self.ready_bytes = 0
+        self.consumed = 0
+        self.cond = threading.Condition()
+        self.stopped = False
+        self.thread = None
+        if depth > 0 and MPI.Query_thread() < MPI.THREAD_MULTIPLE:
+            getLogger().warning(
+                "MPI is not initialized with MPI.THREAD_MULTIPLE, prefetching is disabled", RuntimeWarning
+            )
+            self.depth = 0
+        if self.depth > 0:
+            self.comm = getMPIComm().Dup()
+            self.thread = threading.Thread(target=self._worker, name="pyquda-prefetch", daemon=True)
+            self.thread.start()
+
+    def _ahead(self, index: int):
+        # Depends only on the number of files consumed, which is the same on every rank once the consumer stops,
+        # so all ranks agree on which collective reads are started.
+        if index - self.consumed >= self.depth:
+            return False
+        # always allow one file ahead so a single file larger than max_bytes still overlaps
+        return self.max_bytes is None or index == self.consumed or self.ready_bytes < self.max_bytes
+
+    def _worker(self):
+        from ... import _MPI_THREAD
+
+        _MPI_THREAD.comm = self.comm
+        for index, filename in enumerate(self.filenames):
+            with self.cond:
+                self.cond.wait_for(lambda: self.stopped or self._ahead(index))
+                if not self._ahead(index):
+                    break
+            try:
+                result, error = self.read(filename), None
+            except BaseException as e:
+                result, error = None, e
+            with self.cond:
+                self.ready.append((result, error))
+                self.ready_bytes += _nbytes(result)
+                self.cond.notify_all()
+            if error is not None:
+                break
+        del _MPI_THREAD.comm
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def __iter__(self):
+        try:
+            for filename in self.filenames:
+                if self.thread is None:
+                    yield self.read(filename)
+                    continue
+                with self.cond:
+                    self.cond.wait_for(lambda: len(self.ready) > 0)
+                    result, error = self.ready.popleft()
+                    self.ready_bytes -= _nbytes(result)
+                    self.consumed += 1
+                    self.cond.notify_all()
+                if error is not None:
+                    raise error
+                yield result
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop reading ahead and wait for the reads already started, then drop the files not consumed."""
+        if self.thread is None:
+            return
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join()
+        self.thread = None
+        self.ready.clear()
+        self.ready_bytes = 0
+        self.comm.Free()
@@ -0,0 +1,168 @@
+import atexit
+from collections import deque
+import threading
+from typing import Callable, Deque, Dict, List, Tuple, Union
+import weakref
+
+import numpy
+
+from ...field import LatticePropagator, LatticeStaggeredPropagator
+
+_WRITERS: "weakref.WeakSet[PropagatorWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _closeWriters():
+    for writer in list(_WRITERS):
+        writer.close()
+
+
+def _pinnedEmpty(location: str, shape: Tuple[int, ...], dtype):
+    if location == "cupy":
+        import cupyx
+
+        return cupyx.empty_pinned(shape, dtype)
+    elif location == "torch":
+        import torch
+
+        return torch.empty(shape, dtype=dtype, pin_memory=True)
+    else:
+        return numpy.empty(shape, dtype)
+
+
+class PropagatorWriter:
+    """
+    Write-behind queue for `write(filename, propagator)`, any of the propagator writers of `pyquda.utils.io`.
+    `put` copies the propagator to page-locked host memory and returns, the basis rotation, the reordering and
+    the collective write run in a background thread on a duplicate of the PyQUDA communicator. `put` blocks
+    while `max_pending` propagators are waiting to be written. An exception raised by `write` is raised again
+    by the next `put`, `flush` or `close`. Writers which are still open are closed at interpreter exit.
+
+    `put` has to be called with the same files in the same order on every rank. Without MPI.THREAD_MULTIPLE the
+    propagators are written synchronously.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, Union[LatticePropagator, LatticeStaggeredPropagator]], None],
+        max_pending: int = 1,
+    ) -> None:
+        from mpi4py import MPI
+        from ... import getLogger, getMPIComm
+
+        self.write = write
+        self.max_pending = max_pending
+        self.pending: Deque[Tuple[str, Union[LatticePropagator, LatticeStaggeredPropagator]]] = deque()
+        self.buffers: Dict[Tuple[str, Tuple[int, ...], str], List] = {}
+        self.writing = False
+        self.error: BaseException = None
+        self.cond = threading.Condition()
+        self.stopped = False
+        self.thread = None
+        if max_pending > 0 and MPI.Query_thread() < MPI.THREAD_MULTIPLE:
+            getLogger().warning(
+                "MPI is not initialized with MPI.THREAD_MULTIPLE, writing synchronously", RuntimeWarning
+            )
+            self.max_pending = 0
+        if self.max_pending > 0:
+            self.comm = getMPIComm().Dup()
+            self.thread = threading.Thread(target=self._worker, name="pyquda-writer", daemon=True)
+            self.thread.start()
+            _WRITERS.add(self)
+
+    def _snapshot(self, propagator: Union[LatticePropagator, LatticeStaggeredPropagator]):
+        location = propagator.location
+        key = (location, tuple(propagator.data.shape), str(propagator.data.dtype))
+        with self.cond:
+            free = self.buffers.setdefault(key, [])
+            buffer = free.pop() if free else None
+        if buffer is None:
+            buffer = _pinnedEmpty(location, key[1], propagator.data.dtype)
+        if location == "cupy":
+            propagator.data.get(out=buffer)
+            host = buffer
+        elif location == "torch":
+            buffer.copy_(propagator.data)
+            host = buffer.numpy()
+        else:
+            numpy.copyto(buffer, propagator.data)
+            host = buffer
+        return key, buffer, propagator.__class__(propagator.latt_info, host)
+
+    def _worker(self):
+        from ... import _MPI_THREAD
+
+        _MPI_THREAD.comm = self.comm
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.stopped or len(self.pending) > 0)
+                if len(self.pending) == 0:
+                    break
+                filename, (key, buffer, propagator) = self.pending[0]
+                self.writing = True
+            try:
+                self.write(filename, propagator)
+            except BaseException as e:
+                error = e
+            else:
+                error = None
+            with self.cond:
+                self.pending.popleft()
+                self.buffers[key].append(buffer)
+                self.writing = False
+                if error is not None:
+                    # drop the remaining writes, every rank sees the same error from the collective write
+                    self.error = error
+                    self.pending.clear()
+                self.cond.notify_all()
+        del _MPI_THREAD.comm
+
+    def _raise(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def put(self, filename: str, propagator: Union[LatticePropagator, LatticeStaggeredPropagator]):
+        """Queue `propagator` to be written to `filename`, the propagator can be modified once this returns."""
+        if self.thread is None:
+            if self.stopped:
+                from ... import getLogger
+
+                getLogger().critical("PropagatorWriter is closed", RuntimeError)
+            return self.write(filename, propagator)
+        with self.cond:
+            self.cond.wait_for(lambda: self.error is not None or len(self.pending) < self.max_pending)
+            self._raise()
+        snapshot = self._snapshot(propagator)
+        with self.cond:
+            self.pending.append((filename, snapshot))
+            self.cond.notify_all()
+
+    def flush(self):
+        """Wait until all the queued propagators are written."""
+        if self.thread is None:
+            return
+        with self.cond:
+            self.cond.wait_for(lambda: len(self.pending) == 0 and not self.writing)
+            self._raise()
+
+    def close(self):
+        """Write all the queued propagators and stop the background thread."""
+        if self.thread is None:
+            self.stopped = True
+            return
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join()
+        self.thread = None
+        self.buffers.clear()
+        self.comm.Free()
+        _WRITERS.discard(self)
+        self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
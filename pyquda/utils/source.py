@@ -14,11 +14,26 @@ from ..field import (
 )
 
 
-def point(latt_info: LatticeInfo, t_srce: List[int], spin: int, color: int):
+def _fermion(
+    latt_info: LatticeInfo, spin: int, out: Union[LatticeFermion, LatticeStaggeredFermion] = None
+) -> Union[LatticeFermion, LatticeStaggeredFermion]:
+    if out is None:
+        return LatticeFermion(latt_info) if spin is not None else LatticeStaggeredFermion(latt_info)
+    out.data[:] = 0
+    return out
+
+
+def point(
+    latt_info: LatticeInfo,
+    t_srce: List[int],
+    spin: int,
+    color: int,
+    out: Union[LatticeFermion, LatticeStaggeredFermion] = None,
+):
     Lx, Ly, Lz, Lt = latt_info.size
     gx, gy, gz, gt = latt_info.grid_coord
     x, y, z, t = t_srce
-    b = LatticeFermion(latt_info) if spin is not None else LatticeStaggeredFermion(latt_info)
+    b = _fermion(latt_info, spin, out)
     if (
         gx * Lx <= x < (gx + 1) * Lx
         and gy * Ly <= y < (gy + 1) * Ly
@@ -34,11 +49,17 @@ def point(latt_info: LatticeInfo, t_srce: List[int], spin: int, color: int):
     return b
 
 
-def wall(latt_info: LatticeInfo, t_srce: int, spin: int, color: int):
+def wall(
+    latt_info: LatticeInfo,
+    t_srce: int,
+    spin: int,
+    color: int,
+    out: Union[LatticeFermion, LatticeStaggeredFermion] = None,
+):
     Lt = latt_info.Lt
     gt = latt_info.gt
     t = t_srce
-    b = LatticeFermion(latt_info) if spin is not None else LatticeStaggeredFermion(latt_info)
+    b = _fermion(latt_info, spin, out)
     if gt * Lt <= t < (gt + 1) * Lt:
         if spin is not None:
             b.data[:, t - gt * Lt, :, :, :, spin, color] = 1
@@ -48,11 +69,18 @@ def wall(latt_info: LatticeInfo, t_srce: int, spin: int, color: int):
     return b
 
 
-def momentum(latt_info: LatticeInfo, t_srce: int, spin: int, color: int, phase):
+def momentum(
+    latt_info: LatticeInfo,
+    t_srce: int,
+    spin: int,
+    color: int,
+    phase,
+    out: Union[LatticeFermion, LatticeStaggeredFermion] = None,
+):
     Lt = latt_info.Lt
     gt = latt_info.gt
     t = t_srce
-    b = LatticeFermion(latt_info) if spin is not None else LatticeStaggeredFermion(latt_info)
+    b = _fermion(latt_info, spin, out)
     if gt * Lt <= t < (gt + 1) * Lt:
         if spin is not None:
             b.data[:, t - gt * Lt, :, :, :, spin, color] = phase[:, t - gt * Lt, :, :, :]
@@ -153,11 +181,17 @@ def _gaussian1(latt_info: LatticeInfo, t_srce: List[int], spin: int, color: int,
     return b
 
 
-def colorvector(latt_info: LatticeInfo, t_srce: int, spin: int, phase):
+def colorvector(
+    latt_info: LatticeInfo,
+    t_srce: int,
+    spin: int,
+    phase,
+    out: Union[LatticeFermion, LatticeStaggeredFermion] = None,
+):
     Lt = latt_info.Lt
     gt = latt_info.gt
     t = t_srce
-    b = LatticeFermion(latt_info) if spin is not None else LatticeStaggeredFermion(latt_info)
+    b = _fermion(latt_info, spin, out)
     if gt * Lt <= t < (gt + 1) * Lt:
         if spin is not None:
             b.data[:, t - gt * Lt, :, :, :, spin, :] = phase[:, t - gt * Lt, :, :, :]
@@ -174,6 +208,7 @@ def source(
     spin: int,
     color: int,
     source_phase=None,
+    out: Union[LatticeFermion, LatticeStaggeredFermion] = None,
 ):
     if isinstance(latt_info, LatticeInfo):
         pass
@@ -189,13 +224,13 @@ def source(
         latt_info = LatticeInfo([Lx, Ly, Lz, Lt])
 
     if source_type.lower() == "point":
-        return point(latt_info, t_srce, spin, color)
+        return point(latt_info, t_srce, spin, color, out)
     elif source_type.lower() == "wall":
-        return wall(latt_info, t_srce, spin, color)
+        return wall(latt_info, t_srce, spin, color, out)
     elif source_type.lower() == "momentum":
-        return momentum(latt_info, t_srce, spin, color, source_phase)
+        return momentum(latt_info, t_srce, spin, color, source_phase, out)
     elif source_type.lower() == "colorvector":
-        return colorvector(latt_info, t_srce, spin, source_phase)
+        return colorvector(latt_info, t_srce, spin, source_phase, out)
     else:
         getLogger().critical(f"{source_type} source is not implemented yet", NotImplementedError)
 
@@ -0,0 +1,30 @@
+from check_pyquda import weak_field
+
+from pyquda import core, init
+from pyquda.utils import io
+
+xi_0, nu = 2.464, 0.95
+kappa = 0.115
+mass = 1 / (2 * kappa) - 4
+coeff = 1.17
+coeff_r, coeff_t = 0.91, 1.07
+
+init([1, 1, 1, 1], [4, 4, 4, 8], -1, xi_0 / nu, resource_path=".cache")
+
+dslash = core.getDefaultDirac(mass, 1e-12, 1000, xi_0, coeff_t, coeff_r)
+gauge = io.readQIOGauge(weak_field)
+dslash.loadGauge(gauge)
+dslash.setChrono(0, 12)
+
+# Nearby sources start from the minimal residual extrapolation of the previous solutions
+core.invert(dslash, "point", [0, 0, 0, 0])
+core.invert(dslash, "point", [0, 0, 0, 1])
+stats = dslash.chrono.stats()
+print(stats)
+assert stats["solves"] == 24 and stats["iter_warm"] < stats["iter_cold"]
+
+# A new gauge field flushes the history
+dslash.loadGauge(gauge)
+assert dslash.chrono.size == 0
+
+dslash.destroy()
@@ -0,0 +1,23 @@
+import numpy as np
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+propagator = LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16"))
+io.writeCompressedPropagator(".cache/propagator.zp", propagator)
+propagator_read = io.readCompressedPropagator(".cache/propagator.zp")
+assert np.array_equal(propagator_read.data, propagator.data)
+
+for compression in ["zlib", "lzma"]:
+    io.writeCompressedPropagator(".cache/propagator.zp", propagator, 4, compression, tolerance=1e-4)
+    propagator_read = io.readCompressedPropagator(".cache/propagator.zp")
+    assert np.all(np.abs(propagator_read.data.real - propagator.data.real) <= 1e-4 * np.abs(propagator.data.real))
+    assert np.all(np.abs(propagator_read.data.imag - propagator.data.imag) <= 1e-4 * np.abs(propagator.data.imag))
+
+timeslices = io.readCompressedPropagator(".cache/propagator.zp", [1, 5])
+assert np.array_equal(timeslices, propagator_read.lexico()[[1, 5]])
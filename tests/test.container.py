@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+
+from pyquda import init, core
+from pyquda.field import LatticeGauge, LatticePropagator, MultiLatticeFermion
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+fields = {
+    "gauge": LatticeGauge(latt_info, np.random.random((4, 2, Lt, Lz, Ly, Lx // 2, 3, 3)).astype("<c16")),
+    "propagator": LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16")),
+    "eigenvector": MultiLatticeFermion(
+        latt_info, 4, np.random.random((4, 2, Lt, Lz, Ly, Lx // 2, 4, 3)).astype("<c16")
+    ),
+}
+if os.path.exists(".cache/fields.pqfc"):
+    os.remove(".cache/fields.pqfc")
+container = io.FieldContainer(".cache/fields.pqfc", "a")
+for name, field in fields.items():
+    container.write(name, field)
+container.write("propagator_single", fields["propagator"], "<c8")
+
+container = io.FieldContainer(".cache/fields.pqfc")
+assert container.keys() == ["gauge", "propagator", "eigenvector", "propagator_single"]
+for name, field in fields.items():
+    field_read = container.read(name, checksum=True)
+    assert field_read.__class__ == field.__class__
+    assert np.array_equal(field_read.data, field.data)
+assert np.allclose(container.read("propagator_single").data, fields["propagator"].data, atol=1e-6)
+assert container.verify() == []
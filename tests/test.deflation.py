@@ -0,0 +1,48 @@
+from time import perf_counter
+
+import cupy as cp
+
+from check_pyquda import weak_field
+
+from pyquda import core, init
+from pyquda.utils import io
+
+xi_0, nu = 2.464, 0.95
+kappa = 0.115
+mass = 1 / (2 * kappa) - 4
+coeff = 1.17
+coeff_r, coeff_t = 0.91, 1.07
+
+init([1, 1, 1, 1], [4, 4, 4, 8], -1, xi_0 / nu, resource_path=".cache")
+
+gauge = io.readQIOGauge(weak_field)
+dslash = core.getDefaultDirac(mass, 1e-12, 1000, xi_0, coeff_t, coeff_r)
+dslash.loadGauge(gauge)
+
+propag = core.invert(dslash, "point", [0, 0, 0, 0])
+
+# The first pass computes the eigenpairs and saves them, the second one loads them.
+for _ in range(2):
+    s = perf_counter()
+    eigenvalue = dslash.deflate(32, path=".cache/deflation.mod")
+    print(f"Deflate: {perf_counter() - s:.3f} secs")
+    print(eigenvalue)
+    propag_deflated = core.invert(dslash, "point", [0, 0, 0, 0])
+    print(cp.linalg.norm(propag_deflated.data - propag.data) / cp.linalg.norm(propag.data))
+
+eigenvalue, eigenvector = io.readDiracEigenvector(".cache/deflation.mod")
+eigenvector.toDevice()
+print(cp.linalg.norm(eigenvector.data - dslash.deflation.eigenvector.data))
+try:
+    io.readDiracEigenvector(".cache/deflation.mod", 64)
+except ValueError as e:
+    print(f"Rejected {e}")
+else:
+    raise AssertionError("too many eigenvectors not rejected")
+
+# Another gauge field does not match the saved eigenpairs, they are computed again
+dslash.loadGauge(gauge * 0.99)
+eigenvalue_new = dslash.deflate(32, path=".cache/deflation.mod")
+print(eigenvalue_new - eigenvalue)
+
+dslash.destroy()
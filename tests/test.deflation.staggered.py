@@ -0,0 +1,35 @@
+import os
+
+import cupy as cp
+
+from check_pyquda import weak_field
+
+from pyquda import core, init
+from pyquda.field import MultiLatticeStaggeredFermion
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, resource_path=".cache")
+
+mass = 0.0102
+
+dslash = core.getDefaultStaggeredDirac(mass, 1e-12, 1000, 1.0, 0.0)
+gauge = io.readQIOGauge(weak_field)
+dslash.loadGauge(gauge)
+
+propagator = core.invertStaggered(dslash, "point", [0, 0, 0, 0])
+
+# The first pass computes the eigenpairs and saves them without the spin axis, the second one loads them.
+if os.path.exists(".cache/deflation.staggered.mod"):
+    os.remove(".cache/deflation.staggered.mod")
+for _ in range(2):
+    eigenvalue = dslash.deflate(16, path=".cache/deflation.staggered.mod")
+    print(eigenvalue)
+    propagator_deflated = core.invertStaggered(dslash, "point", [0, 0, 0, 0])
+    print(cp.linalg.norm(propagator_deflated.data - propagator.data) / cp.linalg.norm(propagator.data))
+
+eigenvalue_read, eigenvector = io.readDiracEigenvector(".cache/deflation.staggered.mod")
+assert isinstance(eigenvector, MultiLatticeStaggeredFermion)
+eigenvector.toDevice()
+print(cp.linalg.norm(eigenvector.data - dslash.deflation.eigenvector.data))
+
+dslash.destroy()
@@ -0,0 +1,43 @@
+import numpy as np
+
+from check_pyquda import weak_field
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, backend="numpy", resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+gauge = io.readChromaQIOGauge(weak_field)
+io.writeMILCGauge(".cache/weak_field.milc", gauge)
+io.writeKYUGauge(".cache/weak_field.kyu", gauge)
+assert io.detectFormat(weak_field) == "chroma_qio"
+assert io.detectFormat(".cache/weak_field.milc") == "milc"
+assert io.detectFormat(".cache/weak_field.kyu", latt_info.global_size) == "kyu"
+for filename in [weak_field, ".cache/weak_field.milc", ".cache/weak_field.kyu"]:
+    gauge_read = io.readGauge(filename, latt_info.global_size)
+    assert np.allclose(gauge_read.data, gauge.data)
+
+filenames = [weak_field, ".cache/weak_field.milc", ".cache/weak_field.kyu"]
+for gauge_read in io.readGauge(filenames, latt_info.global_size, depth=2):
+    assert np.allclose(gauge_read.data, gauge.data)
+
+propagator = LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16"))
+io.writeChromaQIOPropagator(".cache/propagator.lime", propagator)
+io.writeMILCQIOPropagator(".cache/propagator.milc", propagator, precision=8)
+io.writeKYUPropagator(".cache/propagator.kyu", propagator)
+io.writeKYUPropagatorF(".cache/propagator.kyu_single", propagator)
+io.writeCompressedPropagator(".cache/propagator.zp", propagator)
+formats = {
+    ".cache/propagator.lime": "chroma_qio",
+    ".cache/propagator.milc": "milc_qio",
+    ".cache/propagator.kyu": "kyu",
+    ".cache/propagator.kyu_single": "kyu_single",
+    ".cache/propagator.zp": "compressed",
+}
+for filename, format in formats.items():
+    assert io.detectFormat(filename, latt_info.global_size) == format
+for propagator_read in io.readPropagator(list(formats.keys()), latt_info.global_size):
+    assert np.allclose(propagator_read.data, propagator.data, atol=1e-6)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from check_pyquda import weak_field
+
+from pyquda import init, core
+from pyquda.field import LatticeGauge, LatticePropagator, MultiLatticeFermion
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, backend="numpy", resource_path=".cache")
+latt_info = core.getDefaultLattice()
+
+gauge = io.readQIOGauge(weak_field)
+assert np.shares_memory(np.asarray(gauge), gauge.data)
+assert np.shares_memory(np.from_dlpack(gauge), gauge.data)
+assert not np.shares_memory(np.array(gauge, copy=True), gauge.data)
+print(gauge.__dlpack_device__())
+
+gauge_shared = LatticeGauge.from_dlpack(latt_info, gauge)
+gauge_shared.data[0, 0, 0, 0, 0, 0] = 0
+print(np.linalg.norm(gauge.data[0, 0, 0, 0, 0, 0]))
+
+data = np.zeros((2, 8, 4, 4, 2, 4, 4, 3, 3), "<c16")
+propagator = LatticePropagator.from_dlpack(latt_info, data)
+propagator.data[:] = 1
+print(np.linalg.norm(data - 1))
+
+data = np.zeros((4, 2, 8, 4, 4, 2, 4, 3), "<c8")
+fermion = MultiLatticeFermion.from_dlpack(latt_info, 4, data)
+fermion[1].data[:] = 1
+print(fermion.dtype, np.linalg.norm(data[1] - 1), np.linalg.norm(data[0]))
@@ -0,0 +1,23 @@
+import numpy as np
+import cupy as cp
+
+from check_pyquda import weak_field
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, resource_path=".cache")
+latt_info = core.getDefaultLattice()
+
+gauge = io.readQIOGauge(weak_field)
+gauge_lexico = core.lexico(gauge.getHost(), [1, 2, 3, 4, 5])
+print(np.linalg.norm(gauge.lexico() - gauge_lexico))
+print(cp.linalg.norm(gauge.lexico("cupy") - cp.asarray(gauge_lexico)))
+print(np.linalg.norm(core.cb2(gauge_lexico, [1, 2, 3, 4]) - gauge.getHost()))
+print(cp.linalg.norm(core.cb2(cp.asarray(gauge_lexico), [1, 2, 3, 4]) - gauge.data))
+
+propagator = LatticePropagator(latt_info, cp.random.random((2, 8, 4, 4, 2, 4, 4, 3, 3)).astype("<c16"))
+propagator_lexico = core.lexico(propagator.getHost(), [0, 1, 2, 3, 4])
+print(np.linalg.norm(propagator.lexico() - propagator_lexico))
+print(cp.linalg.norm(propagator.lexico("cupy") - cp.asarray(propagator_lexico)))
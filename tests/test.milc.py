@@ -0,0 +1,26 @@
+import numpy as np
+
+from check_pyquda import weak_field
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator, LatticeStaggeredPropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, backend="numpy", resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+gauge = io.readChromaQIOGauge(weak_field)
+io.writeMILCGauge(".cache/weak_field.milc", gauge)
+gauge_write = io.readMILCGauge(".cache/weak_field.milc", checksum=True)
+print(np.linalg.norm(gauge.data - gauge_write.data))
+
+propagator = LatticeStaggeredPropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 3, 3)).astype("<c16"))
+io.writeMILCQIOPropagator(".cache/staggered_propagator.milc", propagator, precision=8)
+propagator_write = io.readMILCQIOPropagator(".cache/staggered_propagator.milc", checksum=True)
+assert np.array_equal(propagator.data, propagator_write.data)
+
+propagator = LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16"))
+io.writeMILCQIOPropagator(".cache/propagator.milc", propagator)
+propagator_write = io.readMILCQIOPropagator(".cache/propagator.milc", checksum=True)
+print(np.linalg.norm(propagator.data - propagator_write.data))
@@ -0,0 +1,48 @@
+import os
+import shutil
+from time import perf_counter
+
+import cupy as cp
+
+from check_pyquda import weak_field
+
+from pyquda import core, init
+from pyquda.dirac import Multigrid
+from pyquda.utils import io
+
+xi_0, nu = 2.464, 0.95
+kappa = 0.115
+mass = 1 / (2 * kappa) - 4
+coeff = 1.17
+coeff_r, coeff_t = 0.91, 1.07
+
+init([1, 1, 1, 1], [4, 4, 4, 8], -1, xi_0 / nu, resource_path=".cache")
+
+gauge = io.readQIOGauge(weak_field)
+shutil.rmtree(".cache/multigrid", ignore_errors=True)
+
+propagators = []
+iters = []
+setup_secs = []
+for _ in range(2):
+    # The first pass runs the null-space setup and saves it, the second one loads it.
+    multigrid = Multigrid.create([[2, 2, 2, 2], [2, 2, 2, 2]], cache=".cache/multigrid")
+    dslash = core.getDefaultDirac(mass, 1e-12, 1000, xi_0, coeff_t, coeff_r, multigrid=multigrid)
+    s = perf_counter()
+    dslash.loadGauge(gauge)
+    print(f"Load gauge and set up multigrid: {perf_counter() - s:.3f} secs")
+    propagators.append(core.invert(dslash, "point", [0, 0, 0, 0]))
+    iters.append(sum(record["iter"] for record in dslash.solver_log.records))
+    setup_secs.append(dslash.solver_log.records[-1]["mg_setup_secs"])
+    n_level = dslash.multigrid.param.n_level
+    dslash.destroy()
+
+# one file of null vectors per level but the coarsest one
+assert os.path.exists(".cache/multigrid/key.json")
+for level in range(n_level - 1):
+    assert os.path.exists(f".cache/multigrid/null_{level}"), f"null vectors of level {level} not saved"
+
+print(f"Iterations {iters}, multigrid setup {setup_secs} secs")
+assert abs(iters[1] - iters[0]) <= 0.1 * iters[0]
+assert setup_secs[1] < setup_secs[0]
+print(cp.linalg.norm(propagators[0].data - propagators[1].data) / cp.linalg.norm(propagators[0].data))
@@ -0,0 +1,30 @@
+import numpy as np
+
+from check_pyquda import weak_field
+
+from pyquda import init
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, backend="numpy", resource_path=".cache")
+
+gauge = io.readChromaQIOGauge(weak_field)
+filenames = []
+for i in range(4):
+    io.writeChromaQIOGauge(f".cache/weak_field.{i}.lime", gauge * (i + 1))
+    filenames.append(f".cache/weak_field.{i}.lime")
+
+for i, gauge_read in enumerate(io.iterGauge(filenames, depth=2, checksum=True)):
+    assert np.array_equal(gauge_read.data, (gauge * (i + 1)).data)
+
+for i, gauge_read in enumerate(io.iterGauge(filenames, depth=4, max_bytes=gauge.data.nbytes)):
+    assert np.array_equal(gauge_read.data, (gauge * (i + 1)).data)
+    if i == 1:
+        break
+
+try:
+    for gauge_read in io.iterGauge(filenames + [".cache/missing.lime"]):
+        pass
+except FileNotFoundError as e:
+    print(f"Propagated {e!r}")
+else:
+    raise AssertionError("read error not propagated")
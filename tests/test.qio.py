@@ -0,0 +1,32 @@
+import numpy as np
+
+from check_pyquda import weak_field
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator, LatticeStaggeredPropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, backend="numpy", resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+gauge = io.readChromaQIOGauge(weak_field, checksum=True)
+io.writeChromaQIOGauge(".cache/weak_field.lime", gauge)
+gauge_write = io.readChromaQIOGauge(".cache/weak_field.lime", checksum=True)
+assert np.array_equal(gauge.data, gauge_write.data)
+io.writeChromaQIOGauge(".cache/weak_field.single.lime", gauge, precision=4)
+gauge_write = io.readChromaQIOGauge(".cache/weak_field.single.lime", checksum=True)
+print(np.linalg.norm(gauge.data - gauge_write.data))
+
+propagator = LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16"))
+io.writeChromaQIOPropagator(".cache/propagator.lime", propagator)
+propagator_write = io.readChromaQIOPropagator(".cache/propagator.lime", checksum=True)
+assert np.array_equal(propagator.data, propagator_write.data)
+
+propagator = LatticeStaggeredPropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 3, 3)).astype("<c16"))
+io.writeChromaQIOPropagator(".cache/staggered_propagator.lime", propagator)
+propagator_write = io.readChromaQIOPropagator(".cache/staggered_propagator.lime", checksum=True)
+assert np.array_equal(propagator.data, propagator_write.data)
+
+propagator_timeslices = io.readChromaQIOPropagator(".cache/staggered_propagator.lime", timeslices=[5, 1, 6])
+assert np.array_equal(propagator_timeslices, propagator.lexico()[[5, 1, 6]])
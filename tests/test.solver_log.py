@@ -0,0 +1,37 @@
+import csv
+import json
+
+from check_pyquda import weak_field
+
+from pyquda import core, init
+from pyquda.utils import io
+
+xi_0, nu = 2.464, 0.95
+kappa = 0.115
+mass = 1 / (2 * kappa) - 4
+coeff = 1.17
+coeff_r, coeff_t = 0.91, 1.07
+
+init([1, 1, 1, 1], [4, 4, 4, 8], -1, xi_0 / nu, resource_path=".cache")
+
+dslash = core.getDefaultDirac(mass, 1e-12, 1000, xi_0, coeff_t, coeff_r)
+gauge = io.readQIOGauge(weak_field)
+
+dslash.loadGauge(gauge)
+core.invert(dslash, "point", [0, 0, 0, 0])
+dslash.loadGauge(gauge)
+core.invert(dslash, "point", [0, 0, 0, 0])
+
+summary = dslash.solver_log.summary()
+print(summary)
+assert list(summary.keys()) == ["1", "2"]
+assert all(item["num_src"] == 12 and item["iter"] > 0 for item in summary.values())
+
+dslash.solver_log.dump(".cache/solver_log.csv")
+with open(".cache/solver_log.csv", newline="") as f:
+    assert len(list(csv.DictReader(f))) == len(dslash.solver_log.records)
+dslash.solver_log.dump(".cache/solver_log.json")
+with open(".cache/solver_log.json") as f:
+    assert json.load(f)["summary"] == summary
+
+dslash.destroy()
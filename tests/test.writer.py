@@ -0,0 +1,27 @@
+import numpy as np
+
+from pyquda import init, core
+from pyquda.field import LatticePropagator
+from pyquda.utils import io
+
+init([1, 1, 1, 1], [4, 4, 4, 8], 1, 1.0, resource_path=".cache")
+latt_info = core.getDefaultLattice()
+Lx, Ly, Lz, Lt = latt_info.size
+
+propagators = [
+    LatticePropagator(latt_info, np.random.random((2, Lt, Lz, Ly, Lx // 2, 4, 4, 3, 3)).astype("<c16"))
+    for _ in range(4)
+]
+propagator = LatticePropagator(latt_info)
+with io.PropagatorWriter(io.writeKYUPropagator, max_pending=2) as writer:
+    for i in range(4):
+        propagator.data[:] = propagators[i].data
+        propagator.toDevice()
+        writer.put(f".cache/propagator.{i}.kyu", propagator)
+        propagator.toHost()
+        propagator.data[:] = 0
+    writer.flush()
+    for i in range(4):
+        propagator_read = io.readKYUPropagator(f".cache/propagator.{i}.kyu", latt_info.global_size)
+        propagator_read.toHost()
+        assert np.allclose(propagator_read.data, propagators[i].data)